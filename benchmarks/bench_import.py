@@ -0,0 +1,101 @@
+"""
+Import-time benchmark.
+
+Measures (in fresh interpreter processes):
+- the import of the package and of its main modules;
+- the definition of a large number of models (without schema access);
+- the same, but with access to ``schema`` of every model.
+
+Run with::
+
+    python -m benchmarks.bench_import [--repeat N] [--models N] [--max-ms MS]
+
+With ``--max-ms`` the script exits with a non-zero status if the median time
+of any of the measurements exceeds the given limit,
+so it can be used as a guard against import-time regressions.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Optional
+
+
+_MODEL_DEF_CODE = '''
+from basic_notion.page import NotionPage
+from basic_notion.field import SelectField, TitleField, MultiSelectField, NumberField, DateField
+
+models = []
+for i in range({models}):
+    models.append(type(NotionPage)(f'Model{{i}}', (NotionPage,), dict(
+        name=TitleField(property_name='Name'),
+        type=SelectField(property_name='Type'),
+        tags=MultiSelectField(property_name='Tags'),
+        number=NumberField(property_name='Number'),
+        date=DateField(property_name='Date'),
+    )))
+{extra}
+'''
+
+_SCENARIOS: dict[str, str] = {
+    'import basic_notion': 'import basic_notion',
+    'import basic_notion.page': 'import basic_notion.page',
+    'import basic_notion.field': 'import basic_notion.field',
+    'import basic_notion.block': 'import basic_notion.block',
+    'define models': _MODEL_DEF_CODE.replace('{extra}', ''),
+    'define models + schema': _MODEL_DEF_CODE.replace('{extra}', 'for model in models: model.schema'),
+}
+
+_TIMER_CODE = '''
+import time
+_start = time.perf_counter()
+{code}
+print(time.perf_counter() - _start)
+'''
+
+
+def _measure_once(code: str) -> float:
+    output = subprocess.check_output([sys.executable, '-c', _TIMER_CODE.format(code=code)])
+    return float(output.decode().strip()) * 1000
+
+
+def run(repeat: int, models: int) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+    for name, code in _SCENARIOS.items():
+        code = code.replace('{models}', str(models))
+        timings = [_measure_once(code) for _ in range(repeat)]
+        results[name] = {
+            'min_ms': min(timings),
+            'median_ms': statistics.median(timings),
+        }
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Measure import and model definition time')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--models', type=int, default=300)
+    parser.add_argument('--max-ms', type=float, default=None)
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args(argv)
+
+    results = run(repeat=args.repeat, models=args.models)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, result in results.items():
+            print(f'{name:<30} min: {result["min_ms"]:8.2f} ms   median: {result["median_ms"]:8.2f} ms')
+
+    if args.max_ms is not None:
+        exceeded = [name for name, result in results.items() if result['median_ms'] > args.max_ms]
+        if exceeded:
+            print(f'Exceeded {args.max_ms} ms: {", ".join(exceeded)}', file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
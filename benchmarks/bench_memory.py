@@ -0,0 +1,122 @@
+"""
+Memory footprint of decoded pages (bytes per page).
+
+Decodes synthetic query responses into ``NotionPageList.items()``
+and measures the retained memory with ``tracemalloc``
+and with deep size accounting (broken down by kind and property).
+Results can be saved and compared, like those of the other benchmarks::
+
+    python -m benchmarks.bench_memory --sizes 10000,100000 --output before.json
+    # ... change something ...
+    python -m benchmarks.bench_memory --compare before.json --max-regression 5
+"""
+
+import argparse
+import gc
+import json
+import sys
+from typing import Optional
+
+from basic_notion.memory import measure_retained, profile_pages
+from basic_notion.page import NotionPage
+from basic_notion.synthetic import SyntheticDataGenerator
+
+from benchmarks.bench_micro import BenchPage, BenchPageList
+from benchmarks.runner import get_meta
+
+
+DEFAULT_SIZES = (10000, 100000)
+PAGE_SIZE = 100
+
+
+def measure_size(size: int) -> dict:
+    generator = SyntheticDataGenerator(seed=0)
+    # Encoded responses of PAGE_SIZE pages each
+    responses = [
+        json.dumps(generator.make_page_list(BenchPage, min(PAGE_SIZE, size - start)))
+        for start in range(0, size, PAGE_SIZE)
+    ]
+
+    def decode() -> list[NotionPage]:
+        pages: list[NotionPage] = []
+        for response in responses:
+            pages.extend(BenchPageList(data=json.loads(response)).items())
+        return pages
+
+    gc.collect()
+    pages, retained = measure_retained(decode)
+    # The list of pages is a part of the retained memory, but not of the pages'
+    retained -= sys.getsizeof(pages)
+    report = profile_pages(pages)
+    return {
+        'size': size,
+        'traced_bytes_per_page': retained / size,
+        **report.as_dict(),
+    }
+
+
+def compare(current: dict, baseline: dict) -> dict[str, float]:
+    """Return the relative change of bytes per page (``0.1`` is 10% more) for sizes present in both runs"""
+
+    baseline_results = {result['size']: result for result in baseline['results']}
+    return {
+        str(result['size']): (
+            result['traced_bytes_per_page'] / baseline_results[result['size']]['traced_bytes_per_page'] - 1
+        )
+        for result in current['results']
+        if result['size'] in baseline_results
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Memory footprint of decoded pages')
+    parser.add_argument(
+        '--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+        help='Comma-separated dataset sizes (numbers of pages)',
+    )
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--output', default=None, help='Save results to a JSON file')
+    parser.add_argument('--compare', default=None, help='Compare with results saved to a JSON file')
+    parser.add_argument(
+        '--max-regression', type=float, default=None,
+        help='Exit with a non-zero status if bytes per page grow by more than this many percent',
+    )
+    args = parser.parse_args(argv)
+
+    results = {
+        'meta': get_meta(),
+        'results': [measure_size(int(size)) for size in args.sizes.split(',')],
+    }
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+    changes: dict[str, float] = {}
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            changes = compare(results, json.load(baseline_file))
+
+    if args.json:
+        print(json.dumps({**results, 'changes': changes} if args.compare else results, indent=2))
+    else:
+        for result in results['results']:
+            line = (
+                f'{result["size"]:>9} pages   traced: {result["traced_bytes_per_page"]:8.0f} bytes/page   '
+                f'deep size: {result["bytes_per_page"]:8.0f} bytes/page'
+            )
+            if str(result['size']) in changes:
+                line += f'   {changes[str(result["size"])]:+7.1%}'
+            print(line)
+            print('    ' + '   '.join(f'{kind}: {size / result["size"]:.0f}' for kind, size in result['by_kind'].items()))
+
+    if args.max_regression is not None:
+        regressed = [size for size, change in changes.items() if change * 100 > args.max_regression]
+        if regressed:
+            print(f'Bytes per page grew by more than {args.max_regression}%: {", ".join(regressed)}', file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Micro-benchmarks of the hot paths of the models.
+
+Run on synthetic data (no access to the Notion API is needed) with::
+
+    python -m benchmarks.bench_micro [--filter NAME] [--json] [--output FILE] [--compare FILE]
+
+See ``benchmarks.runner`` for all of the options.
+"""
+
+import datetime
+import sys
+import uuid
+from typing import Optional
+
+from basic_notion.attr import ItemAttrDescriptor
+from basic_notion.field import (
+    CheckboxField, DateField, EmailField, MultiSelectField, NumberField,
+    PhoneNumberField, RichTextField, SelectField, TitleField, UrlField,
+)
+from basic_notion.page import NotionPage, NotionPageList
+from basic_notion.parent import ParentDatabase
+from basic_notion.query import Query
+from basic_notion.utils import deserialize_date
+
+from benchmarks.runner import BENCHMARK_TYPE, main as runner_main
+
+
+class BenchPage(NotionPage):
+    title = TitleField(property_name='Title')
+    text = RichTextField(property_name='Text')
+    number = NumberField(property_name='Number')
+    checkbox = CheckboxField(property_name='Checkbox')
+    select = SelectField(property_name='Select')
+    tags = MultiSelectField(property_name='Tags')
+    email = EmailField(property_name='Email')
+    url = UrlField(property_name='Url')
+    phone = PhoneNumberField(property_name='Phone')
+    date = DateField(property_name='Date')
+
+
+class BenchPageList(NotionPageList[BenchPage]):
+    ITEM_CLS = BenchPage
+
+
+FIELD_NAMES = ('title', 'text', 'number', 'checkbox', 'select', 'tags', 'email', 'url', 'phone', 'date')
+
+PARENT = ParentDatabase.make(database_id=str(uuid.uuid4()))
+
+
+def make_page_kwargs(idx: int = 0) -> dict:
+    return dict(
+        parent=PARENT,
+        title=[f'Page {idx}'],
+        text=['Some ', 'rich ', 'text'],
+        number=idx,
+        checkbox=bool(idx % 2),
+        select='Book',
+        tags=['First', 'Second', 'Third'],
+        email='user@example.com',
+        url='https://example.com',
+        phone='+1234567890',
+        date=datetime.datetime(2021, 11, 5, 12, 0, tzinfo=datetime.timezone.utc),
+    )
+
+
+def make_page_data(idx: int = 0) -> dict:
+    """Page data resembling the one returned by the API"""
+
+    data = BenchPage.make(**make_page_kwargs(idx)).data
+    data.update({
+        'id': str(uuid.uuid4()),
+        'created_time': '2021-11-05T12:00:00.000Z',
+        'last_edited_time': '2021-11-05T12:30:00.000Z',
+        'archived': False,
+        'url': 'https://www.notion.so/page',
+    })
+    data['properties']['Date']['date']['end'] = None
+    return data
+
+
+def make_list_data(count: int) -> dict:
+    return {
+        'object': 'list',
+        'results': [make_page_data(idx) for idx in range(count)],
+        'next_cursor': None,
+        'has_more': False,
+    }
+
+
+def _make_field_get(page: BenchPage, name: str) -> BENCHMARK_TYPE:
+    def bench() -> object:
+        return getattr(page, name)
+
+    return bench
+
+
+def _make_get_text(page: BenchPage, name: str) -> BENCHMARK_TYPE:
+    def bench() -> object:
+        return getattr(page, name).get_text()
+
+    return bench
+
+
+def make_benchmarks() -> dict[str, BENCHMARK_TYPE]:
+    page = BenchPage(data=make_page_data())
+    page_list = BenchPageList(data=make_list_data(100))
+    title_prop = page.title
+    tags_prop = page.tags
+    id_descriptor: ItemAttrDescriptor = BenchPage.__notion_layout__.attrs['id']
+    query = Query.database('database').filter(
+        BenchPage.select.filter.equals('Book')
+    ).sorts(
+        BenchPage.title.sort.ascending
+    ).only(BenchPage.title, BenchPage.select)
+    page_kwargs = make_page_kwargs()
+
+    def attr_set() -> None:
+        page.archived = False
+
+    benchmarks: dict[str, BENCHMARK_TYPE] = {
+        'ItemAttrDescriptor.__get__': lambda: page.id,
+        'ItemAttrDescriptor.__get__ (converter)': lambda: page.created_time,
+        'ItemAttrDescriptor.__get__ (direct)': lambda: id_descriptor.__get__(page, BenchPage),
+        'ItemAttrDescriptor.__set__': attr_set,
+    }
+    for name in FIELD_NAMES:
+        benchmarks[f'NotionField.__get__ ({name})'] = _make_field_get(page, name)
+    benchmarks.update({
+        'PropertyList iteration (title)': lambda: list(title_prop.items),
+        'PropertyList iteration (multi_select)': lambda: list(tags_prop.items),
+    })
+    for name in FIELD_NAMES:
+        benchmarks[f'get_text ({name})'] = _make_get_text(page, name)
+    benchmarks.update({
+        'deserialize_date (date)': lambda: deserialize_date('2021-11-05'),
+        'deserialize_date (datetime)': lambda: deserialize_date('2021-11-05T12:30:00.000Z'),
+        'NotionItemBase.make': lambda: BenchPage.make(**page_kwargs),
+        'NotionPageList.items() (100 pages)': page_list.items,
+        'Query.serialize': query.serialize,
+    })
+    return benchmarks
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    return runner_main(make_benchmarks(), description='Micro-benchmarks of the models', argv=argv)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
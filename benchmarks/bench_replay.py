@@ -0,0 +1,71 @@
+"""
+Benchmarks of decoding recorded traffic (see ``basic_notion.traffic``).
+
+Replays all of the recorded responses of an endpoint (``databases.query`` by default)
+and decodes them into ``NotionPageList`` objects, so changes of the library
+can be measured on the shapes of real payloads::
+
+    python -m benchmarks.bench_replay traffic.jsonl.gz [--endpoint NAME] [runner options]
+
+See ``benchmarks.runner`` for the rest of the options.
+"""
+
+import argparse
+import sys
+from typing import Optional
+
+from basic_notion.page import NotionPage, NotionPageList
+from basic_notion.traffic import TrafficReplayer, iter_records
+
+from benchmarks.runner import BENCHMARK_TYPE, main as runner_main
+
+
+class ReplayPageList(NotionPageList[NotionPage]):
+    ITEM_CLS = NotionPage
+
+
+def make_benchmarks(path: str, endpoint: str = 'databases.query') -> dict[str, BENCHMARK_TYPE]:
+    requests = [
+        record['request'] for record in iter_records(path)
+        if record['endpoint'] == endpoint and 'response' in record
+    ]
+    replayer = TrafficReplayer(path=path, time_scale=0)
+    fetch = replayer.make_fetch(endpoint)
+
+    def replay() -> object:
+        return [fetch(**request) for request in requests]
+
+    def replay_items() -> object:
+        pages = []
+        for request in requests:
+            for page in ReplayPageList(data=fetch(**request)).items():
+                pages.append((page.id, page.last_edited_time))
+        return pages
+
+    def replay_cursor() -> object:
+        pages = []
+        for request in requests:
+            for page in ReplayPageList(data=fetch(**request)).cursor():
+                pages.append((page.id, page.last_edited_time))
+        return pages
+
+    return {
+        f'replay {endpoint} ({len(requests)} responses)': replay,
+        'replay + NotionPageList.items()': replay_items,
+        'replay + NotionPageList.cursor()': replay_cursor,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('path')
+    parser.add_argument('--endpoint', default='databases.query')
+    args, runner_argv = parser.parse_known_args(argv)
+    return runner_main(
+        make_benchmarks(args.path, endpoint=args.endpoint),
+        description='Decoding of replayed traffic', argv=runner_argv,
+    )
+
+
+if __name__ == '__main__':
+    sys.exit(main())
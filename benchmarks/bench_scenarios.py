@@ -0,0 +1,281 @@
+"""
+Scenario benchmarks of whole workflows on datasets of 1k to 1M pages.
+
+The workflows run against ``basic_notion.testing.fake_api.FakeNotionAPI``
+(every response goes through JSON encoding and decoding as it would over HTTP),
+so no access to the Notion API is needed.
+Each scenario and dataset size is run in a fresh interpreter process and reports
+its throughput, p50/p99 request latency, peak RSS and allocations.
+
+Run with::
+
+    python -m benchmarks.bench_scenarios [--scenarios query,create,export]
+        [--sizes 1000,10000,100000,1000000] [--latency S] [--tracemalloc]
+        [--json] [--output FILE]
+
+Scenarios:
+- ``query``: paginated querying of a database into ``NotionPageList`` objects;
+- ``create``: ``NotionPage.make`` + page creation via ``bulk.bulk_create_pages``;
+- ``export``: export of page bodies (block trees) to Markdown files via ``export.export_pages``.
+
+``--tracemalloc`` adds the peak of traced allocations to the results,
+but makes the timings much slower.
+Note that the dataset (the fake API's storage) is a part of the process' memory.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Optional
+
+import attr
+
+from basic_notion.bulk import BulkCreateJournal, bulk_create_pages
+from basic_notion.export import export_pages
+from basic_notion.synthetic import SyntheticDataGenerator
+from basic_notion.testing.fake_api import FakeNotionAPI
+
+from benchmarks.bench_micro import BenchPage, BenchPageList, make_page_kwargs
+from benchmarks.runner import get_meta
+
+
+DEFAULT_SIZES = (1000, 10000)
+PAGE_SIZE = 100
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@attr.s(slots=True)
+class Transport:
+    """
+    Calls the fake API as an HTTP client would: the response is encoded to JSON
+    and decoded back. Records the latency of every call.
+    """
+
+    api: FakeNotionAPI = attr.ib(kw_only=True)
+    latencies: list[float] = attr.ib(init=False, factory=list)
+    _lock: threading.Lock = attr.ib(init=False, factory=threading.Lock)
+
+    def wrap(self, method: Callable[..., dict]) -> Callable[..., dict]:
+        def call(**kwargs: Any) -> dict:
+            started = time.perf_counter()
+            result = json.loads(json.dumps(method(**kwargs)))
+            duration = time.perf_counter() - started
+            with self._lock:
+                self.latencies.append(duration)
+            return result
+
+        return call
+
+
+@attr.s(slots=True, frozen=True)
+class ScenarioRun:
+    # Number of pages processed
+    items: int = attr.ib(kw_only=True)
+    duration: float = attr.ib(kw_only=True)
+    latencies: list[float] = attr.ib(kw_only=True)
+
+
+def _make_api(latency: float) -> tuple[FakeNotionAPI, str]:
+    # Responses are copied by the transport
+    api = FakeNotionAPI(latency=latency, copy_results=False)
+    database = api.create_database(
+        parent={'page_id': 'root'}, title=[], properties=BenchPage.__notion_layout__.schema.make_spec(),
+    )
+    return api, database['id']
+
+
+def _prepare_query(size: int, latency: float) -> Callable[[], ScenarioRun]:
+    api, database_id = _make_api(latency)
+    generator = SyntheticDataGenerator(seed=0)
+    api.add_pages(database_id, list(generator.iter_pages(BenchPage, size, database_id=database_id)))
+
+    def run() -> ScenarioRun:
+        transport = Transport(api=api)
+        query = transport.wrap(api.databases.query)
+        started = time.perf_counter()
+        items = 0
+        start_cursor = None
+        while True:
+            page_list = BenchPageList(data=query(
+                database_id=database_id, page_size=PAGE_SIZE, start_cursor=start_cursor,
+            ))
+            for page in page_list.items():
+                page.title.get_text()
+                items += 1
+            if not page_list.data['has_more']:
+                break
+            start_cursor = page_list.data['next_cursor']
+        return ScenarioRun(items=items, duration=time.perf_counter() - started, latencies=transport.latencies)
+
+    return run
+
+
+def _prepare_create(size: int, latency: float) -> Callable[[], ScenarioRun]:
+    api, database_id = _make_api(latency)
+    page_kwargs = make_page_kwargs()
+    page_kwargs['parent'] = {'database_id': database_id}
+
+    def make_page_data(idx: int) -> dict:
+        return BenchPage.make(**dict(page_kwargs, title=[f'Page {idx}'], number=idx)).data
+
+    def run() -> ScenarioRun:
+        transport = Transport(api=api)
+        with tempfile.TemporaryDirectory() as directory:
+            with BulkCreateJournal(path=os.path.join(directory, 'journal.sqlite')) as journal:
+                started = time.perf_counter()
+                stats = bulk_create_pages(
+                    range(size), make_page_data=make_page_data,
+                    create=transport.wrap(api.pages.create), journal=journal, get_key=str,
+                )
+                duration = time.perf_counter() - started
+        return ScenarioRun(items=stats.created, duration=duration, latencies=transport.latencies)
+
+    return run
+
+
+def _prepare_export(size: int, latency: float) -> Callable[[], ScenarioRun]:
+    api, database_id = _make_api(latency)
+    generator = SyntheticDataGenerator(seed=0)
+    pages = list(generator.iter_pages(BenchPage, size, database_id=database_id))
+    api.add_pages(database_id, pages)
+    for page_data in pages:
+        api.add_blocks(generator.make_block_tree(page_data['id'], depth=2, fan_out=5))
+
+    def run() -> ScenarioRun:
+        transport = Transport(api=api)
+        with tempfile.TemporaryDirectory() as directory:
+            started = time.perf_counter()
+            stats = export_pages(
+                (BenchPage(data=page_data) for page_data in pages),
+                fetch_children=transport.wrap(api.blocks.children.list), directory=directory,
+            )
+            duration = time.perf_counter() - started
+        return ScenarioRun(items=stats.exported, duration=duration, latencies=transport.latencies)
+
+    return run
+
+
+SCENARIOS: dict[str, Callable[[int, float], Callable[[], ScenarioRun]]] = {
+    'query': _prepare_query,
+    'create': _prepare_create,
+    'export': _prepare_export,
+}
+
+
+def _get_max_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def _percentile_ms(values: list[float], percent: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))] * 1000
+
+
+def run_scenario(name: str, size: int, latency: float = 0.0, trace_allocations: bool = False) -> dict:
+    """Run a scenario in the current process (data preparation is not measured)"""
+
+    run = SCENARIOS[name](size, latency)
+    prepared_rss_mb = _get_max_rss_mb()
+    blocks_before = sys.getallocatedblocks()
+    if trace_allocations:
+        tracemalloc.start()
+    try:
+        result = run()
+        traced_peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20 if trace_allocations else None
+    finally:
+        if trace_allocations:
+            tracemalloc.stop()
+
+    return {
+        'scenario': name,
+        'size': size,
+        'items': result.items,
+        'duration_s': result.duration,
+        'items_per_sec': result.items / result.duration if result.duration else None,
+        'requests': len(result.latencies),
+        'latency_p50_ms': _percentile_ms(result.latencies, 50),
+        'latency_p99_ms': _percentile_ms(result.latencies, 99),
+        'prepared_rss_mb': prepared_rss_mb,
+        'peak_rss_mb': _get_max_rss_mb(),
+        # Objects allocated during the run that are still alive after it
+        'net_allocated_blocks': sys.getallocatedblocks() - blocks_before,
+        'traced_peak_mb': traced_peak_mb,
+    }
+
+
+def _run_in_subprocess(name: str, size: int, latency: float, trace_allocations: bool) -> dict:
+    command = [
+        sys.executable, '-m', 'benchmarks.bench_scenarios',
+        '--run-one', name, '--sizes', str(size), '--latency', str(latency),
+    ]
+    if trace_allocations:
+        command.append('--tracemalloc')
+    output = subprocess.check_output(command, cwd=_ROOT_DIR)
+    return json.loads(output)
+
+
+def _format_optional(value: Optional[float], fmt: str) -> str:
+    return format(value, fmt) if value is not None else '-'
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Scenario benchmarks of whole workflows')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='Comma-separated scenario names')
+    parser.add_argument(
+        '--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+        help='Comma-separated dataset sizes (numbers of pages)',
+    )
+    parser.add_argument('--latency', type=float, default=0.0, help='Latency of the fake API requests (s)')
+    parser.add_argument('--tracemalloc', action='store_true', help='Measure the peak of traced allocations')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--output', default=None, help='Save results to a JSON file')
+    parser.add_argument('--run-one', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    if args.run_one:
+        print(json.dumps(run_scenario(
+            args.run_one, sizes[0], latency=args.latency, trace_allocations=args.tracemalloc,
+        )))
+        return 0
+
+    results = [
+        _run_in_subprocess(name, size, latency=args.latency, trace_allocations=args.tracemalloc)
+        for name in args.scenarios.split(',')
+        for size in sizes
+    ]
+    output = {'meta': get_meta(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(output, output_file, indent=2)
+
+    if args.json:
+        print(json.dumps(output, indent=2))
+    else:
+        for result in results:
+            print(
+                f'{result["scenario"]:<8} {result["size"]:>9} pages '
+                f'{_format_optional(result["items_per_sec"], "10.0f")} pages/s   '
+                f'p50: {_format_optional(result["latency_p50_ms"], "8.3f")} ms   '
+                f'p99: {_format_optional(result["latency_p99_ms"], "8.3f")} ms   '
+                f'peak RSS: {result["peak_rss_mb"]:8.1f} MB   '
+                f'traced peak: {_format_optional(result["traced_peak_mb"], ".1f")} MB'
+            )
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Common runner for the in-process benchmarks.
+
+Each benchmark is a callable without arguments that is timed with ``timeit``.
+Results can be saved as JSON and compared with the results
+saved earlier (e.g. for another commit)::
+
+    python -m benchmarks.bench_micro --output before.json
+    # ... change something ...
+    python -m benchmarks.bench_micro --compare before.json --max-regression 20
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from typing import Callable, Optional
+
+
+BENCHMARK_TYPE = Callable[[], object]
+
+
+def _get_commit() -> Optional[str]:
+    try:
+        output = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode().strip()
+
+
+def get_meta() -> dict:
+    return {
+        'commit': _get_commit(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    }
+
+
+def _calibrate(timer: timeit.Timer, min_time: float) -> int:
+    """Find the number of calls that takes at least ``min_time`` seconds"""
+
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time:
+            return number
+        number *= 10
+
+
+def measure(func: BENCHMARK_TYPE, repeat: int = 5, min_time: float = 0.05) -> dict[str, float]:
+    timer = timeit.Timer(func)
+    number = _calibrate(timer, min_time)
+    # Time per call in microseconds
+    timings = [total / number * 1e6 for total in timer.repeat(repeat=repeat, number=number)]
+    return {
+        'min_us': min(timings),
+        'median_us': statistics.median(timings),
+        'ops_per_sec': 1e6 / min(timings),
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def run_benchmarks(
+        benchmarks: dict[str, BENCHMARK_TYPE],
+        repeat: int = 5, min_time: float = 0.05,
+        name_filter: Optional[str] = None,
+) -> dict:
+    results = {
+        name: measure(func, repeat=repeat, min_time=min_time)
+        for name, func in benchmarks.items()
+        if name_filter is None or name_filter in name
+    }
+    return {'meta': get_meta(), 'results': results}
+
+
+def compare(current: dict, baseline: dict) -> dict[str, float]:
+    """Return the relative change (``0.1`` is 10% slower) of every benchmark present in both runs"""
+
+    changes = {}
+    for name, result in current['results'].items():
+        baseline_result = baseline['results'].get(name)
+        if baseline_result is None:
+            continue
+        changes[name] = result['min_us'] / baseline_result['min_us'] - 1
+    return changes
+
+
+def main(benchmarks: dict[str, BENCHMARK_TYPE], description: str, argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.05, help='Minimal duration of a single repeat (s)')
+    parser.add_argument('--filter', default=None, help='Only run benchmarks containing this string')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--output', default=None, help='Save results to a JSON file')
+    parser.add_argument('--compare', default=None, help='Compare with results saved to a JSON file')
+    parser.add_argument(
+        '--max-regression', type=float, default=None,
+        help='Exit with a non-zero status if any benchmark is slower by more than this many percent',
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(benchmarks, repeat=args.repeat, min_time=args.min_time, name_filter=args.filter)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+    changes: dict[str, float] = {}
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            changes = compare(results, json.load(baseline_file))
+
+    if args.json:
+        print(json.dumps({**results, 'changes': changes} if args.compare else results, indent=2))
+    else:
+        for name, result in results['results'].items():
+            line = f'{name:<45} {result["min_us"]:10.3f} us   {result["ops_per_sec"]:12.0f} ops/s'
+            if name in changes:
+                line += f'   {changes[name]:+7.1%}'
+            print(line)
+
+    if args.max_regression is not None:
+        regressed = [name for name, change in changes.items() if change * 100 > args.max_regression]
+        if regressed:
+            print(f'Slower by more than {args.max_regression}%: {", ".join(regressed)}', file=sys.stderr)
+            return 1
+
+    return 0
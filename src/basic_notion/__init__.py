@@ -0,0 +1,51 @@
+"""
+Client-agnostic model wrapper for Notion API.
+
+Submodules are imported lazily: the names listed below
+are loaded from their modules on first access,
+so ``import basic_notion`` itself is cheap.
+"""
+
+from importlib import import_module
+from typing import Any
+
+
+_LAZY_ATTRS: dict[str, str] = {
+    # name -> module
+    'NotionPage': 'basic_notion.page',
+    'NotionPageList': 'basic_notion.page',
+    'TitledPage': 'basic_notion.titled_page',
+    'NotionDatabase': 'basic_notion.database',
+    'NotionBlock': 'basic_notion.block',
+    'Query': 'basic_notion.query',
+    'Schema': 'basic_notion.schema',
+    'Projection': 'basic_notion.projection',
+    'ParentPage': 'basic_notion.parent',
+    'ParentDatabase': 'basic_notion.parent',
+    'ParentWorkspace': 'basic_notion.parent',
+    'NotionField': 'basic_notion.field',
+    'NumberField': 'basic_notion.field',
+    'CheckboxField': 'basic_notion.field',
+    'SelectField': 'basic_notion.field',
+    'MultiSelectField': 'basic_notion.field',
+    'TitleField': 'basic_notion.field',
+    'RichTextField': 'basic_notion.field',
+    'EmailField': 'basic_notion.field',
+    'UrlField': 'basic_notion.field',
+    'PhoneNumberField': 'basic_notion.field',
+    'DateField': 'basic_notion.field',
+}
+
+__all__ = sorted(_LAZY_ATTRS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(import_module(_LAZY_ATTRS[name]), name)
+    globals()[name] = value  # So that __getattr__ is not called again
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from typing import Any, Callable, Optional
+
+import attr
+
+from basic_notion.attr import ItemAttrDescriptor
+from basic_notion.field import NotionField, get_fields
+from basic_notion.page import NotionPage
+from basic_notion.patching import ORDER_ACCESS_RECORDER, add_patch, remove_patches
+from basic_notion.query import Query
+from basic_notion.schema import Schema
+from basic_notion.view import _ReusedFieldDescriptor, get_view_base_cls
+
+
+@attr.s(slots=True)
+class FieldAccessRecorder:
+    """
+    Records which fields (properties) and attributes of models are read
+    while it is active, and suggests the projection (``Query.only``)
+    that requests only the properties that were actually used.
+
+    Like ``instrumentation``, it swaps the descriptor implementations at runtime,
+    so there is no overhead when it is not active.
+    Reads via ``cursor()`` views are recorded under their models.
+    Only page models are recorded; reads of the raw ``data`` dicts are not.
+
+    Usage::
+
+        with FieldAccessRecorder() as recorder:
+            run_the_code(...)
+
+        query = recorder.apply(Query.database(database_id), MyPage, schema=database.schema)
+    """
+
+    # model -> property name -> number of reads
+    _fields: dict[type, Counter] = attr.ib(init=False, factory=dict)
+    # model -> attribute name -> number of reads
+    _attrs: dict[type, Counter] = attr.ib(init=False, factory=dict)
+    _active: bool = attr.ib(init=False, default=False)
+    _lock: threading.Lock = attr.ib(init=False, factory=threading.Lock)
+
+    def _record(self, registry: dict[type, Counter], owner: type, name: str) -> None:
+        owner = get_view_base_cls(owner)
+        if not issubclass(owner, NotionPage):
+            return
+        with self._lock:
+            counter = registry.get(owner)
+            if counter is None:
+                counter = registry[owner] = Counter()
+            counter[name] += 1
+
+    def _make_field_get(self, func: Callable) -> Callable:
+        def __get__(field: NotionField, instance: Any, owner: type) -> Any:
+            # Reads via views are recorded by ``_ReusedFieldDescriptor.__get__``
+            if instance is not None and get_view_base_cls(owner) is owner:
+                self._record(self._fields, owner, field._property_name)
+            return func(field, instance, owner)
+
+        return __get__
+
+    def _make_reused_field_get(self, func: Callable) -> Callable:
+        def __get__(descriptor: _ReusedFieldDescriptor, instance: Any, owner: type) -> Any:
+            if instance is not None:
+                self._record(self._fields, owner, descriptor.get_field()._property_name)
+            return func(descriptor, instance, owner)
+
+        return __get__
+
+    def _make_attr_get(self, func: Callable) -> Callable:
+        def __get__(descriptor: ItemAttrDescriptor, instance: Any, owner: type) -> Any:
+            if instance is not None:
+                self._record(self._attrs, owner, descriptor.name or '')
+            return func(descriptor, instance, owner)
+
+        return __get__
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    def start(self) -> None:
+        if self._active:
+            raise RuntimeError('Recorder is already active')
+        replacements = {
+            (NotionField, '__get__'): self._make_field_get,
+            (_ReusedFieldDescriptor, '__get__'): self._make_reused_field_get,
+            (ItemAttrDescriptor, '__get__'): self._make_attr_get,
+        }
+        for (cls, name), make_replacement in replacements.items():
+            # Wraps the instrumentation if it is installed (in any order, see ``patching``)
+            add_patch(self, cls, name, make_replacement, order=ORDER_ACCESS_RECORDER)
+        self._active = True
+
+    def stop(self) -> None:
+        remove_patches(self)
+        self._active = False
+
+    def __enter__(self) -> FieldAccessRecorder:
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._fields.clear()
+            self._attrs.clear()
+
+    def get_field_counts(self, model: type) -> dict[str, int]:
+        """Number of reads of every property of the model (including the unused ones)"""
+
+        counter = self._fields.get(model, Counter())
+        return {
+            field._property_name: counter[field._property_name]
+            for field in get_fields(model).values()
+        }
+
+    def get_attr_counts(self, model: type) -> dict[str, int]:
+        return dict(self._attrs.get(model, Counter()))
+
+    def _get_read_fields(self, model: type) -> list[str]:
+        return [name for name, count in self.get_field_counts(model).items() if count]
+
+    def get_projection(self, model: type) -> list[str]:
+        """
+        Names of the model's properties that were read (in the order of their declaration).
+        Raise ``ValueError`` if none were, as the projection would drop all of the properties.
+        """
+
+        projection = self._get_read_fields(model)
+        if not projection:
+            raise ValueError(f'No properties of {model.__name__} were read, so there is no projection to suggest')
+        return projection
+
+    def get_unused_fields(self, model: type) -> list[str]:
+        return [name for name, count in self.get_field_counts(model).items() if not count]
+
+    def apply(self, query: Query, model: type, schema: Optional[Schema] = None) -> Query:
+        """Restrict the query to the properties of the model that were read (see ``get_projection``)"""
+
+        return query.only(*self.get_projection(model), schema=schema)
+
+    @property
+    def models(self) -> list[type]:
+        return sorted(set(self._fields) | set(self._attrs), key=lambda model: model.__name__)
+
+    def report(self) -> dict[str, dict]:
+        """Return the recorded access data of every model as a dict"""
+
+        return {
+            model.__name__: {
+                'fields': self.get_field_counts(model),
+                'attrs': self.get_attr_counts(model),
+                'projection': self._get_read_fields(model),
+                'unused_fields': self.get_unused_fields(model),
+            }
+            for model in self.models
+        }
+
+    def format_report(self) -> str:
+        lines = []
+        for model_name, model_report in self.report().items():
+            lines.append(f'{model_name}:')
+            for name, count in model_report['fields'].items():
+                lines.append(f'    property {name:<30} {count:>10}')
+            for name, count in sorted(model_report['attrs'].items()):
+                lines.append(f'    attr     {name:<30} {count:>10}')
+            if model_report['fields']:
+                lines.append(f'    projection: {", ".join(model_report["projection"]) or "-"}')
+        return '\n'.join(lines)
+
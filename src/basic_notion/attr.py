@@ -56,10 +56,18 @@ class ItemAttrDescriptor(Generic[_PROP_ATTR_TV]):
             raise AttributeError('Key is not specified')
         return self.__key
 
+    @property
+    def name(self) -> Optional[str]:
+        return self.__name
+
     @property
     def editable(self) -> bool:
         return self.__editable
 
+    @property
+    def get_converter(self) -> Optional[Callable[[Any], _PROP_ATTR_TV]]:
+        return self.__get_converter
+
     @property
     def set_converter(self) -> Optional[Callable[[_PROP_ATTR_TV], Any]]:
         return self.__set_converter
@@ -78,9 +86,10 @@ class ItemAttrDescriptor(Generic[_PROP_ATTR_TV]):
         if instance is None:
             return self
 
-        value = get_from_dict(instance.data, self.key)
-        if self.__get_converter is not None:
-            value = self.__get_converter(value)
+        value = get_from_dict(instance.data, self.__key)  # type: ignore  # set in __set_name__
+        get_converter = self.__get_converter
+        if get_converter is not None:
+            value = get_converter(value)
         return value
 
     def __set__(self, instance: Optional[NotionItemBase], value: _PROP_ATTR_TV) -> None:
@@ -94,7 +103,7 @@ class ItemAttrDescriptor(Generic[_PROP_ATTR_TV]):
             if self.__set_converter is not None:
                 value = self.__set_converter(value)
 
-            old_value = get_from_dict(instance.data, self.key)
+            old_value = get_from_dict(instance.data, self.__key)  # type: ignore
             if value == old_value:
                 # Nothing to do
                 return
@@ -102,7 +111,7 @@ class ItemAttrDescriptor(Generic[_PROP_ATTR_TV]):
             # The value wasn't there to begin with, so just set it
             pass
 
-        set_to_dict(instance.data, self.key, value)
+        set_to_dict(instance.data, self.__key, value)  # type: ignore
         if self.__clear_on_set:
             # Clear non-editable (derived) attributes to avoid value conflicts on update
             instance.clear_derived_attrs()
@@ -1,69 +1,117 @@
 from __future__ import annotations
 
 import abc
-from collections import ChainMap
-from typing import Any, ClassVar, Optional, Type, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Optional, Type, TypeVar
 
 import attr
 
 from basic_notion import exc
+from basic_notion.attr import ItemAttrDescriptor
 from basic_notion.utils import set_to_dict, del_from_dict
 
+if TYPE_CHECKING:
+    from basic_notion.field import NotionField
+    from basic_notion.schema import Schema
 
-def _get_attr_keys_for_cls(
-        members: dict[str, Any],
-        only_editable: bool = False,
-        only_derived: bool = False,
-) -> dict[str, tuple[str, ...]]:
-    from basic_notion.attr import ItemAttrDescriptor
 
-    result: dict[str, tuple[str, ...]] = dict()
-    for name, prop in members.items():
-        if not isinstance(prop, ItemAttrDescriptor):
-            continue
-        if only_editable and not prop.editable:
-            continue
-        if only_derived and not prop.derived:
-            continue
-        attr_key: tuple[str, ...]
-        try:
-            attr_key = prop.key
-        except AttributeError:
-            attr_key = (name,)
-        result[name] = attr_key
+@attr.s(slots=True)
+class NotionItemLayout:
+    """
+    Precomputed attribute tables of a ``NotionItemBase`` subclass.
+    Created once per class by ``NotionItemBaseMetaclass``
+    and shared by all of the class's hot paths.
+    """
+
+    _owner: type = attr.ib(kw_only=True)
+    # name -> descriptor (including inherited ones)
+    _attrs: dict[str, ItemAttrDescriptor] = attr.ib(kw_only=True)
+    # name -> key
+    _attr_keys: dict[str, tuple[str, ...]] = attr.ib(init=False)
+    _editable_keys: dict[str, tuple[str, ...]] = attr.ib(init=False)
+    _derived_keys: dict[str, tuple[str, ...]] = attr.ib(init=False)
+    # name -> set_converter (only for editable attrs that have one)
+    _set_converters: dict[str, Callable[[Any], Any]] = attr.ib(init=False)
+    # Fields and schema are loaded lazily
+    # (fields are defined in a module that depends on this one)
+    _fields: Optional[dict[str, NotionField]] = attr.ib(init=False, default=None)
+    _schema: Optional[Schema] = attr.ib(init=False, default=None)
+
+    def __attrs_post_init__(self) -> None:
+        self._attr_keys = {}
+        self._editable_keys = {}
+        self._derived_keys = {}
+        self._set_converters = {}
+        for name, prop in self._attrs.items():
+            key = prop.key
+            self._attr_keys[name] = key
+            if prop.editable:
+                self._editable_keys[name] = key
+                if prop.set_converter is not None:
+                    self._set_converters[name] = prop.set_converter
+            if prop.derived:
+                self._derived_keys[name] = key
+
+    @classmethod
+    def for_class(cls, owner: type, members: dict[str, Any]) -> NotionItemLayout:
+        """Make layout for class ``owner`` with own class members ``members``"""
+
+        attrs: dict[str, ItemAttrDescriptor] = {}
+        for base in reversed(owner.__bases__):
+            base_layout = getattr(base, '__notion_layout__', None)
+            if isinstance(base_layout, NotionItemLayout):
+                attrs.update(base_layout.attrs)
+        for name, value in members.items():
+            if isinstance(value, ItemAttrDescriptor):
+                attrs[name] = value
+        return cls(owner=owner, attrs=attrs)
+
+    @property
+    def attrs(self) -> dict[str, ItemAttrDescriptor]:
+        return self._attrs
+
+    @property
+    def attr_keys(self) -> dict[str, tuple[str, ...]]:
+        return self._attr_keys
+
+    @property
+    def editable_keys(self) -> dict[str, tuple[str, ...]]:
+        return self._editable_keys
+
+    @property
+    def derived_keys(self) -> dict[str, tuple[str, ...]]:
+        return self._derived_keys
+
+    @property
+    def set_converters(self) -> dict[str, Callable[[Any], Any]]:
+        return self._set_converters
+
+    @property
+    def fields(self) -> dict[str, NotionField]:
+        if self._fields is None:
+            from basic_notion.field import get_fields
+            self._fields = get_fields(self._owner)
+        return self._fields
 
-    return result
+    @property
+    def schema(self) -> Schema:
+        if self._schema is None:
+            from basic_notion.schema import Schema
+            owner = self._owner
+            self._schema = Schema({
+                name: field.__get__(None, owner)
+                for name, field in self.fields.items()
+            })
+        return self._schema
 
 
 class NotionItemBaseMetaclass(abc.ABCMeta):
     # abc.ABCMeta is needed here for the abc.ABC functionality
 
-    """Metaclass that adds ``__notion_attr_keys__`` to all ``NotionItemBase`` subclasses"""
+    """Metaclass that adds ``__notion_layout__`` to all ``NotionItemBase`` subclasses"""
 
     def __new__(cls, name: str, bases: tuple[type, ...], dct: dict):
-        attr_keys_name = '__notion_attr_keys__'
-        editable_keys_name = '__notion_editable_keys__'
-        derived_keys_name = '__notion_derived_keys__'
-        base_attr_key_maps = tuple(
-            getattr(base, attr_keys_name)  # type: ignore
-            for base in bases if type(base) is cls
-        )
-        base_editable_key_maps = tuple(
-            getattr(base, editable_keys_name)  # type: ignore
-            for base in bases if type(base) is cls
-        )
-        base_derived_key_maps = tuple(
-            getattr(base, derived_keys_name)  # type: ignore
-            for base in bases if type(base) is cls
-        )
-        attr_keys = dict(ChainMap(_get_attr_keys_for_cls(dct), *base_attr_key_maps))
-        editable_keys = dict(ChainMap(_get_attr_keys_for_cls(dct, only_editable=True), *base_editable_key_maps))
-        derived_keys = dict(ChainMap(_get_attr_keys_for_cls(dct, only_derived=True), *base_derived_key_maps))
-        # Added to __dict__
-        dct[attr_keys_name] = attr_keys
-        dct[editable_keys_name] = editable_keys
-        dct[derived_keys_name] = derived_keys
         new_cls = super().__new__(cls, name, bases, dct)
+        new_cls.__notion_layout__ = NotionItemLayout.for_class(new_cls, members=dct)  # type: ignore
         return new_cls
 
 
@@ -72,9 +120,7 @@ _ITEM_TV = TypeVar('_ITEM_TV', bound='NotionItemBase')
 
 @attr.s(slots=True)
 class NotionItemBase(metaclass=NotionItemBaseMetaclass):
-    __notion_attr_keys__: dict[str, tuple[str, ...]] = None  # type: ignore  # defined in metaclass
-    __notion_editable_keys__: dict[str, tuple[str, ...]] = None  # type: ignore  # defined in metaclass
-    __notion_derived_keys__: dict[str, tuple[str, ...]] = None  # type: ignore  # defined in metaclass
+    __notion_layout__: NotionItemLayout = None  # type: ignore  # defined in metaclass
 
     OBJECT_TYPE_KEY_STR: ClassVar[str] = ''
     OBJECT_TYPE_STR: ClassVar[str] = ''
@@ -84,17 +130,17 @@ class NotionItemBase(metaclass=NotionItemBaseMetaclass):
     @classmethod
     @property
     def attr_keys(cls) -> dict[str, tuple[str, ...]]:
-        return cls.__notion_attr_keys__
+        return cls.__notion_layout__.attr_keys
 
     @classmethod
     @property
     def editable_keys(cls) -> dict[str, tuple[str, ...]]:
-        return cls.__notion_editable_keys__
+        return cls.__notion_layout__.editable_keys
 
     @classmethod
     @property
     def derived_keys(cls) -> dict[str, tuple[str, ...]]:
-        return cls.__notion_derived_keys__
+        return cls.__notion_layout__.derived_keys
 
     @property
     def data(self) -> dict:
@@ -105,16 +151,17 @@ class NotionItemBase(metaclass=NotionItemBaseMetaclass):
     @classmethod
     def _make_inst_attr_dict(cls, kwargs: dict[str, Any]) -> dict:
         data: dict[str, Any] = {}
-        for name, key in cls.editable_keys.items():  # type: ignore
+        layout = cls.__notion_layout__
+        set_converters = layout.set_converters
+        for name, key in layout.editable_keys.items():
             if name not in kwargs:
                 continue
 
             value = kwargs[name]
 
-            # Get attr descriptor and its `set_converter` callable
-            # (if it exists) to convert the value into its serializable form
-            prop = getattr(cls, name)
-            set_converter = prop.set_converter
+            # Use the attr's `set_converter` callable (if it exists)
+            # to convert the value into its serializable form
+            set_converter = set_converters.get(name)
             if set_converter is not None:
                 value = set_converter(value)
 
@@ -138,7 +185,6 @@ class NotionItemBase(metaclass=NotionItemBaseMetaclass):
         return cls(data=data)
 
     def clear_derived_attrs(self) -> None:
-        for name, other_key in self.attr_keys.items():
-            if name in self.derived_keys:
-                # Is not editable
-                del_from_dict(self.data, other_key)
+        data = self.data
+        for key in self.__notion_layout__.derived_keys.values():
+            del_from_dict(data, key)
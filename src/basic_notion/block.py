@@ -1,45 +1,63 @@
 from __future__ import annotations
 
 import datetime
-import inspect
-from typing import Any, ClassVar, Optional
+import warnings
+from typing import Any, ClassVar, Iterable, Optional, Type
 
+from basic_notion import exc
 from basic_notion.base import NotionItemBaseMetaclass, NotionItemBase
 from basic_notion.schema import Schema
-from basic_notion.property_schema import PropertySchema, TextListSchema
+from basic_notion.property_schema import TextListSchema
 from basic_notion.attr import ItemAttrDescriptor
 from basic_notion.property import PropertyList, TextProperty
 from basic_notion.field import NotionField
 from basic_notion.utils import deserialize_date
 
 
-def _make_schema_for_block_cls(page_cls: type) -> Schema:
-    return Schema({
-        name: prop
-        for name, prop in inspect.getmembers(page_cls)
-        if isinstance(prop, PropertySchema)
-    })
+_BLOCK_CLS_REGISTRY: dict[str, Type[NotionBlock]] = {}
 
 
 class NotionBlockMetaclass(NotionItemBaseMetaclass):
-    """Metaclass for NotionBlock that adds `schema` to its attributes"""
+    """
+    Metaclass for NotionBlock that registers public block classes
+    by their ``BLOCK_TYPE_STR`` (see ``get_block_cls``).
+
+    The last class defined for a block type is registered.
+    Replacing a class of another module emits ``DuplicateBlockTypeWarning``,
+    unless the new class sets ``OVERRIDE_BLOCK_TYPE = True``
+    (re-definitions in the same module, e.g. on reload, are silent).
+    """
 
     def __new__(cls, name: str, bases: tuple[type, ...], dct: dict):
         new_cls = super().__new__(cls, name, bases, dct)
-        new_cls.__notion_schema__ = _make_schema_for_block_cls(new_cls)  # type: ignore
+        block_type_str = dct.get('BLOCK_TYPE_STR')
+        if block_type_str and not name.startswith('_'):
+            registered_cls = _BLOCK_CLS_REGISTRY.get(block_type_str)
+            if (
+                    registered_cls is not None and not dct.get('OVERRIDE_BLOCK_TYPE', False)
+                    and registered_cls.__module__ != new_cls.__module__
+            ):
+                warnings.warn(
+                    f'Block type {block_type_str!r} of {registered_cls.__module__}.{registered_cls.__qualname__} '
+                    f'is replaced with {new_cls.__module__}.{new_cls.__qualname__}; '
+                    f'set OVERRIDE_BLOCK_TYPE = True to silence this warning',
+                    exc.DuplicateBlockTypeWarning, stacklevel=2,
+                )
+            _BLOCK_CLS_REGISTRY[block_type_str] = new_cls
         return new_cls
 
 
 class NotionBlock(NotionItemBase, metaclass=NotionBlockMetaclass):
-    __notion_schema__: Schema = None  # type: ignore  # defined in metaclass
-
     OBJECT_TYPE_KEY_STR = 'object'
     OBJECT_TYPE_STR = 'block'
     BLOCK_TYPE_STR: ClassVar[str]
+    # Replace the class registered for the same ``BLOCK_TYPE_STR`` (see ``NotionBlockMetaclass``)
+    OVERRIDE_BLOCK_TYPE: ClassVar[bool] = False
 
     id: ItemAttrDescriptor[str] = ItemAttrDescriptor()
     type: ItemAttrDescriptor[str] = ItemAttrDescriptor(editable=False)
     archived: ItemAttrDescriptor[bool] = ItemAttrDescriptor(editable=True)
+    has_children: ItemAttrDescriptor[bool] = ItemAttrDescriptor(derived=True)
     created_time: ItemAttrDescriptor[Optional[datetime.datetime]] = ItemAttrDescriptor(
         derived=True, get_converter=deserialize_date)
     created_time_str: ItemAttrDescriptor[str] = ItemAttrDescriptor(derived=True)
@@ -54,12 +72,12 @@ class NotionBlock(NotionItemBase, metaclass=NotionBlockMetaclass):
     @classmethod
     @property
     def schema(cls) -> Schema:
-        return cls.__notion_schema__
+        return cls.__notion_layout__.schema
 
     @classmethod
     def _make_inst_prop_dict(cls, kwargs: dict[str, Any]) -> dict:
         data = {}
-        for name, prop_sch in cls.schema.items():  # type: ignore
+        for name, prop_sch in cls.__notion_layout__.schema.items():
             if name not in kwargs:
                 continue
             data[prop_sch.property_name] = prop_sch.make_prop_from_value(value=kwargs[name]).data
@@ -169,3 +187,36 @@ class ChildDatabaseBlock(NotionBlock):
     BLOCK_TYPE_STR = 'child_database'
 
     title: ItemAttrDescriptor[str] = ItemAttrDescriptor(key=(BLOCK_TYPE_STR, 'title'), editable=True)
+
+
+class GenericBlock(NotionBlock):
+    """Block of a type that has no dedicated class"""
+
+    BLOCK_TYPE_STR = ''
+
+    @property
+    def _custom_data(self) -> dict:
+        return self.data[self.type]
+
+
+def get_block_cls(block_type_str: str) -> Type[NotionBlock]:
+    """Return block class for the given block type (``GenericBlock`` if the type is unknown)"""
+    return _BLOCK_CLS_REGISTRY.get(block_type_str, GenericBlock)
+
+
+def decode_block(data: dict) -> NotionBlock:
+    """Make an instance of the appropriate block class from raw block data"""
+    return _BLOCK_CLS_REGISTRY.get(data['type'], GenericBlock)(data=data)
+
+
+def decode_blocks(data_list: Iterable[dict]) -> list[NotionBlock]:
+    """
+    Make block instances from a list of raw block data
+    (e.g. ``results`` of a children list response)
+    """
+
+    get_cls = _BLOCK_CLS_REGISTRY.get
+    return [
+        get_cls(data['type'], GenericBlock)(data=data)
+        for data in data_list
+    ]
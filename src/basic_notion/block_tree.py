@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Iterable, Iterator, Optional
+
+import attr
+
+from basic_notion.block import NotionBlock, decode_block
+from basic_notion.telemetry import get_telemetry, submit_in_context
+
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Types of blocks whose children are not part of the page's body
+CHILD_CONTAINER_BLOCK_TYPES = frozenset(('child_page', 'child_database'))
+
+# Should accept ``block_id`` and (optionally) ``start_cursor`` keyword arguments
+# and return the raw paginated children list data,
+# for instance, ``notion_client.Client().blocks.children.list``
+FETCH_CHILDREN_TYPE = Callable[..., dict]
+ASYNC_FETCH_CHILDREN_TYPE = Callable[..., Awaitable[dict]]
+DECODE_BLOCK_TYPE = Callable[[dict], NotionBlock]
+
+
+@attr.s(slots=True)
+class BlockTreeNode:
+    block: NotionBlock = attr.ib(kw_only=True)
+    children: list[BlockTreeNode] = attr.ib(kw_only=True, factory=list)
+
+    @property
+    def id(self) -> str:
+        return self.block.id
+
+
+@attr.s(slots=True)
+class BlockTree:
+    """Body of a page (or the descendants of any other block)"""
+
+    root_id: str = attr.ib(kw_only=True)
+    children: list[BlockTreeNode] = attr.ib(kw_only=True, factory=list)
+
+    def iter_nodes(self) -> Iterator[tuple[int, BlockTreeNode]]:
+        """Iterate over all nodes depth-first (in document order) yielding ``(depth, node)`` pairs"""
+
+        stack: list[tuple[int, BlockTreeNode]] = [(0, node) for node in reversed(self.children)]
+        while stack:
+            depth, node = stack.pop()
+            yield depth, node
+            stack.extend((depth + 1, child) for child in reversed(node.children))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.iter_nodes())
+
+    def to_data(self) -> dict:
+        """Convert the tree to a JSON-serializable dict (see ``from_data``)"""
+
+        children_data: list[dict] = []
+        stack: list[tuple[list[BlockTreeNode], list[dict]]] = [(self.children, children_data)]
+        while stack:
+            nodes, nodes_data = stack.pop()
+            for node in nodes:
+                node_data: dict[str, Any] = {'block': node.block.data, 'children': []}
+                nodes_data.append(node_data)
+                stack.append((node.children, node_data['children']))
+        return {'root_id': self.root_id, 'children': children_data}
+
+    @classmethod
+    def from_data(cls, data: dict, decode: DECODE_BLOCK_TYPE = decode_block) -> BlockTree:
+        tree = cls(root_id=data['root_id'])
+        stack: list[tuple[list[dict], list[BlockTreeNode]]] = [(data['children'], tree.children)]
+        while stack:
+            nodes_data, nodes = stack.pop()
+            for node_data in nodes_data:
+                node = BlockTreeNode(block=decode(node_data['block']))
+                nodes.append(node)
+                stack.append((node_data['children'], node.children))
+        return tree
+
+
+def _make_fetch_kwargs(block_id: str, start_cursor: Optional[str]) -> dict[str, Any]:
+    kwargs: dict[str, Any] = {'block_id': block_id}
+    if start_cursor is not None:
+        kwargs['start_cursor'] = start_cursor
+    return kwargs
+
+
+def fetch_all_children(fetch_children: FETCH_CHILDREN_TYPE, block_id: str) -> list[dict]:
+    """Fetch the raw data of all direct children of a block following the pagination"""
+
+    results: list[dict] = []
+    start_cursor: Optional[str] = None
+    telemetry = get_telemetry()
+    while True:
+        with telemetry.request('blocks.children.list'):
+            response = fetch_children(**_make_fetch_kwargs(block_id, start_cursor))
+        results.extend(response['results'])
+        if not response.get('has_more'):
+            return results
+        start_cursor = response['next_cursor']
+
+
+async def _fetch_all_children_async(
+        fetch_children: ASYNC_FETCH_CHILDREN_TYPE, block_id: str,
+        semaphore: asyncio.Semaphore,
+) -> list[dict]:
+    results: list[dict] = []
+    start_cursor: Optional[str] = None
+    telemetry = get_telemetry()
+    while True:
+        async with semaphore:
+            with telemetry.request('blocks.children.list'):
+                response = await fetch_children(**_make_fetch_kwargs(block_id, start_cursor))
+        results.extend(response['results'])
+        if not response.get('has_more'):
+            return results
+        start_cursor = response['next_cursor']
+
+
+_LEVEL_TYPE = list[tuple[str, list[BlockTreeNode]]]
+
+
+def _add_level_results(
+        level: _LEVEL_TYPE, level_results: Iterable[list[dict]],
+        decode: DECODE_BLOCK_TYPE, follow_child_pages: bool,
+) -> _LEVEL_TYPE:
+    """Add the fetched children to their parent nodes and return the next level"""
+
+    next_level: _LEVEL_TYPE = []
+    for (_, children), children_data in zip(level, level_results):
+        for block_data in children_data:
+            node = BlockTreeNode(block=decode(block_data))
+            children.append(node)
+            if not block_data.get('has_children'):
+                continue
+            if not follow_child_pages and block_data.get('type') in CHILD_CONTAINER_BLOCK_TYPES:
+                continue
+            next_level.append((block_data['id'], node.children))
+    return next_level
+
+
+def fetch_block_tree(
+        fetch_children: FETCH_CHILDREN_TYPE,
+        root_id: str,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_depth: Optional[int] = None,
+        decode: DECODE_BLOCK_TYPE = decode_block,
+        follow_child_pages: bool = False,
+        executor: Optional[Executor] = None,
+) -> BlockTree:
+    """
+    Load the whole tree of descendants of block (or page) ``root_id``.
+
+    The tree is loaded level by level (without recursion),
+    the children of all blocks of a level are fetched concurrently
+    in a pool of ``max_concurrency`` threads.
+    An existing ``executor`` can be given instead to share a single pool
+    between several trees (``max_concurrency`` is ignored then).
+    Pagination of children lists is followed automatically.
+    The contents of child pages and databases are not loaded
+    unless ``follow_child_pages`` is set.
+    """
+
+    tree = BlockTree(root_id=root_id)
+    level: _LEVEL_TYPE = [(root_id, tree.children)]
+    depth = 0
+    if executor is None:
+        executor_context: contextlib.AbstractContextManager[Executor] = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+        )
+    else:
+        executor_context = contextlib.nullcontext(executor)
+    with executor_context as executor:
+        while level and (max_depth is None or depth < max_depth):
+            futures = [
+                submit_in_context(executor, fetch_all_children, fetch_children, block_id)
+                for block_id, _ in level
+            ]
+            level_results = (future.result() for future in futures)
+            level = _add_level_results(
+                level, level_results, decode=decode, follow_child_pages=follow_child_pages,
+            )
+            depth += 1
+
+    return tree
+
+
+async def fetch_block_tree_async(
+        fetch_children: ASYNC_FETCH_CHILDREN_TYPE,
+        root_id: str,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_depth: Optional[int] = None,
+        decode: DECODE_BLOCK_TYPE = decode_block,
+        follow_child_pages: bool = False,
+) -> BlockTree:
+    """
+    Async version of ``fetch_block_tree``.
+    At most ``max_concurrency`` requests are awaited at the same time.
+    """
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tree = BlockTree(root_id=root_id)
+    level: _LEVEL_TYPE = [(root_id, tree.children)]
+    depth = 0
+    while level and (max_depth is None or depth < max_depth):
+        level_results = await asyncio.gather(*(
+            _fetch_all_children_async(fetch_children, block_id, semaphore=semaphore)
+            for block_id, _ in level
+        ))
+        level = _add_level_results(
+            level, level_results, decode=decode, follow_child_pages=follow_child_pages,
+        )
+        depth += 1
+
+    return tree
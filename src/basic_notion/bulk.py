@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+import attr
+
+from basic_notion.executor import is_retryable_error, is_safely_retryable_error
+from basic_notion.telemetry import get_telemetry, submit_in_context
+
+
+_ROW_TV = TypeVar('_ROW_TV')
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Should accept the page data as keyword arguments and return the created page's data,
+# for instance, ``notion_client.Client().pages.create``
+CREATE_PAGE_TYPE = Callable[..., dict]
+# Should return the id of the page that was created for the row (``None`` if there is none),
+# for instance, by querying the database by a unique property of the row
+FIND_PAGE_TYPE = Callable[[_ROW_TV], Optional[str]]
+
+STATUS_PENDING = 'pending'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+# Failed with an error after which the page might have been created (e.g. a timeout or a 5xx)
+STATUS_UNKNOWN = 'unknown'
+
+
+def is_ambiguous_error(err: BaseException) -> bool:
+    """Check whether the page might have been created despite the error"""
+
+    return is_retryable_error(err) and not is_safely_retryable_error(err)
+
+
+@attr.s(slots=True)
+class BulkCreateJournal:
+    """
+    SQLite journal of a bulk page creation.
+
+    For every row (identified by its key) it records the status
+    and the id of the created page.
+    A row is marked as pending before its request is sent,
+    so rows with an unknown outcome (interrupted requests) can be told apart,
+    as can the ones whose requests failed ambiguously (``STATUS_UNKNOWN``).
+    """
+
+    _path: str = attr.ib(kw_only=True)
+    _connection: Optional[sqlite3.Connection] = attr.ib(init=False, default=None)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self._path)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS rows ('
+                'key TEXT PRIMARY KEY, status TEXT NOT NULL, page_id TEXT, error TEXT, updated REAL NOT NULL)'
+            )
+            self._connection.commit()
+        return self._connection
+
+    def _set(self, key: str, status: str, page_id: Optional[str] = None, error: Optional[str] = None) -> None:
+        connection = self.connection
+        connection.execute(
+            'INSERT OR REPLACE INTO rows (key, status, page_id, error, updated) VALUES (?, ?, ?, ?, ?)',
+            (key, status, page_id, error, time.time()),
+        )
+        connection.commit()
+
+    def get_status(self, key: str) -> Optional[str]:
+        row = self.connection.execute('SELECT status FROM rows WHERE key = ?', (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def get_page_id(self, key: str) -> Optional[str]:
+        row = self.connection.execute('SELECT page_id FROM rows WHERE key = ?', (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def get_keys(self, status: str) -> list[str]:
+        return [
+            row[0] for row in
+            self.connection.execute('SELECT key FROM rows WHERE status = ? ORDER BY updated', (status,))
+        ]
+
+    def mark_pending(self, key: str) -> None:
+        self._set(key, STATUS_PENDING)
+
+    def mark_done(self, key: str, page_id: str) -> None:
+        self._set(key, STATUS_DONE, page_id=page_id)
+
+    def mark_failed(self, key: str, error: str, ambiguous: bool = False) -> None:
+        self._set(key, STATUS_UNKNOWN if ambiguous else STATUS_FAILED, error=error)
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self) -> BulkCreateJournal:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+@attr.s(slots=True)
+class BulkCreateStats:
+    created: int = attr.ib(kw_only=True, default=0)
+    skipped: int = attr.ib(kw_only=True, default=0)
+    failed: int = attr.ib(kw_only=True, default=0)
+    # Pending or ambiguously failed rows whose pages turned out to exist (see ``find_existing``)
+    reconciled: int = attr.ib(kw_only=True, default=0)
+    # row key -> error description
+    errors: dict[str, str] = attr.ib(kw_only=True, factory=dict)
+
+
+def bulk_create_pages(
+        rows: Iterable[_ROW_TV],
+        make_page_data: Callable[[_ROW_TV], dict],
+        create: CREATE_PAGE_TYPE,
+        journal: BulkCreateJournal,
+        get_key: Callable[[_ROW_TV], str],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        retry_pending: bool = False,
+        find_existing: Optional[FIND_PAGE_TYPE] = None,
+) -> BulkCreateStats:
+    """
+    Create a page for each of ``rows`` via ``create(**make_page_data(row))``,
+    for instance, with ``make_page_data=lambda row: MyPage.make(parent=..., **row).data``.
+
+    Rows are consumed and their payloads are made lazily,
+    at most ``max_concurrency`` requests are in progress at a time.
+    The result of every row is recorded in the journal under ``get_key(row)``,
+    and rows that are already done are skipped,
+    so the same call can be repeated after a crash to resume the creation.
+    The key must identify the row itself (e.g. its unique id in the source),
+    not its position, which can change between runs.
+
+    Rows whose requests were interrupted (still pending in the journal)
+    or failed with an error after which the page might exist (timeouts, 5xx, see ``is_ambiguous_error``)
+    might have been created, so by default they are skipped
+    (see ``BulkCreateJournal.get_keys(STATUS_PENDING)`` and ``STATUS_UNKNOWN``).
+    Rows that failed unambiguously are sent again.
+    If ``find_existing`` is given, it is asked for the page of each of them:
+    found pages are recorded as done, and the rest of the rows are sent again.
+    Set ``retry_pending`` to send them again without checking
+    (this can create duplicate pages).
+    """
+
+    stats = BulkCreateStats()
+    telemetry = get_telemetry()
+
+    def create_page(row: _ROW_TV) -> dict:
+        page_data = make_page_data(row)
+        with telemetry.request('pages.create', database_id=(page_data.get('parent') or {}).get('database_id')):
+            return create(**page_data)
+
+    def add_result(key: str, future: Future) -> None:
+        try:
+            page_data = future.result()
+        except Exception as err:
+            journal.mark_failed(key, repr(err), ambiguous=is_ambiguous_error(err))
+            stats.failed += 1
+            stats.errors[key] = repr(err)
+        else:
+            journal.mark_done(key, page_data['id'])
+            stats.created += 1
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        queue: deque[tuple[str, Future]] = deque()
+        for row in rows:
+            key = get_key(row)
+            status = journal.get_status(key)
+            if status == STATUS_DONE:
+                stats.skipped += 1
+                continue
+            if status in (STATUS_PENDING, STATUS_UNKNOWN):
+                if find_existing is not None:
+                    page_id = find_existing(row)
+                    if page_id is not None:
+                        journal.mark_done(key, page_id)
+                        stats.reconciled += 1
+                        continue
+                elif not retry_pending:
+                    stats.skipped += 1
+                    continue
+
+            while len(queue) >= max_concurrency:
+                add_result(*queue.popleft())
+            journal.mark_pending(key)
+            queue.append((key, submit_in_context(executor, create_page, row)))
+
+        while queue:
+            add_result(*queue.popleft())
+
+    return stats
@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import abc
+import json
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import attr
+
+from basic_notion.block import decode_block
+from basic_notion.block_tree import (
+    BlockTree, BlockTreeNode, CHILD_CONTAINER_BLOCK_TYPES, DECODE_BLOCK_TYPE,
+    DEFAULT_MAX_CONCURRENCY, FETCH_CHILDREN_TYPE, fetch_all_children,
+)
+from basic_notion.telemetry import submit_in_context
+
+
+DEFAULT_MAX_CACHE_SIZE = 64 * 1024 * 1024
+
+# Should accept a ``block_id`` keyword argument and return the raw block data,
+# for instance, ``notion_client.Client().blocks.retrieve``
+FETCH_BLOCK_TYPE = Callable[..., dict]
+
+
+def estimate_tree_size(tree: BlockTree) -> int:
+    """Estimate the size of the tree in bytes by the size of its blocks' JSON data"""
+
+    return sum(
+        len(json.dumps(node.block.data, ensure_ascii=False, separators=(',', ':')))
+        for _, node in tree.iter_nodes()
+    )
+
+
+@attr.s(slots=True, frozen=True)
+class CacheEntry:
+    tree: BlockTree = attr.ib(kw_only=True)
+    # ``last_edited_time`` of the root block (if it was fetched)
+    root_edited_time: Optional[str] = attr.ib(kw_only=True, default=None)
+    size: int = attr.ib(kw_only=True)
+
+
+class BlockTreeCacheBackend(abc.ABC):
+    """Storage of cached block trees with LRU eviction"""
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+@attr.s(slots=True)
+class MemoryCacheBackend(BlockTreeCacheBackend):
+    """Keeps decoded trees in memory. Total estimated size is at most ``max_size`` bytes"""
+
+    _max_size: int = attr.ib(kw_only=True, default=DEFAULT_MAX_CACHE_SIZE)
+    _entries: OrderedDict[str, CacheEntry] = attr.ib(init=False, factory=OrderedDict)
+    _total_size: int = attr.ib(init=False, default=0)
+
+    @property
+    def total_size(self) -> int:
+        return self._total_size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self.delete(key)
+        if entry.size > self._max_size:
+            return
+        self._entries[key] = entry
+        self._total_size += entry.size
+        while self._total_size > self._max_size:
+            _, evicted = self._entries.popitem(last=False)
+            self._total_size -= evicted.size
+
+    def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_size -= entry.size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._total_size = 0
+
+
+@attr.s(slots=True)
+class DiskCacheBackend(BlockTreeCacheBackend):
+    """
+    Keeps trees as JSON files in ``directory``.
+    Total size of the files is at most ``max_size`` bytes,
+    the least recently used ones are deleted first.
+    """
+
+    _directory: str = attr.ib(kw_only=True)
+    _max_size: int = attr.ib(kw_only=True, default=DEFAULT_MAX_CACHE_SIZE)
+    _decode: DECODE_BLOCK_TYPE = attr.ib(kw_only=True, default=decode_block)
+    # file name -> file size, in the order of usage
+    _files: Optional[OrderedDict[str, int]] = attr.ib(init=False, default=None)
+    # Sum of the sizes in ``_files``
+    _total_size: int = attr.ib(init=False, default=0)
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self._directory, re.sub(r'[^\w-]', '_', key) + '.json')
+
+    def _get_files(self) -> OrderedDict[str, int]:
+        if self._files is None:
+            os.makedirs(self._directory, exist_ok=True)
+            # Restore the usage order from the modification times of existing files
+            entries = sorted(
+                (entry for entry in os.scandir(self._directory) if entry.name.endswith('.json')),
+                key=lambda entry: entry.stat().st_mtime,
+            )
+            self._files = OrderedDict((entry.path, entry.stat().st_size) for entry in entries)
+            self._total_size = sum(self._files.values())
+        return self._files
+
+    @property
+    def total_size(self) -> int:
+        self._get_files()
+        return self._total_size
+
+    def __len__(self) -> int:
+        return len(self._get_files())
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        files = self._get_files()
+        path = self._get_path(key)
+        if path not in files:
+            return None
+        try:
+            with open(path, encoding='utf-8') as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            self.delete(key)
+            return None
+
+        files.move_to_end(path)
+        os.utime(path)
+        return CacheEntry(
+            tree=BlockTree.from_data(data['tree'], decode=self._decode),
+            root_edited_time=data['root_edited_time'],
+            size=data['size'],
+        )
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self.delete(key)
+        files = self._get_files()
+        path = self._get_path(key)
+        content = json.dumps({
+            'tree': entry.tree.to_data(),
+            'root_edited_time': entry.root_edited_time,
+            'size': entry.size,
+        }, ensure_ascii=False, separators=(',', ':')).encode()
+        if len(content) > self._max_size:
+            return
+
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as cache_file:
+            cache_file.write(content)
+        os.replace(tmp_path, path)
+        files[path] = len(content)
+        self._total_size += len(content)
+
+        while self._total_size > self._max_size:
+            evicted_path, evicted_size = files.popitem(last=False)
+            self._total_size -= evicted_size
+            try:
+                os.remove(evicted_path)
+            except FileNotFoundError:
+                pass
+
+    def delete(self, key: str) -> None:
+        path = self._get_path(key)
+        size = self._get_files().pop(path, None)
+        if size is None:
+            return
+        self._total_size -= size
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        files = self._get_files()
+        for path in files:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        files.clear()
+        self._total_size = 0
+
+
+# (block id, new children list, cached children by id)
+_REVALIDATION_LEVEL_TYPE = list[tuple[str, list[BlockTreeNode], dict[str, BlockTreeNode]]]
+
+
+def _is_unchanged(cached_node: Optional[BlockTreeNode], block_data: dict) -> bool:
+    if cached_node is None:
+        return False
+    cached_data = cached_node.block.data
+    return (
+        cached_data.get('last_edited_time') == block_data.get('last_edited_time')
+        and cached_data.get('has_children') == block_data.get('has_children')
+    )
+
+
+@attr.s(slots=True)
+class BlockTreeCache:
+    """
+    Cache of block trees (see ``block_tree.fetch_block_tree``) keyed by root block id.
+
+    If ``fetch_block`` is given, the root block (page) is checked first
+    and the whole tree is reused without further requests if it hasn't changed.
+    Otherwise the tree is revalidated level by level:
+    the children of all blocks are listed again (editing a nested block doesn't change
+    the ``last_edited_time`` of its parents), but the decoded blocks
+    with unchanged ``last_edited_time`` are reused instead of being decoded again.
+    """
+
+    _fetch_children: FETCH_CHILDREN_TYPE = attr.ib(kw_only=True)
+    _fetch_block: Optional[FETCH_BLOCK_TYPE] = attr.ib(kw_only=True, default=None)
+    _backend: BlockTreeCacheBackend = attr.ib(kw_only=True, factory=MemoryCacheBackend)
+    _max_concurrency: int = attr.ib(kw_only=True, default=DEFAULT_MAX_CONCURRENCY)
+    _decode: DECODE_BLOCK_TYPE = attr.ib(kw_only=True, default=decode_block)
+    _follow_child_pages: bool = attr.ib(kw_only=True, default=False)
+    _hits: int = attr.ib(init=False, default=0)
+    _misses: int = attr.ib(init=False, default=0)
+
+    @property
+    def backend(self) -> BlockTreeCacheBackend:
+        return self._backend
+
+    @property
+    def hits(self) -> int:
+        """Number of trees returned without any changes"""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of trees that were (partially) fetched"""
+        return self._misses
+
+    def get(self, root_id: str, revalidate: bool = True) -> BlockTree:
+        entry = self._backend.get(root_id)
+        if entry is not None and not revalidate:
+            self._hits += 1
+            return entry.tree
+
+        root_edited_time: Optional[str] = None
+        if self._fetch_block is not None:
+            root_edited_time = self._fetch_block(block_id=root_id)['last_edited_time']
+            if entry is not None and entry.root_edited_time == root_edited_time:
+                self._hits += 1
+                return entry.tree
+
+        cached_children = entry.tree.children if entry is not None else []
+        tree, changed = self._load(root_id, cached_children)
+        if not changed and entry is not None:
+            self._hits += 1
+            if entry.root_edited_time == root_edited_time:
+                # The entry was already moved to the end of the LRU order by ``get``
+                return entry.tree
+            tree = entry.tree
+        else:
+            self._misses += 1
+        self._backend.set(root_id, CacheEntry(
+            tree=tree, root_edited_time=root_edited_time, size=estimate_tree_size(tree),
+        ))
+        return tree
+
+    def invalidate(self, root_id: str) -> None:
+        self._backend.delete(root_id)
+
+    def clear(self) -> None:
+        self._backend.clear()
+
+    def _has_loadable_children(self, block_data: dict) -> bool:
+        if not block_data.get('has_children'):
+            return False
+        return self._follow_child_pages or block_data.get('type') not in CHILD_CONTAINER_BLOCK_TYPES
+
+    def _load(self, root_id: str, cached_children: list[BlockTreeNode]) -> tuple[BlockTree, bool]:
+        """Load the tree reusing the unchanged cached blocks. Also return whether anything changed"""
+
+        tree = BlockTree(root_id=root_id)
+        level: _REVALIDATION_LEVEL_TYPE = [
+            (root_id, tree.children, {node.id: node for node in cached_children}),
+        ]
+        changed = False
+        with ThreadPoolExecutor(max_workers=self._max_concurrency) as executor:
+            while level:
+                futures = [
+                    submit_in_context(executor, fetch_all_children, self._fetch_children, block_id)
+                    for block_id, _, _ in level
+                ]
+                level_results = (future.result() for future in futures)
+                next_level: _REVALIDATION_LEVEL_TYPE = []
+                for (_, children, cached_by_id), children_data in zip(level, level_results):
+                    if [block_data['id'] for block_data in children_data] != list(cached_by_id):
+                        changed = True
+                    for block_data in children_data:
+                        cached_node = cached_by_id.get(block_data['id'])
+                        if _is_unchanged(cached_node, block_data):
+                            assert cached_node is not None
+                            if not self._has_loadable_children(block_data):
+                                children.append(cached_node)
+                                continue
+                            # The descendants could have changed, so they are revalidated too
+                            node = BlockTreeNode(block=cached_node.block)
+                        else:
+                            changed = True
+                            node = BlockTreeNode(block=self._decode(block_data))
+                        children.append(node)
+                        if not self._has_loadable_children(block_data):
+                            continue
+                        cached_grandchildren = cached_node.children if cached_node is not None else []
+                        next_level.append((
+                            block_data['id'], node.children,
+                            {child.id: child for child in cached_grandchildren},
+                        ))
+                level = next_level
+
+        return tree, changed
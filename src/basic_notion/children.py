@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, Union
+
+from basic_notion.block import NotionBlock
+
+
+# Limits of the "Append block children" endpoint
+MAX_CHILDREN_BLOCKS = 100
+MAX_PAYLOAD_SIZE = 500_000
+# Levels of nested children below the appended blocks
+MAX_NESTING_DEPTH = 2
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Should accept the payload's items (``block_id``, ``children``) as keyword arguments,
+# for instance, ``notion_client.Client().blocks.children.append``
+APPEND_CHILDREN_TYPE = Callable[..., Any]
+ASYNC_APPEND_CHILDREN_TYPE = Callable[..., Awaitable[Any]]
+
+_BLOCK_TYPE = Union[NotionBlock, dict]
+
+
+def _get_block_data(block: _BLOCK_TYPE) -> dict:
+    if isinstance(block, NotionBlock):
+        return block.data
+    return block
+
+
+def _get_data_size(data: Any) -> int:
+    return len(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode())
+
+
+def _count_blocks(block_data: dict) -> int:
+    """Count the block and all of the nested blocks in its ``children``"""
+
+    count = 0
+    stack = [block_data]
+    while stack:
+        data = stack.pop()
+        count += 1
+        block_type = data.get('type')
+        custom_data = data.get(block_type) if block_type else None
+        if isinstance(custom_data, dict):
+            stack.extend(custom_data.get('children', ()))
+    return count
+
+
+def _get_nested_children(block_data: dict) -> list[dict]:
+    block_type = block_data.get('type')
+    custom_data = block_data.get(block_type) if block_type else None
+    if isinstance(custom_data, dict):
+        return custom_data.get('children') or []
+    return []
+
+
+def _get_nesting_depth(block_data: dict) -> int:
+    max_depth = 0
+    stack = [(0, block_data)]
+    while stack:
+        depth, data = stack.pop()
+        max_depth = max(max_depth, depth)
+        stack.extend((depth + 1, child_data) for child_data in _get_nested_children(data))
+    return max_depth
+
+
+def split_nested_children(
+        block_data: dict,
+        max_blocks: int = MAX_CHILDREN_BLOCKS,
+        max_depth: int = MAX_NESTING_DEPTH,
+) -> tuple[dict, list[dict]]:
+    """
+    Split block data into the part that can be appended in a single request
+    and the children that have to be appended to the created block separately.
+
+    The children are kept in the block unless there are more than ``max_blocks``
+    blocks in total or they are nested deeper than ``max_depth`` levels.
+    """
+
+    children = _get_nested_children(block_data)
+    if not children or (
+            _get_nesting_depth(block_data) <= max_depth and _count_blocks(block_data) <= max_blocks
+    ):
+        return block_data, []
+
+    block_type = block_data['type']
+    custom_data = {key: value for key, value in block_data[block_type].items() if key != 'children'}
+    return {**block_data, block_type: custom_data}, children
+
+
+def iter_children_batches(
+        block_id: str,
+        blocks: Iterable[_BLOCK_TYPE],
+        max_blocks: int = MAX_CHILDREN_BLOCKS,
+        max_size: int = MAX_PAYLOAD_SIZE,
+) -> Iterator[dict]:
+    """
+    Pack blocks into payloads for appending them as children of ``block_id``.
+
+    Blocks can be given as ``NotionBlock`` instances or raw block data
+    and are consumed lazily.
+    Each payload contains at most ``max_blocks`` blocks (nested ones included)
+    and its JSON representation is at most ``max_size`` bytes long.
+    """
+
+    base_size = _get_data_size({'block_id': block_id, 'children': []})
+    children: list[dict] = []
+    batch_blocks = 0
+    batch_size = base_size
+    for block in blocks:
+        block_data = _get_block_data(block)
+        block_count = _count_blocks(block_data)
+        block_size = _get_data_size(block_data) + 1  # +1 for the separating comma
+        if block_count > max_blocks or base_size + block_size > max_size:
+            raise ValueError(f'Block is too large to be appended in a single request: {block_data.get("id")}')
+
+        if children and (batch_blocks + block_count > max_blocks or batch_size + block_size > max_size):
+            yield {'block_id': block_id, 'children': children}
+            children = []
+            batch_blocks = 0
+            batch_size = base_size
+
+        children.append(block_data)
+        batch_blocks += block_count
+        batch_size += block_size
+
+    if children:
+        yield {'block_id': block_id, 'children': children}
+
+
+def _is_in_progress(queue: Iterable[tuple[str, Any]], block_id: str) -> bool:
+    """Check whether a request for the given block is still in progress"""
+    return any(
+        queued_block_id == block_id and not future.done()
+        for queued_block_id, future in queue
+    )
+
+
+def append_children_batches(
+        append: APPEND_CHILDREN_TYPE,
+        payloads: Iterable[dict],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> Iterator[Any]:
+    """
+    Send payloads (see ``iter_children_batches``) via ``append(**payload)``
+    in a pool of ``max_concurrency`` threads and yield the responses
+    in the order of the payloads.
+
+    Payloads for different parent blocks are sent concurrently,
+    while the ones for the same parent block are sent one after another
+    to preserve the order of the children.
+    """
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        queue: deque[tuple[str, Future]] = deque()
+        for payload in payloads:
+            block_id = payload['block_id']
+            while queue and (len(queue) >= max_concurrency or _is_in_progress(queue, block_id)):
+                yield queue.popleft()[1].result()
+
+            queue.append((block_id, executor.submit(append, **payload)))
+
+        while queue:
+            yield queue.popleft()[1].result()
+
+
+async def append_children_batches_async(
+        append: ASYNC_APPEND_CHILDREN_TYPE,
+        payloads: Iterable[dict],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> AsyncIterator[Any]:
+    """Async version of ``append_children_batches``"""
+
+    queue: deque[tuple[str, asyncio.Future]] = deque()
+    try:
+        for payload in payloads:
+            block_id = payload['block_id']
+            while queue and (len(queue) >= max_concurrency or _is_in_progress(queue, block_id)):
+                yield await queue.popleft()[1]
+
+            queue.append((block_id, asyncio.ensure_future(append(**payload))))
+
+        while queue:
+            yield await queue.popleft()[1]
+    finally:
+        for _, task in queue:
+            task.cancel()
@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+from collections import deque
+from typing import Any, Callable, Iterable, Optional, Union
+
+import attr
+
+from basic_notion.block_tree import BlockTree, BlockTreeNode
+from basic_notion.children import iter_children_batches, split_nested_children
+
+
+# Should accept ``block_id`` and the block's data as keyword arguments,
+# for instance, ``notion_client.Client().blocks.update``
+UPDATE_BLOCK_TYPE = Callable[..., Any]
+# For instance, ``notion_client.Client().blocks.children.append``
+APPEND_CHILDREN_TYPE = Callable[..., Any]
+
+_NODES_TYPE = Union[BlockTree, Iterable[BlockTreeNode]]
+
+# Annotation values that are the same as not having the annotation at all
+_DEFAULT_ANNOTATIONS = {
+    'bold': False, 'italic': False, 'strikethrough': False,
+    'underline': False, 'code': False, 'color': 'default',
+}
+
+
+def _is_rich_text(value: Any) -> bool:
+    return isinstance(value, list) and all(
+        isinstance(item, dict) and item.get('type') == 'text' for item in value
+    )
+
+
+def _normalize_rich_text(rich_text: list[dict]) -> list[list]:
+    result: list[list] = []
+    for run in rich_text:
+        text_data = run.get('text') or {}
+        link = (text_data.get('link') or {}).get('url') or run.get('href')
+        annotations = {
+            name: value for name, value in (run.get('annotations') or {}).items()
+            if _DEFAULT_ANNOTATIONS.get(name) != value
+        }
+        content = text_data.get('content', run.get('plain_text', ''))
+        if result and result[-1][1:] == [link, annotations]:
+            # Adjacent runs with the same style are equivalent to a single run
+            result[-1][0] += content
+        else:
+            result.append([content, link, annotations])
+    return result
+
+
+def get_block_content_data(block_data: dict) -> dict:
+    """Return the block's own (type-specific) data without the nested children"""
+
+    custom_data = block_data.get(block_data['type'])
+    if not isinstance(custom_data, dict):
+        return {}
+    return {key: value for key, value in custom_data.items() if key != 'children'}
+
+
+def get_block_content_hash(block_data: dict) -> str:
+    """
+    Hash of the block's type and content.
+
+    Rich text is normalized, so blocks returned by the API have the same hash
+    as the ones made locally (via ``NotionBlock.make``) with the same text.
+    """
+
+    content = {
+        key: _normalize_rich_text(value) if _is_rich_text(value) else value
+        for key, value in get_block_content_data(block_data).items()
+        # The API returns the default color, while made blocks don't have it
+        if not (key == 'color' and value == 'default')
+    }
+    serialized = json.dumps([block_data['type'], content], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(serialized.encode()).hexdigest()
+
+
+def _get_nodes(nodes: _NODES_TYPE) -> list[BlockTreeNode]:
+    return nodes.children if isinstance(nodes, BlockTree) else list(nodes)
+
+
+def _make_append_data(node: BlockTreeNode) -> dict:
+    """Block data with the node's descendants nested in it (the original data is not modified)"""
+
+    block_data = node.block.data
+    block_type = block_data['type']
+    result = {key: value for key, value in block_data.items() if key != 'id'}
+    if node.children:
+        result[block_type] = {
+            **get_block_content_data(block_data),
+            'children': [_make_append_data(child) for child in node.children],
+        }
+    return result
+
+
+@attr.s(slots=True, frozen=True)
+class UpdateBlock:
+    """Replace the content of an existing block"""
+
+    block_id: str = attr.ib(kw_only=True)
+    block_data: dict = attr.ib(kw_only=True)
+
+    @property
+    def payload(self) -> dict:
+        block_type = self.block_data['type']
+        return {'block_id': self.block_id, block_type: get_block_content_data(self.block_data)}
+
+
+@attr.s(slots=True, frozen=True)
+class AppendBlocks:
+    """
+    Append new blocks to ``parent_id`` after block ``after`` (or at the end if it is ``None``).
+
+    ``payload`` contains all of the blocks and can exceed the limits of the API,
+    ``SyncPlan.apply`` splits it into several requests if needed.
+    """
+
+    parent_id: str = attr.ib(kw_only=True)
+    after: Optional[str] = attr.ib(kw_only=True)
+    children: list[dict] = attr.ib(kw_only=True)
+
+    @property
+    def payload(self) -> dict:
+        payload: dict[str, Any] = {'block_id': self.parent_id, 'children': self.children}
+        if self.after is not None:
+            payload['after'] = self.after
+        return payload
+
+
+@attr.s(slots=True, frozen=True)
+class ArchiveBlock:
+    """Archive (delete) an existing block"""
+
+    block_id: str = attr.ib(kw_only=True)
+
+    @property
+    def payload(self) -> dict:
+        return {'block_id': self.block_id, 'archived': True}
+
+
+SyncOperation = Union[UpdateBlock, AppendBlocks, ArchiveBlock]
+
+
+@attr.s(slots=True, frozen=True)
+class SyncPlan:
+    operations: list[SyncOperation] = attr.ib(kw_only=True, factory=list)
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def __iter__(self):
+        return iter(self.operations)
+
+    def apply(self, update: UPDATE_BLOCK_TYPE, append: APPEND_CHILDREN_TYPE) -> list[Any]:
+        """
+        Execute the operations one after another and return the responses.
+
+        Appended blocks are split into requests that fit the limits of the API
+        (see ``children.iter_children_batches`` and ``children.split_nested_children``),
+        so a single ``AppendBlocks`` operation can take several requests.
+        """
+
+        responses = []
+        for operation in self.operations:
+            if isinstance(operation, AppendBlocks):
+                responses.extend(_append_blocks(append, operation))
+            else:
+                responses.append(update(**operation.payload))
+        return responses
+
+
+def _append_blocks(append: APPEND_CHILDREN_TYPE, operation: AppendBlocks) -> list[Any]:
+    """
+    Append the blocks in batches. The batches are chained via ``after``,
+    and the children that don't fit into a request are appended
+    to the created blocks (taken from the responses) afterwards.
+    """
+
+    responses = []
+    # (parent id, id of the block to append after, blocks)
+    queue: deque[tuple[str, Optional[str], list[dict]]] = deque([
+        (operation.parent_id, operation.after, operation.children),
+    ])
+    while queue:
+        parent_id, after, blocks = queue.popleft()
+        split_blocks = [split_nested_children(block_data) for block_data in blocks]
+        offset = 0
+        for payload in iter_children_batches(parent_id, [block_data for block_data, _ in split_blocks]):
+            batch_size = len(payload['children'])
+            deferred = [children for _, children in split_blocks[offset:offset + batch_size]]
+            offset += batch_size
+            if after is not None:
+                payload['after'] = after
+            response = append(**payload)
+            responses.append(response)
+            if after is None and not any(deferred):
+                continue
+
+            created_ids = [block_data['id'] for block_data in response['results']]
+            for block_id, children in zip(created_ids, deferred):
+                if children:
+                    queue.append((block_id, None, children))
+            if after is not None:
+                after = created_ids[-1]
+
+    return responses
+
+
+def _rewrite_children(
+        parent_id: str, existing: list[BlockTreeNode], desired: list[BlockTreeNode],
+) -> list[SyncOperation]:
+    operations: list[SyncOperation] = [ArchiveBlock(block_id=node.id) for node in existing]
+    if desired:
+        operations.append(AppendBlocks(
+            parent_id=parent_id, after=None,
+            children=[_make_append_data(node) for node in desired],
+        ))
+    return operations
+
+
+def _diff_children_after(
+        parent_id: str, existing: list[BlockTreeNode], desired: list[BlockTreeNode],
+        nested: list[tuple[str, list[BlockTreeNode], list[BlockTreeNode]]],
+        after: Optional[str] = None,
+) -> Optional[list[SyncOperation]]:
+    """
+    Diff the children of a single parent block that come after block ``after``
+    (or all of them if it is ``None``).
+    Return ``None`` if new blocks would have to be inserted before the first child.
+    """
+
+    existing_hashes = [get_block_content_hash(node.block.data) for node in existing]
+    desired_hashes = [get_block_content_hash(node.block.data) for node in desired]
+    matcher = difflib.SequenceMatcher(None, existing_hashes, desired_hashes, autojunk=False)
+
+    operations: list[SyncOperation] = []
+    nested_pairs: list[tuple[str, list[BlockTreeNode], list[BlockTreeNode]]] = []
+    last_kept_id = after
+    pending: list[BlockTreeNode] = []
+
+    def flush_pending() -> bool:
+        nonlocal pending
+        if pending:
+            if last_kept_id is None:
+                # The API can't insert blocks before the first child
+                return False
+            operations.append(AppendBlocks(
+                parent_id=parent_id, after=last_kept_id,
+                children=[_make_append_data(node) for node in pending],
+            ))
+            pending = []
+        return True
+
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        existing_part, desired_part = existing[i1:i2], desired[j1:j2]
+        if tag == 'equal':
+            if not flush_pending():
+                return None
+            for existing_node, desired_node in zip(existing_part, desired_part):
+                nested_pairs.append((existing_node.id, existing_node.children, desired_node.children))
+                last_kept_id = existing_node.id
+            continue
+
+        for idx in range(max(len(existing_part), len(desired_part))):
+            old_node = existing_part[idx] if idx < len(existing_part) else None
+            new_node = desired_part[idx] if idx < len(desired_part) else None
+            if old_node is not None and new_node is not None and old_node.block.type == new_node.block.type:
+                if not flush_pending():
+                    return None
+                operations.append(UpdateBlock(block_id=old_node.id, block_data=new_node.block.data))
+                nested_pairs.append((old_node.id, old_node.children, new_node.children))
+                last_kept_id = old_node.id
+                continue
+            if old_node is not None:
+                operations.append(ArchiveBlock(block_id=old_node.id))
+            if new_node is not None:
+                pending.append(new_node)
+
+    if pending:
+        # No blocks are kept after the pending ones, so they can go to the end
+        operations.append(AppendBlocks(
+            parent_id=parent_id, after=last_kept_id,
+            children=[_make_append_data(node) for node in pending],
+        ))
+
+    nested.extend(nested_pairs)
+    return operations
+
+
+def _diff_children(
+        parent_id: str, existing: list[BlockTreeNode], desired: list[BlockTreeNode],
+        nested: list[tuple[str, list[BlockTreeNode], list[BlockTreeNode]]],
+) -> list[SyncOperation]:
+    """
+    Diff the children of a single parent block.
+    Pairs of matched blocks whose children should be compared are added to ``nested``.
+
+    New blocks can't be inserted before the first child, so if the first desired block is new,
+    the first existing block of the same type is turned into it (the ones before it are archived)
+    and the rest of the children are diffed after it.
+    Only if there is no such block are all of the children rewritten.
+    """
+
+    operations = _diff_children_after(parent_id, existing, desired, nested=nested)
+    if operations is not None:
+        return operations
+
+    first = desired[0]
+    anchor_idx = next(
+        (idx for idx, node in enumerate(existing) if node.block.type == first.block.type),
+        None,
+    )
+    if anchor_idx is None:
+        return _rewrite_children(parent_id, existing, desired)
+
+    anchor = existing[anchor_idx]
+    operations = [ArchiveBlock(block_id=node.id) for node in existing[:anchor_idx]]
+    if get_block_content_hash(anchor.block.data) != get_block_content_hash(first.block.data):
+        operations.append(UpdateBlock(block_id=anchor.id, block_data=first.block.data))
+    nested.append((anchor.id, anchor.children, first.children))
+    rest_operations = _diff_children_after(
+        parent_id, existing[anchor_idx + 1:], desired[1:], nested=nested, after=anchor.id,
+    )
+    # Blocks can always be appended after the anchor
+    assert rest_operations is not None
+    operations.extend(rest_operations)
+    return operations
+
+
+def diff_block_trees(existing: _NODES_TYPE, desired: _NODES_TYPE, root_id: Optional[str] = None) -> SyncPlan:
+    """
+    Make a plan of operations that turn the ``existing`` tree (as loaded by ``fetch_block_tree``)
+    into the ``desired`` one (made of blocks created via ``NotionBlock.make``).
+
+    Blocks are matched by their type and content (see ``get_block_content_hash``).
+    Unmatched blocks of the same type are updated in place,
+    the rest are archived or appended, so that changing a single block
+    costs a single request.
+    """
+
+    if root_id is None:
+        if not isinstance(existing, BlockTree):
+            raise ValueError('root_id must be specified if existing is not a BlockTree')
+        root_id = existing.root_id
+
+    operations: list[SyncOperation] = []
+    stack: list[tuple[str, list[BlockTreeNode], list[BlockTreeNode]]] = [
+        (root_id, _get_nodes(existing), _get_nodes(desired)),
+    ]
+    while stack:
+        parent_id, existing_nodes, desired_nodes = stack.pop()
+        nested: list[tuple[str, list[BlockTreeNode], list[BlockTreeNode]]] = []
+        operations.extend(_diff_children(parent_id, existing_nodes, desired_nodes, nested=nested))
+        stack.extend(reversed(nested))
+
+    return SyncPlan(operations=operations)
@@ -1,6 +1,27 @@
+from typing import Optional
+
+
 class ItemHasNoData(Exception):
     pass
 
 
 class InvalidDataType(Exception):
     pass
+
+
+class DuplicateBlockTypeWarning(UserWarning):
+    pass
+
+
+class NotionAPIError(Exception):
+    """Error response of the API. Has the same attributes as ``notion_client.APIResponseError``"""
+
+    def __init__(self, status: int, code: str, message: str, headers: Optional[dict[str, str]] = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.headers = headers or {}
+
+    @property
+    def body(self) -> dict:
+        return {'object': 'error', 'status': self.status, 'code': self.code, 'message': str(self)}
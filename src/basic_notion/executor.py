@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+import attr
+
+from basic_notion.ratelimit import TokenBucket
+
+
+_RT = TypeVar('_RT')
+
+DEFAULT_MAX_CONCURRENCY = 3
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 30.0
+# Number of latest calls used for latency statistics
+LATENCY_WINDOW_SIZE = 1000
+
+RETRYABLE_STATUSES = frozenset((409, 429, 500, 502, 503, 504))
+# Statuses of errors that guarantee that the request had no effect
+SAFE_RETRYABLE_STATUSES = frozenset((429,))
+# Names of the classes of transport errors raised by clients that don't use the built-in exceptions
+# (``httpx.TransportError``, ``notion_client.errors.RequestTimeoutError``), matched by the error's MRO,
+# so that the clients don't have to be installed
+TRANSPORT_ERROR_CLASS_NAMES = frozenset(('TransportError', 'RequestTimeoutError'))
+# Transport errors that happen before the request is sent (no connection could be established)
+SAFE_TRANSPORT_ERROR_CLASS_NAMES = frozenset(('ConnectError', 'ConnectTimeout', 'PoolTimeout'))
+# Names of client methods that create objects
+# (``pages.create``, ``databases.create``, ``blocks.children.append``)
+NON_IDEMPOTENT_METHOD_NAMES = frozenset(('create', 'append'))
+
+
+def get_error_status(err: BaseException) -> Optional[int]:
+    """
+    Get the HTTP status of the error raised by the client
+    (``notion_client.APIResponseError.status``, ``httpx.HTTPStatusError.response.status_code``, etc.)
+    """
+
+    for obj in (err, getattr(err, 'response', None)):
+        for attr_name in ('status', 'status_code'):
+            status = getattr(obj, attr_name, None)
+            if isinstance(status, int):
+                return status
+    return None
+
+
+def get_retry_after(err: BaseException) -> Optional[float]:
+    """Get the value of the ``Retry-After`` header (in seconds) of the error's response"""
+
+    for obj in (err, getattr(err, 'response', None)):
+        headers = getattr(obj, 'headers', None)
+        if headers is None:
+            continue
+        value = headers.get('Retry-After') or headers.get('retry-after')
+        if value is None:
+            continue
+        try:
+            return max(float(value), 0.0)
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def _has_class_name(err: BaseException, class_names: frozenset[str]) -> bool:
+    return any(cls.__name__ in class_names for cls in type(err).__mro__)
+
+
+def is_retryable_error(err: BaseException) -> bool:
+    if isinstance(err, (ConnectionError, TimeoutError)) or _has_class_name(err, TRANSPORT_ERROR_CLASS_NAMES):
+        return True
+    return get_error_status(err) in RETRYABLE_STATUSES
+
+
+def is_safely_retryable_error(err: BaseException) -> bool:
+    """
+    Check whether a non-idempotent request can be retried after the error.
+    After a timeout, a failure of an established connection or a server error
+    the request might have been processed, so retrying it could, for instance, create a duplicate page.
+    """
+
+    if isinstance(err, ConnectionError) or _has_class_name(err, SAFE_TRANSPORT_ERROR_CLASS_NAMES):
+        return True
+    return get_error_status(err) in SAFE_RETRYABLE_STATUSES
+
+
+def is_idempotent_call(func: Callable) -> bool:
+    return getattr(func, '__name__', None) not in NON_IDEMPOTENT_METHOD_NAMES
+
+
+@attr.s(slots=True)
+class ExecutorMetrics:
+    calls: int = attr.ib(kw_only=True, default=0)
+    retries: int = attr.ib(kw_only=True, default=0)
+    failures: int = attr.ib(kw_only=True, default=0)
+    rate_limited: int = attr.ib(kw_only=True, default=0)
+    # Calls waiting for a concurrency slot or a rate limiter token
+    queue_depth: int = attr.ib(kw_only=True, default=0)
+    max_queue_depth: int = attr.ib(kw_only=True, default=0)
+    in_flight: int = attr.ib(kw_only=True, default=0)
+    # Durations of the latest calls (including retries) in seconds
+    latencies: deque[float] = attr.ib(kw_only=True, factory=lambda: deque(maxlen=LATENCY_WINDOW_SIZE))
+
+    def get_latency_percentile(self, percentile: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        idx = min(int(len(ordered) * percentile / 100), len(ordered) - 1)
+        return ordered[idx]
+
+    @property
+    def latency_p50(self) -> float:
+        return self.get_latency_percentile(50)
+
+    @property
+    def latency_p99(self) -> float:
+        return self.get_latency_percentile(99)
+
+
+@attr.s(slots=True)
+class RequestExecutor:
+    """
+    Executes client calls (sync or async) with shared rate and concurrency limits.
+
+    Failed calls are retried if ``is_retryable(err)`` is true.
+    Calls that are not idempotent (``is_idempotent(func)`` is false,
+    e.g. ``client.pages.create``) are only retried if ``is_retryable_non_idempotent(err)``
+    is true (on 429 and connection errors by default), so that they are not repeated
+    after a failure that might have happened when the object was already created.
+    Pass ``idempotent=True`` to ``wrap`` to retry them on all retryable errors.
+    If the error has a ``Retry-After`` value, the shared rate limiter is paused
+    for that time, otherwise the call is retried after a jittered exponential backoff.
+
+    Usage::
+
+        executor = RequestExecutor()
+        executor.call(client.pages.update, **page.data)
+        create_page = executor.wrap(client.pages.create)
+    """
+
+    _rate_limiter: TokenBucket = attr.ib(kw_only=True, factory=TokenBucket)
+    _max_concurrency: int = attr.ib(kw_only=True, default=DEFAULT_MAX_CONCURRENCY)
+    _max_retries: int = attr.ib(kw_only=True, default=DEFAULT_MAX_RETRIES)
+    _backoff_base: float = attr.ib(kw_only=True, default=DEFAULT_BACKOFF_BASE)
+    _backoff_max: float = attr.ib(kw_only=True, default=DEFAULT_BACKOFF_MAX)
+    _is_retryable: Callable[[BaseException], bool] = attr.ib(kw_only=True, default=is_retryable_error)
+    _is_retryable_non_idempotent: Callable[[BaseException], bool] = attr.ib(
+        kw_only=True, default=is_safely_retryable_error)
+    _is_idempotent: Callable[[Callable], bool] = attr.ib(kw_only=True, default=is_idempotent_call)
+    _get_retry_after: Callable[[BaseException], Optional[float]] = attr.ib(kw_only=True, default=get_retry_after)
+    _sleep: Callable[[float], Any] = attr.ib(kw_only=True, default=time.sleep)
+    _random: Callable[[], float] = attr.ib(kw_only=True, default=random.random)
+    _metrics: ExecutorMetrics = attr.ib(init=False, factory=ExecutorMetrics)
+    _lock: threading.Lock = attr.ib(init=False, factory=threading.Lock)
+    _semaphore: threading.BoundedSemaphore = attr.ib(init=False)
+    # Created on first use, so that it belongs to the running event loop
+    _async_semaphore: Optional[asyncio.Semaphore] = attr.ib(init=False, default=None)
+
+    def __attrs_post_init__(self) -> None:
+        self._semaphore = threading.BoundedSemaphore(self._max_concurrency)
+
+    @property
+    def metrics(self) -> ExecutorMetrics:
+        return self._metrics
+
+    @property
+    def rate_limiter(self) -> TokenBucket:
+        return self._rate_limiter
+
+    def _update_queue_depth(self, delta: int) -> None:
+        with self._lock:
+            metrics = self._metrics
+            metrics.queue_depth += delta
+            metrics.max_queue_depth = max(metrics.max_queue_depth, metrics.queue_depth)
+
+    def _update_in_flight(self, delta: int) -> None:
+        with self._lock:
+            self._metrics.in_flight += delta
+
+    def _get_retry_delay(self, err: BaseException, attempt: int, idempotent: bool) -> tuple[Optional[float], bool]:
+        """
+        Return the delay before the next attempt (``None`` if the call should not be retried)
+        and whether the delay was requested by the server
+        """
+
+        is_retryable = self._is_retryable if idempotent else self._is_retryable_non_idempotent
+        if attempt >= self._max_retries or not is_retryable(err):
+            return None, False
+        retry_after = self._get_retry_after(err)
+        if retry_after is not None:
+            return retry_after, True
+        # "Full jitter" backoff
+        return self._random() * min(self._backoff_max, self._backoff_base * 2 ** attempt), False
+
+    def _handle_error(self, err: BaseException, attempt: int, idempotent: bool) -> float:
+        """Return the delay before the next attempt or re-raise the error"""
+
+        delay, from_server = self._get_retry_delay(err, attempt, idempotent=idempotent)
+        with self._lock:
+            if delay is None:
+                self._metrics.failures += 1
+            else:
+                self._metrics.retries += 1
+                if from_server:
+                    self._metrics.rate_limited += 1
+        if delay is None:
+            raise err
+        if from_server:
+            # All calls sharing the rate limiter should wait
+            self._rate_limiter.pause(delay)
+            return 0.0
+        return delay
+
+    def _record_call(self, started: float) -> None:
+        with self._lock:
+            self._metrics.calls += 1
+            self._metrics.latencies.append(time.monotonic() - started)
+
+    def call(self, func: Callable[..., _RT], *args: Any, **kwargs: Any) -> _RT:
+        return self._call(func, args, kwargs, idempotent=self._is_idempotent(func))
+
+    def _call(self, func: Callable[..., _RT], args: tuple, kwargs: dict[str, Any], idempotent: bool) -> _RT:
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            self._update_queue_depth(1)
+            with self._semaphore:
+                self._rate_limiter.acquire()
+                self._update_queue_depth(-1)
+                self._update_in_flight(1)
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as err:
+                    error: Optional[Exception] = err
+                else:
+                    error = None
+                finally:
+                    self._update_in_flight(-1)
+
+            if error is None:
+                self._record_call(started)
+                return result
+
+            try:
+                delay = self._handle_error(error, attempt, idempotent=idempotent)
+            except Exception:
+                self._record_call(started)
+                raise
+            if delay > 0:
+                self._sleep(delay)
+            attempt += 1
+
+    async def call_async(self, func: Callable[..., Awaitable[_RT]], *args: Any, **kwargs: Any) -> _RT:
+        return await self._call_async(func, args, kwargs, idempotent=self._is_idempotent(func))
+
+    async def _call_async(
+            self, func: Callable[..., Awaitable[_RT]], args: tuple, kwargs: dict[str, Any], idempotent: bool,
+    ) -> _RT:
+        if self._async_semaphore is None:
+            self._async_semaphore = asyncio.Semaphore(self._max_concurrency)
+        semaphore = self._async_semaphore
+
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            self._update_queue_depth(1)
+            async with semaphore:
+                await self._rate_limiter.acquire_async()
+                self._update_queue_depth(-1)
+                self._update_in_flight(1)
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as err:
+                    error: Optional[Exception] = err
+                else:
+                    error = None
+                finally:
+                    self._update_in_flight(-1)
+
+            if error is None:
+                self._record_call(started)
+                return result
+
+            try:
+                delay = self._handle_error(error, attempt, idempotent=idempotent)
+            except Exception:
+                self._record_call(started)
+                raise
+            if delay > 0:
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    def wrap(self, func: Callable[..., _RT], idempotent: Optional[bool] = None) -> Callable[..., _RT]:
+        """Wrap ``func`` to be called via the executor. ``idempotent`` overrides ``is_idempotent(func)``"""
+
+        is_idempotent = self._is_idempotent(func) if idempotent is None else idempotent
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> _RT:
+            return self._call(func, args, kwargs, idempotent=is_idempotent)
+
+        return wrapper
+
+    def wrap_async(
+            self, func: Callable[..., Awaitable[_RT]], idempotent: Optional[bool] = None,
+    ) -> Callable[..., Awaitable[_RT]]:
+        is_idempotent = self._is_idempotent(func) if idempotent is None else idempotent
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> _RT:
+            return await self._call_async(func, args, kwargs, idempotent=is_idempotent)
+
+        return wrapper
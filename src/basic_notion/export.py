@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import attr
+
+from basic_notion.block_tree import (
+    ASYNC_FETCH_CHILDREN_TYPE, FETCH_CHILDREN_TYPE, BlockTree,
+    fetch_block_tree, fetch_block_tree_async,
+)
+from basic_notion.markdown import render_markdown, render_plain_text
+from basic_notion.page import NotionPage
+from basic_notion.ratelimit import TokenBucket
+from basic_notion.telemetry import submit_in_context
+
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_CONCURRENCY = 4
+
+# format -> file extension
+EXPORT_FORMATS = {
+    'markdown': '.md',
+    'text': '.txt',
+    'json': '.json',
+}
+
+
+@attr.s(slots=True)
+class ExportStats:
+    """Progress of an export"""
+
+    exported: int = attr.ib(kw_only=True, default=0)
+    skipped: int = attr.ib(kw_only=True, default=0)
+    failed: int = attr.ib(kw_only=True, default=0)
+    blocks: int = attr.ib(kw_only=True, default=0)
+    bytes_written: int = attr.ib(kw_only=True, default=0)
+    requests: int = attr.ib(kw_only=True, default=0)
+    # page id -> error description
+    errors: dict[str, str] = attr.ib(kw_only=True, factory=dict)
+    started: float = attr.ib(kw_only=True, factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def pages_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.exported / elapsed if elapsed > 0 else 0.0
+
+
+@attr.s(slots=True)
+class ExportCheckpoint:
+    """
+    Text file with the ids of exported pages (one per line).
+    Pages listed in it are skipped when the export is restarted.
+    """
+
+    _path: str = attr.ib(kw_only=True)
+    _done: Optional[set[str]] = attr.ib(init=False, default=None)
+
+    def load(self) -> set[str]:
+        if self._done is None:
+            self._done = set()
+            if os.path.exists(self._path):
+                with open(self._path, encoding='utf-8') as checkpoint_file:
+                    self._done.update(line.strip() for line in checkpoint_file if line.strip())
+        return self._done
+
+    def is_done(self, page_id: str) -> bool:
+        return page_id in self.load()
+
+    def mark_done(self, page_id: str) -> None:
+        self.load().add(page_id)
+        with open(self._path, 'a', encoding='utf-8') as checkpoint_file:
+            checkpoint_file.write(f'{page_id}\n')
+
+
+def serialize_page(page: NotionPage, tree: BlockTree, format: str = 'markdown') -> str:
+    if format == 'markdown':
+        return render_markdown(tree)
+    if format == 'text':
+        return render_plain_text(tree)
+    if format == 'json':
+        return json.dumps({'page': page.data, 'body': tree.to_data()}, ensure_ascii=False)
+    raise ValueError(f'Unsupported export format: {format}')
+
+
+def _write_file(directory: str, file_name: str, content: str) -> int:
+    path = os.path.join(directory, file_name)
+    data = content.encode()
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as output_file:
+        output_file.write(data)
+    os.replace(tmp_path, path)
+    return len(data)
+
+
+@attr.s(slots=True, frozen=True)
+class _PageResult:
+    page_id: str = attr.ib(kw_only=True)
+    blocks: int = attr.ib(kw_only=True, default=0)
+    bytes_written: int = attr.ib(kw_only=True, default=0)
+    error: Optional[str] = attr.ib(kw_only=True, default=None)
+
+
+@attr.s(slots=True)
+class _Exporter:
+    """State shared by the sync and async exports"""
+
+    directory: str = attr.ib(kw_only=True)
+    format: str = attr.ib(kw_only=True)
+    checkpoint: Optional[ExportCheckpoint] = attr.ib(kw_only=True)
+    on_progress: Optional[Callable[[ExportStats], None]] = attr.ib(kw_only=True)
+    stats: ExportStats = attr.ib(kw_only=True, factory=ExportStats)
+    _lock: threading.Lock = attr.ib(init=False, factory=threading.Lock)
+
+    def __attrs_post_init__(self) -> None:
+        if self.format not in EXPORT_FORMATS:
+            raise ValueError(f'Unsupported export format: {self.format}')
+        os.makedirs(self.directory, exist_ok=True)
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.stats.requests += 1
+
+    def iter_pending_pages(self, pages: Iterable[NotionPage]) -> Iterator[NotionPage]:
+        for page in pages:
+            if self.checkpoint is not None and self.checkpoint.is_done(page.id):
+                self.stats.skipped += 1
+                continue
+            yield page
+
+    def write_page(self, page: NotionPage, tree: BlockTree) -> _PageResult:
+        content = serialize_page(page, tree, format=self.format)
+        file_name = f'{page.id}{EXPORT_FORMATS[self.format]}'
+        size = _write_file(self.directory, file_name, content)
+        return _PageResult(page_id=page.id, blocks=len(tree), bytes_written=size)
+
+    def add_result(self, result: _PageResult) -> None:
+        if result.error is not None:
+            self.stats.failed += 1
+            self.stats.errors[result.page_id] = result.error
+        else:
+            self.stats.exported += 1
+            self.stats.blocks += result.blocks
+            self.stats.bytes_written += result.bytes_written
+            if self.checkpoint is not None:
+                self.checkpoint.mark_done(result.page_id)
+        if self.on_progress is not None:
+            self.on_progress(self.stats)
+
+
+def _make_exporter(
+        directory: str, format: str, checkpoint_path: Optional[str],
+        on_progress: Optional[Callable[[ExportStats], None]],
+) -> _Exporter:
+    checkpoint = ExportCheckpoint(path=checkpoint_path) if checkpoint_path is not None else None
+    return _Exporter(directory=directory, format=format, checkpoint=checkpoint, on_progress=on_progress)
+
+
+def export_pages(
+        pages: Iterable[NotionPage],
+        fetch_children: FETCH_CHILDREN_TYPE,
+        directory: str,
+        format: str = 'markdown',
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_limiter: Optional[TokenBucket] = None,
+        checkpoint_path: Optional[str] = None,
+        on_progress: Optional[Callable[[ExportStats], None]] = None,
+) -> ExportStats:
+    """
+    Export the bodies of ``pages`` to files in ``directory`` (one file per page).
+
+    Pages are consumed lazily and processed by a pool of ``max_workers`` threads.
+    All requests of the export go through ``fetch_children``
+    in a single shared pool of ``max_concurrency`` threads
+    and at the pace of ``rate_limiter`` (if given).
+    Ids of exported pages are saved to ``checkpoint_path`` (if given),
+    and these pages are skipped when the export is run again.
+    Failed pages don't stop the export, they are listed in the returned stats.
+    """
+
+    exporter = _make_exporter(directory, format, checkpoint_path=checkpoint_path, on_progress=on_progress)
+
+    def limited_fetch(**kwargs: Any) -> dict:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        exporter.count_request()
+        return fetch_children(**kwargs)
+
+    # The page workers only wait for the fetches,
+    # which all run in this pool, so it limits the concurrency of the whole export
+    fetch_executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    def export_page(page: NotionPage) -> _PageResult:
+        try:
+            tree = fetch_block_tree(limited_fetch, root_id=page.id, executor=fetch_executor)
+            return exporter.write_page(page, tree)
+        except Exception as err:
+            return _PageResult(page_id=page.id, error=repr(err))
+
+    with fetch_executor, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        queue: deque[Future] = deque()
+        for page in exporter.iter_pending_pages(pages):
+            # Keep a bounded number of pages in flight
+            while len(queue) >= max_workers * 2:
+                exporter.add_result(queue.popleft().result())
+            queue.append(submit_in_context(executor, export_page, page))
+
+        while queue:
+            exporter.add_result(queue.popleft().result())
+
+    return exporter.stats
+
+
+async def export_pages_async(
+        pages: Iterable[NotionPage],
+        fetch_children: ASYNC_FETCH_CHILDREN_TYPE,
+        directory: str,
+        format: str = 'markdown',
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_limiter: Optional[TokenBucket] = None,
+        checkpoint_path: Optional[str] = None,
+        on_progress: Optional[Callable[[ExportStats], None]] = None,
+) -> ExportStats:
+    """
+    Async version of ``export_pages``.
+    ``max_workers`` pages are processed concurrently, files are written in threads.
+    """
+
+    exporter = _make_exporter(directory, format, checkpoint_path=checkpoint_path, on_progress=on_progress)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def limited_fetch(**kwargs: Any) -> dict:
+        async with semaphore:
+            if rate_limiter is not None:
+                await rate_limiter.acquire_async()
+            exporter.count_request()
+            return await fetch_children(**kwargs)
+
+    async def export_page(page: NotionPage) -> _PageResult:
+        try:
+            # The global limit is enforced by ``limited_fetch``
+            tree = await fetch_block_tree_async(limited_fetch, root_id=page.id, max_concurrency=max_concurrency)
+            return await asyncio.to_thread(exporter.write_page, page, tree)
+        except Exception as err:
+            return _PageResult(page_id=page.id, error=repr(err))
+
+    queue: deque[asyncio.Future] = deque()
+    try:
+        for page in exporter.iter_pending_pages(pages):
+            while len(queue) >= max_workers:
+                exporter.add_result(await queue.popleft())
+            queue.append(asyncio.ensure_future(export_page(page)))
+
+        while queue:
+            exporter.add_result(await queue.popleft())
+    finally:
+        for task in queue:
+            task.cancel()
+
+    return exporter.stats
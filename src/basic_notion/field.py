@@ -118,6 +118,20 @@ class NotionField(Generic[_PROP_SCHEMA_TV, _PROP_TV]):
         set_to_dict(instance.data, self.__key, normalized_value_data)
 
 
+def get_fields(owner: type) -> dict[str, NotionField]:
+    """
+    Return all ``NotionField`` attributes of the class (including inherited ones)
+    without invoking their ``__get__``
+    """
+
+    fields: dict[str, NotionField] = {}
+    for klass in reversed(owner.__mro__):
+        for name, value in vars(klass).items():
+            if isinstance(value, NotionField):
+                fields[name] = value
+    return fields
+
+
 class NumberField(NotionField[NumberPropertySchema, NumberProperty]):
     __slots__ = ()
 
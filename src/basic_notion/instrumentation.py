@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+import attr
+
+from basic_notion.attr import ItemAttrDescriptor
+from basic_notion.base import NotionItemBase
+from basic_notion.field import NotionField
+from basic_notion.patching import ORDER_INSTRUMENTATION, MAKE_REPLACEMENT_TYPE, add_patch, remove_patches
+from basic_notion.utils import get_from_dict
+from basic_notion.view import _ReusedFieldDescriptor, get_view_base_cls
+
+
+# Instrumented hot paths
+ATTR_GET = 'attr_get'
+ATTR_SET = 'attr_set'
+CONVERTER = 'converter'
+FIELD_GET = 'field_get'
+FIELD_SET = 'field_set'
+CLEAR_DERIVED_ATTRS = 'clear_derived_attrs'
+
+# (category, owner class name, attribute/converter name)
+_STAT_KEY_TYPE = tuple[str, str, str]
+
+
+@attr.s(slots=True)
+class HotPathStat:
+    calls: int = attr.ib(kw_only=True, default=0)
+    # Total duration in seconds (including the nested instrumented calls)
+    total_time: float = attr.ib(kw_only=True, default=0.0)
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+@attr.s(slots=True)
+class InstrumentationStats:
+    """Call counts and durations of the model hot paths per class and attribute"""
+
+    _stats: dict[_STAT_KEY_TYPE, HotPathStat] = attr.ib(init=False, factory=dict)
+    _lock: threading.Lock = attr.ib(init=False, factory=threading.Lock)
+
+    def record(self, category: str, owner: str, name: str, duration: float) -> None:
+        key = (category, owner, name)
+        with self._lock:
+            stat = self._stats.get(key)
+            if stat is None:
+                stat = self._stats[key] = HotPathStat()
+            stat.calls += 1
+            stat.total_time += duration
+
+    def get(self, category: str, owner: str, name: str) -> HotPathStat:
+        return self._stats.get((category, owner, name)) or HotPathStat()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def as_dict(self) -> dict[str, dict[str, dict[str, dict[str, float]]]]:
+        """Return stats as ``{category: {owner: {name: {'calls': ..., 'total_time': ...}}}}``"""
+
+        result: dict[str, dict[str, dict[str, dict[str, float]]]] = {}
+        for (category, owner, name), stat in sorted(self._stats.items()):
+            result.setdefault(category, {}).setdefault(owner, {})[name] = {
+                'calls': stat.calls, 'total_time': stat.total_time,
+            }
+        return result
+
+    def format_table(self, limit: Optional[int] = None) -> str:
+        """Format stats as a text table sorted by total time"""
+
+        rows = sorted(self._stats.items(), key=lambda item: item[1].total_time, reverse=True)[:limit]
+        lines = [f'{"category":<20} {"class":<24} {"name":<24} {"calls":>10} {"total ms":>10} {"mean us":>10}']
+        for (category, owner, name), stat in rows:
+            lines.append(
+                f'{category:<20} {owner:<24} {name:<24} {stat.calls:>10} '
+                f'{stat.total_time * 1000:>10.3f} {stat.mean_time * 1e6:>10.3f}'
+            )
+        return '\n'.join(lines)
+
+
+def _get_owner_name(cls: type) -> str:
+    # Access via ``cursor()`` views is reported under the model itself
+    return get_view_base_cls(cls).__name__
+
+
+def _get_converter_name(converter: Callable) -> str:
+    return getattr(converter, '__qualname__', None) or repr(converter)
+
+
+def _make_attr_get(stats: InstrumentationStats) -> Callable:
+    perf_counter = time.perf_counter
+
+    # Same as ``ItemAttrDescriptor.__get__``, but times the converter separately
+    def __get__(self: ItemAttrDescriptor, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self
+
+        started = perf_counter()
+        value = get_from_dict(instance.data, self.key)
+        get_converter = self.get_converter
+        if get_converter is not None:
+            converter_started = perf_counter()
+            value = get_converter(value)
+            stats.record(
+                CONVERTER, _get_owner_name(owner), _get_converter_name(get_converter),
+                perf_counter() - converter_started,
+            )
+        stats.record(ATTR_GET, _get_owner_name(owner), self.name or '', perf_counter() - started)
+        return value
+
+    return __get__
+
+
+def _make_timed(
+        stats: InstrumentationStats, category: str, func: Callable,
+        get_names: Callable[..., tuple[str, str]],
+) -> Callable:
+    perf_counter = time.perf_counter
+
+    def timed(*args: Any) -> Any:
+        started = perf_counter()
+        try:
+            return func(*args)
+        finally:
+            stats.record(category, *get_names(*args), perf_counter() - started)
+
+    timed.__name__ = func.__name__
+    timed.__qualname__ = func.__qualname__
+    timed.__doc__ = func.__doc__
+    return timed
+
+
+def _make_field_get(stats: InstrumentationStats, func: Callable) -> Callable:
+    perf_counter = time.perf_counter
+
+    def __get__(self: NotionField, instance: Any, owner: type) -> Any:
+        if instance is None or get_view_base_cls(owner) is not owner:
+            # Access via views is recorded by ``_ReusedFieldDescriptor.__get__``
+            return func(self, instance, owner)
+        started = perf_counter()
+        try:
+            return func(self, instance, owner)
+        finally:
+            stats.record(FIELD_GET, owner.__name__, self._property_name, perf_counter() - started)
+
+    return __get__
+
+
+def _make_reused_field_get(stats: InstrumentationStats, func: Callable) -> Callable:
+    perf_counter = time.perf_counter
+
+    def __get__(self: _ReusedFieldDescriptor, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return func(self, instance, owner)
+        started = perf_counter()
+        try:
+            return func(self, instance, owner)
+        finally:
+            stats.record(FIELD_GET, _get_owner_name(owner), self.get_field()._property_name, perf_counter() - started)
+
+    return __get__
+
+
+# Owner of the patches (see ``patching.add_patch``)
+_PATCH_OWNER = 'instrumentation'
+_stats: Optional[InstrumentationStats] = None
+
+
+def is_installed() -> bool:
+    return _stats is not None
+
+
+def get_stats() -> Optional[InstrumentationStats]:
+    return _stats
+
+
+def install(stats: Optional[InstrumentationStats] = None) -> InstrumentationStats:
+    """
+    Replace the hot paths of the model layer (attribute and field descriptors,
+    including the ones of ``cursor()`` views, and ``clear_derived_attrs``)
+    with instrumented versions that record their stats.
+    Access via views is reported under the model class.
+
+    The replacement is done on the classes at runtime,
+    so there is no overhead at all when instrumentation is not installed.
+    It can be combined with ``access_recorder.FieldAccessRecorder``
+    and both can be removed in any order (see ``patching``).
+    """
+
+    global _stats
+    if _stats is not None:
+        raise RuntimeError('Instrumentation is already installed')
+
+    stats = stats if stats is not None else InstrumentationStats()
+    replacements: dict[tuple[type, str], MAKE_REPLACEMENT_TYPE] = {
+        # Re-implemented to time the converter separately (the innermost layer wraps the original)
+        (ItemAttrDescriptor, '__get__'): lambda func: _make_attr_get(stats),
+        (ItemAttrDescriptor, '__set__'): lambda func: _make_timed(
+            stats, ATTR_SET, func,
+            lambda descriptor, instance, value: (_get_owner_name(type(instance)), descriptor.name or ''),
+        ),
+        (NotionField, '__get__'): lambda func: _make_field_get(stats, func),
+        (NotionField, '__set__'): lambda func: _make_timed(
+            stats, FIELD_SET, func,
+            lambda field, instance, value: (_get_owner_name(type(instance)), field._property_name),
+        ),
+        (_ReusedFieldDescriptor, '__get__'): lambda func: _make_reused_field_get(stats, func),
+        (NotionItemBase, 'clear_derived_attrs'): lambda func: _make_timed(
+            stats, CLEAR_DERIVED_ATTRS, func,
+            lambda instance: (_get_owner_name(type(instance)), ''),
+        ),
+    }
+    for (cls, name), make_replacement in replacements.items():
+        add_patch(_PATCH_OWNER, cls, name, make_replacement, order=ORDER_INSTRUMENTATION)
+    _stats = stats
+    return stats
+
+
+def uninstall() -> None:
+    """Restore the original (not instrumented) hot paths"""
+
+    global _stats
+    remove_patches(_PATCH_OWNER)
+    _stats = None
+
+
+@contextmanager
+def instrument(stats: Optional[InstrumentationStats] = None) -> Iterator[InstrumentationStats]:
+    """Install instrumentation for the duration of the ``with`` block"""
+
+    installed_stats = install(stats)
+    try:
+        yield installed_stats
+    finally:
+        uninstall()
@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import io
+import re
+from typing import Any, Iterable, Iterator, Optional, TextIO, Union
+
+from basic_notion.block_tree import BlockTree, BlockTreeNode
+
+
+_TREE_TYPE = Union[BlockTree, Iterable[BlockTreeNode]]
+
+# Blocks whose children are rendered as nested (indented) content
+_LIST_BLOCK_TYPES = frozenset(('bulleted_list_item', 'numbered_list_item', 'to_do', 'toggle'))
+
+_HEADING_PREFIXES = {
+    'heading_1': '# ',
+    'heading_2': '## ',
+    'heading_3': '### ',
+}
+
+
+def _get_rich_text(custom_data: Any) -> list[dict]:
+    if not isinstance(custom_data, dict):
+        return []
+    # Older versions of the API use ``text``, newer ones - ``rich_text``
+    return custom_data.get('text') or custom_data.get('rich_text') or []
+
+
+def _get_run_text(run: dict) -> str:
+    text_data = run.get('text')
+    if isinstance(text_data, dict) and 'content' in text_data:
+        return text_data['content']
+    return run.get('plain_text', '')
+
+
+def _get_run_link(run: dict) -> Optional[str]:
+    text_data = run.get('text')
+    if isinstance(text_data, dict) and text_data.get('link'):
+        return text_data['link'].get('url')
+    return run.get('href')
+
+
+class PlainTextRenderer:
+    """
+    Renders block trees as plain text.
+
+    The tree is traversed iteratively and the output is written
+    to the stream block by block, so the only memory used
+    (apart from the tree itself) is the traversal stack.
+    """
+
+    INDENT = '  '
+    # Written after each block that is not a list item
+    BLOCK_SEP = '\n'
+
+    def render_rich_text(self, rich_text: list[dict]) -> str:
+        return ''.join([_get_run_text(run) for run in rich_text])
+
+    def _get_nested_indent(self, block_type: str, indent: str) -> str:
+        return indent + self.INDENT
+
+    def _render_block(self, block_data: dict, indent: str, number: int) -> tuple[str, bool]:
+        """Return the block's text and whether it is a list item"""
+
+        block_type = block_data.get('type', '')
+        custom_data = block_data.get(block_type)
+        if block_type in ('child_page', 'child_database'):
+            text = custom_data.get('title', '') if isinstance(custom_data, dict) else ''
+        else:
+            text = self.render_rich_text(_get_rich_text(custom_data))
+        return ''.join(indent + line for line in text.splitlines(keepends=True)), False
+
+    def write(self, tree: _TREE_TYPE, stream: TextIO) -> None:
+        nodes = tree.children if isinstance(tree, BlockTree) else list(tree)
+        # (node, indent, number of the item in a numbered list)
+        stack: list[tuple[BlockTreeNode, str, int]] = []
+        self._push_children(stack, nodes, indent='')
+        prev_was_list_item = False
+        while stack:
+            node, indent, number = stack.pop()
+            block_data = node.block.data
+            text, is_list_item = self._render_block(block_data, indent=indent, number=number)
+            if prev_was_list_item and not is_list_item:
+                stream.write('\n')
+            stream.write(text)
+            stream.write('\n' if is_list_item else self.BLOCK_SEP)
+            prev_was_list_item = is_list_item
+
+            block_type = block_data.get('type', '')
+            if node.children:
+                child_indent = indent
+                if block_type in _LIST_BLOCK_TYPES:
+                    child_indent = self._get_nested_indent(block_type, indent)
+                self._push_children(stack, node.children, indent=child_indent)
+
+    @staticmethod
+    def _push_children(
+            stack: list[tuple[BlockTreeNode, str, int]],
+            nodes: list[BlockTreeNode], indent: str,
+    ) -> None:
+        numbered: list[tuple[BlockTreeNode, str, int]] = []
+        number = 0
+        for node in nodes:
+            if node.block.data.get('type') == 'numbered_list_item':
+                number += 1
+            else:
+                number = 0
+            numbered.append((node, indent, number))
+        stack.extend(reversed(numbered))
+
+    def render(self, tree: _TREE_TYPE) -> str:
+        stream = io.StringIO()
+        self.write(tree, stream)
+        return stream.getvalue()
+
+
+class MarkdownRenderer(PlainTextRenderer):
+    """Renders block trees as Markdown"""
+
+    INDENT = '    '
+    BLOCK_SEP = '\n\n'
+
+    @staticmethod
+    def _render_run(run: dict) -> str:
+        text = _get_run_text(run)
+        if not text.strip():
+            return text
+
+        # Marks must be adjacent to non-whitespace characters
+        stripped = text.strip()
+        leading = text[:len(text) - len(text.lstrip())]
+        trailing = text[len(text.rstrip()):]
+
+        annotations = run.get('annotations') or {}
+        if annotations.get('code'):
+            stripped = f'`{stripped}`'
+        if annotations.get('bold'):
+            stripped = f'**{stripped}**'
+        if annotations.get('italic'):
+            stripped = f'*{stripped}*'
+        if annotations.get('strikethrough'):
+            stripped = f'~~{stripped}~~'
+        link = _get_run_link(run)
+        if link:
+            stripped = f'[{stripped}]({link})'
+        return f'{leading}{stripped}{trailing}'
+
+    def render_rich_text(self, rich_text: list[dict]) -> str:
+        render_run = self._render_run
+        return ''.join([render_run(run) for run in rich_text])
+
+    def _render_block(self, block_data: dict, indent: str, number: int) -> tuple[str, bool]:
+        block_type = block_data.get('type', '')
+        custom_data = block_data.get(block_type)
+        if not isinstance(custom_data, dict):
+            custom_data = {}
+
+        if block_type == 'code':
+            code = ''.join([_get_run_text(run) for run in _get_rich_text(custom_data)])
+            lines = [f'```{custom_data.get("language", "")}', *code.splitlines(), '```']
+            return '\n'.join(indent + line for line in lines), False
+
+        if block_type in ('child_page', 'child_database'):
+            return f'{indent}**{custom_data.get("title", "")}**', False
+
+        text = self.render_rich_text(_get_rich_text(custom_data))
+        # Continuation lines of multi-line blocks are indented as well
+        text = text.replace('\n', '\n' + indent + (self.INDENT if block_type in _LIST_BLOCK_TYPES else ''))
+
+        if block_type in _HEADING_PREFIXES:
+            return f'{indent}{_HEADING_PREFIXES[block_type]}{text}', False
+        if block_type == 'bulleted_list_item' or block_type == 'toggle':
+            return f'{indent}- {text}', True
+        if block_type == 'numbered_list_item':
+            return f'{indent}{number}. {text}', True
+        if block_type == 'to_do':
+            mark = 'x' if custom_data.get('checked') else ' '
+            return f'{indent}- [{mark}] {text}', True
+        if block_type == 'callout':
+            icon = custom_data.get('icon') or {}
+            emoji = icon.get('emoji') if isinstance(icon, dict) else None
+            prefix = f'{emoji} ' if emoji else ''
+            return f'{indent}> {prefix}{text}', False
+        return f'{indent}{text}', False
+
+
+def write_markdown(tree: _TREE_TYPE, stream: TextIO) -> None:
+    MarkdownRenderer().write(tree, stream)
+
+
+def render_markdown(tree: _TREE_TYPE) -> str:
+    return MarkdownRenderer().render(tree)
+
+
+def write_plain_text(tree: _TREE_TYPE, stream: TextIO) -> None:
+    PlainTextRenderer().write(tree, stream)
+
+
+def render_plain_text(tree: _TREE_TYPE) -> str:
+    return PlainTextRenderer().render(tree)
+
+
+# Maximum length of the content of a single rich text object
+MAX_TEXT_LENGTH = 2000
+
+_HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)(?:\s+#+)?\s*$')
+_TO_DO_RE = re.compile(r'^\s*[-*+]\s+\[([ xX])\]\s+(.*)$')
+_BULLET_RE = re.compile(r'^\s*[-*+]\s+(.*)$')
+_NUMBERED_RE = re.compile(r'^\s*\d+[.)]\s+(.*)$')
+_QUOTE_RE = re.compile(r'^\s*>\s?(.*)$')
+_FENCE_RE = re.compile(r'^\s*(```|~~~)\s*([\w+#-]*)')
+_DIVIDER_RE = re.compile(r'^\s*([-*_])(\s*\1){2,}\s*$')
+_INLINE_RE = re.compile(
+    r'`(?P<code>[^`]+)`'
+    r'|\[(?P<link_text>[^\]]+)\]\((?P<link_url>[^)\s]+)\)'
+    r'|(?P<strike>~~)'
+    r'|(?P<bold>\*\*|(?<!\w)__|__(?!\w))'
+    r'|(?P<italic>\*|(?<!\w)_|_(?!\w))'
+)
+
+
+def _make_runs(content: str, annotations: Optional[dict] = None, link: Optional[str] = None) -> Iterator[dict]:
+    """Make rich text runs splitting the content into pieces of ``MAX_TEXT_LENGTH``"""
+
+    for start in range(0, len(content), MAX_TEXT_LENGTH):
+        text_data: dict[str, Any] = {'content': content[start:start + MAX_TEXT_LENGTH]}
+        if link:
+            text_data['link'] = {'url': link}
+        run: dict[str, Any] = {'type': 'text', 'text': text_data}
+        if annotations:
+            run['annotations'] = dict(annotations)
+        yield run
+
+
+def parse_rich_text(text: str) -> list[dict]:
+    """
+    Convert inline Markdown into a list of rich text runs.
+
+    Supports ``**bold**``, ``*italic*``, ``~~strikethrough~~``, ```code```
+    and ``[links](url)``. Unclosed marks are applied up to the end of the text.
+    """
+
+    runs: list[dict] = []
+    active: dict[str, bool] = {}
+    pos = 0
+    for match in _INLINE_RE.finditer(text):
+        if match.start() > pos:
+            runs.extend(_make_runs(text[pos:match.start()], active))
+        pos = match.end()
+        if match.group('code') is not None:
+            runs.extend(_make_runs(match.group('code'), {**active, 'code': True}))
+        elif match.group('link_text') is not None:
+            runs.extend(_make_runs(match.group('link_text'), active, link=match.group('link_url')))
+        else:
+            mark = next(name for name in ('strike', 'bold', 'italic') if match.group(name))
+            anno_name = 'strikethrough' if mark == 'strike' else mark
+            if active.pop(anno_name, False) is False:
+                active[anno_name] = True
+    if pos < len(text):
+        runs.extend(_make_runs(text[pos:], active))
+    return runs
+
+
+def _make_block(block_type: str, text: str = '', **extra: Any) -> dict:
+    # The same structure as ``NotionBlock.make(...).data``
+    return {
+        'object': 'block',
+        'type': block_type,
+        block_type: {'text': parse_rich_text(text), **extra},
+    }
+
+
+def _make_code_block(code_lines: list[str], language: str) -> dict:
+    return {
+        'object': 'block',
+        'type': 'code',
+        'code': {
+            'text': list(_make_runs('\n'.join(code_lines))),
+            'language': language.lower() or 'plain text',
+        },
+    }
+
+
+def iter_blocks_from_markdown(lines: Iterable[str]) -> Iterator[dict]:
+    """
+    Convert Markdown into block data in a single pass over its lines.
+
+    Each block is yielded as soon as it is complete,
+    so the result can be passed directly to ``children.iter_children_batches``
+    without keeping the whole document in memory.
+    Supported are paragraphs, headings (levels below 3 become ``heading_3``),
+    bulleted, numbered and to-do list items, quotes, dividers
+    and fenced code blocks. Nested lists are flattened.
+    """
+
+    paragraph: list[str] = []
+    code_lines: Optional[list[str]] = None
+    code_fence = ''
+    code_language = ''
+
+    for line in lines:
+        line = line.rstrip('\r\n')
+
+        if code_lines is not None:
+            if line.strip() == code_fence:
+                yield _make_code_block(code_lines, code_language)
+                code_lines = None
+            else:
+                code_lines.append(line)
+            continue
+
+        if not line.strip():
+            if paragraph:
+                yield _make_block('paragraph', ' '.join(paragraph))
+                paragraph = []
+            continue
+
+        block: Optional[dict] = None
+        if match := _FENCE_RE.match(line):
+            code_fence, code_language = match.group(1), match.group(2)
+            code_lines = []
+        elif match := _HEADING_RE.match(line):
+            level = min(len(match.group(1)), 3)
+            block = _make_block(f'heading_{level}', match.group(2))
+        elif _DIVIDER_RE.match(line):
+            block = {'object': 'block', 'type': 'divider', 'divider': {}}
+        elif match := _TO_DO_RE.match(line):
+            block = _make_block('to_do', match.group(2), checked=match.group(1) != ' ')
+        elif match := _BULLET_RE.match(line):
+            block = _make_block('bulleted_list_item', match.group(1))
+        elif match := _NUMBERED_RE.match(line):
+            block = _make_block('numbered_list_item', match.group(1))
+        elif match := _QUOTE_RE.match(line):
+            block = _make_block('quote', match.group(1))
+        else:
+            paragraph.append(line.strip())
+            continue
+
+        # Any other block ends the current paragraph
+        if paragraph:
+            yield _make_block('paragraph', ' '.join(paragraph))
+            paragraph = []
+        if block is not None:
+            yield block
+
+    if code_lines is not None:
+        # Unclosed fence
+        yield _make_code_block(code_lines, code_language)
+    if paragraph:
+        yield _make_block('paragraph', ' '.join(paragraph))
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import sys
+import tracemalloc
+from typing import Any, Callable, Iterable, TypeVar, Union
+
+import attr
+
+from basic_notion.base import NotionItemBase
+from basic_notion.page import NotionPage, NotionPageList
+
+
+_RESULT_TV = TypeVar('_RESULT_TV')
+
+# Kinds of memory in the breakdown of a page
+KIND_PAGE = 'page'  # the page's own attributes (ids, times, parent, etc.)
+KIND_PROPERTIES = 'properties'  # property value dicts (without rich text)
+KIND_RICH_TEXT = 'rich_text_runs'
+KIND_ANNOTATIONS = 'annotations'
+KIND_WRAPPERS = 'wrappers'  # model objects wrapping the data
+KINDS = (KIND_PAGE, KIND_PROPERTIES, KIND_RICH_TEXT, KIND_ANNOTATIONS, KIND_WRAPPERS)
+
+
+def _is_rich_text_run(value: dict) -> bool:
+    return 'plain_text' in value or (value.get('type') == 'text' and 'text' in value)
+
+
+def _account(obj: Any, kind: str, seen: set[int], totals: dict[str, int]) -> None:
+    """
+    Add the deep size of ``obj`` to ``totals`` under ``kind``.
+    Objects in ``seen`` are skipped, so shared objects are only counted once.
+    """
+
+    stack = [(obj, kind)]
+    while stack:
+        value, value_kind = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        if isinstance(value, dict):
+            if value_kind not in (KIND_ANNOTATIONS, KIND_RICH_TEXT) and _is_rich_text_run(value):
+                value_kind = KIND_RICH_TEXT
+            for key, item in value.items():
+                stack.append((key, value_kind))
+                stack.append((item, KIND_ANNOTATIONS if key == 'annotations' else value_kind))
+        elif isinstance(value, (list, tuple)):
+            stack.extend((item, value_kind) for item in value)
+        totals[value_kind] = totals.get(value_kind, 0) + sys.getsizeof(value)
+
+
+def deep_sizeof(obj: Any) -> int:
+    """Size of a JSON-like object and everything it references (each object is counted once)"""
+
+    totals: dict[str, int] = {}
+    _account(obj, KIND_PAGE, set(), totals)
+    return sum(totals.values())
+
+
+@attr.s(slots=True)
+class MemoryReport:
+    """Retained memory of decoded pages broken down by kind and property"""
+
+    page_count: int = attr.ib(kw_only=True, default=0)
+    # kind -> bytes (the kinds don't overlap)
+    by_kind: dict[str, int] = attr.ib(kw_only=True, factory=lambda: dict.fromkeys(KINDS, 0))
+    # property name -> bytes (including the property's rich text and annotations)
+    by_property: dict[str, int] = attr.ib(kw_only=True, factory=dict)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self.by_kind.values())
+
+    @property
+    def bytes_per_page(self) -> float:
+        return self.total_bytes / self.page_count if self.page_count else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'page_count': self.page_count,
+            'total_bytes': self.total_bytes,
+            'bytes_per_page': self.bytes_per_page,
+            'by_kind': dict(self.by_kind),
+            'by_property': dict(self.by_property),
+        }
+
+    def format_table(self) -> str:
+        count = self.page_count or 1
+        lines = [f'{self.page_count} pages, {self.bytes_per_page:.0f} bytes per page', '']
+        lines.append(f'{"kind":<30} {"bytes/page":>12} {"share":>8}')
+        for kind, size in self.by_kind.items():
+            lines.append(f'{kind:<30} {size / count:>12.0f} {size / (self.total_bytes or 1):>8.1%}')
+        lines.append('')
+        lines.append(f'{"property":<30} {"bytes/page":>12} {"share":>8}')
+        for name, size in sorted(self.by_property.items(), key=lambda item: item[1], reverse=True):
+            lines.append(f'{name:<30} {size / count:>12.0f} {size / (self.total_bytes or 1):>8.1%}')
+        return '\n'.join(lines)
+
+
+def profile_pages(pages: Union[NotionPageList, Iterable[Union[NotionPage, dict]]]) -> MemoryReport:
+    """
+    Measure the retained memory of decoded pages
+    (``NotionPage`` objects or raw page data) by deep size accounting.
+
+    Objects shared between pages (e.g. dict keys from the same JSON document)
+    are counted once, for the first page that references them.
+    """
+
+    if isinstance(pages, NotionPageList):
+        pages = pages.items()
+
+    report = MemoryReport()
+    seen: set[int] = set()
+    for page in pages:
+        report.page_count += 1
+        if isinstance(page, NotionItemBase):
+            if id(page) not in seen:
+                seen.add(id(page))
+                report.by_kind[KIND_WRAPPERS] += sys.getsizeof(page)
+            data = page.data
+        else:
+            data = page
+
+        # Keys and the containers of the page are counted first, so that the properties get only their own data
+        seen.add(id(data))
+        report.by_kind[KIND_PAGE] += sys.getsizeof(data)
+        for key, value in data.items():
+            if key == 'properties':
+                continue
+            _account(key, KIND_PAGE, seen, report.by_kind)
+            _account(value, KIND_PAGE, seen, report.by_kind)
+
+        properties = data.get('properties') or {}
+        if id(properties) not in seen:
+            seen.add(id(properties))
+            report.by_kind[KIND_PAGE] += sys.getsizeof(properties)
+        for name, prop_data in properties.items():
+            _account(name, KIND_PAGE, seen, report.by_kind)
+            prop_totals: dict[str, int] = {}
+            _account(prop_data, KIND_PROPERTIES, seen, prop_totals)
+            for kind, size in prop_totals.items():
+                report.by_kind[kind] += size
+            report.by_property[name] = report.by_property.get(name, 0) + sum(prop_totals.values())
+
+    return report
+
+
+def measure_retained(make: Callable[[], _RESULT_TV]) -> tuple[_RESULT_TV, int]:
+    """
+    Call ``make`` and return its result along with the number of bytes
+    allocated by it that are still retained (measured with ``tracemalloc``)
+    """
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = make()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    return result, retained
@@ -1,34 +1,27 @@
 from __future__ import annotations
 
 import datetime
-import inspect
-from typing import Any, ClassVar, Generic, Optional, Type, TypeVar
+from typing import TYPE_CHECKING, Any, ClassVar, Generic, Iterable, Iterator, Optional, Type, TypeVar, Union
 
 import attr
 
 from basic_notion.base import NotionItemBase, NotionItemBaseMetaclass
 from basic_notion.attr import ItemAttrDescriptor
 from basic_notion.parent import Parent, ParentDatabase, ParentPage
-from basic_notion.property_schema import PropertySchema
-from basic_notion.schema import Schema
 from basic_notion.utils import deserialize_date
 
+if TYPE_CHECKING:
+    # Imported lazily to speed up the import of this module
+    from basic_notion.projection import Projection
+    from basic_notion.schema import Schema
 
-def _make_schema_for_page_cls(page_cls: type) -> Schema:
-    return Schema({
-        name: prop
-        for name, prop in inspect.getmembers(page_cls)
-        if isinstance(prop, PropertySchema)
-    })
 
+_PAGE_TV = TypeVar('_PAGE_TV', bound='NotionPage')
+_PAGE_LIST_TV = TypeVar('_PAGE_LIST_TV', bound='NotionPageList')
 
-class NotionPageMetaclass(NotionItemBaseMetaclass):
-    """Metaclass for NotionPage that adds `schema` to its attributes"""
 
-    def __new__(cls, name: str, bases: tuple[type, ...], dct: dict):
-        new_cls = super().__new__(cls, name, bases, dct)
-        new_cls.__notion_schema__ = _make_schema_for_page_cls(new_cls)  # type: ignore
-        return new_cls
+class NotionPageMetaclass(NotionItemBaseMetaclass):
+    """Metaclass for NotionPage"""
 
 
 @attr.s(slots=True)
@@ -37,8 +30,6 @@ class NotionPage(NotionItemBase, metaclass=NotionPageMetaclass):  # noqa
     Represents a page object returned by the Notion API
     """
 
-    __notion_schema__: Schema = None  # type: ignore  # defined in metaclass
-
     OBJECT_TYPE_KEY_STR = 'object'
     OBJECT_TYPE_STR = 'page'
 
@@ -58,10 +49,24 @@ class NotionPage(NotionItemBase, metaclass=NotionPageMetaclass):  # noqa
     properties_data: ItemAttrDescriptor[dict[str, dict]] = ItemAttrDescriptor(key=('properties',))
     parent_data: ItemAttrDescriptor[dict[str, dict]] = ItemAttrDescriptor(key=('parent',))
 
+    @classmethod
+    def from_data(
+            cls: Type[_PAGE_TV], data: dict,
+            only: Optional[Union[Projection, Iterable[Any]]] = None,
+    ) -> _PAGE_TV:
+        """
+        Make page from raw data keeping only the given fields (see ``Projection``).
+        The data is pruned in place.
+        """
+        if only is not None:
+            from basic_notion.projection import make_projection
+            make_projection(cls, only).project_page_data(data)
+        return cls(data=data)
+
     @classmethod
     @property
     def schema(cls) -> Schema:
-        return cls.__notion_schema__
+        return cls.__notion_layout__.schema
 
     @property
     def parent(self) -> Parent:
@@ -94,7 +99,7 @@ class NotionPage(NotionItemBase, metaclass=NotionPageMetaclass):  # noqa
     @classmethod
     def _make_inst_prop_dict(cls, kwargs: dict[str, Any]) -> dict:
         data = {}
-        for name, prop_sch in cls.schema.items():  # type: ignore
+        for name, prop_sch in cls.__notion_layout__.schema.items():
             if name not in kwargs:
                 continue
             data[prop_sch.property_name] = prop_sch.make_prop_from_value(value=kwargs[name]).data
@@ -129,6 +134,20 @@ class NotionPageList(NotionItemBase, Generic[_RESULT_ITEM_TV]):
     OBJECT_TYPE_KEY_STR = 'object'
     OBJECT_TYPE_STR = 'list'
 
+    @classmethod
+    def from_data(
+            cls: Type[_PAGE_LIST_TV], data: dict,
+            only: Optional[Union[Projection, Iterable[Any]]] = None,
+    ) -> _PAGE_LIST_TV:
+        """
+        Make page list from raw data keeping only the given fields of its items (see ``Projection``).
+        The data is pruned in place.
+        """
+        if only is not None:
+            from basic_notion.projection import make_projection
+            make_projection(cls._get_item_cls(), only).project_list_data(data)
+        return cls(data=data)
+
     @classmethod
     def _get_item_cls(cls) -> Type[_RESULT_ITEM_TV]:
         assert cls.ITEM_CLS is not None
@@ -147,3 +166,14 @@ class NotionPageList(NotionItemBase, Generic[_RESULT_ITEM_TV]):
             self._make_result_item(data=item_data)
             for item_data in self.data['results']
         ]
+
+    def cursor(self) -> Iterator[_RESULT_ITEM_TV]:
+        """
+        Iterate over the results re-using a single item object.
+
+        Unlike ``items()``, this does not create a new item (or property) object
+        for each result, so the yielded object must not be kept
+        beyond the current iteration step.
+        """
+        from basic_notion.view import iter_views
+        return iter_views(self._get_item_cls(), self.data['results'])
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+
+# Wraps the current implementation of a method into a new one
+MAKE_REPLACEMENT_TYPE = Callable[[Callable], Callable]
+
+# Layer order of the tools that patch the model layer
+ORDER_INSTRUMENTATION = 0
+ORDER_ACCESS_RECORDER = 1
+
+
+class _Patch:
+    __slots__ = ('original', 'layers')
+
+    def __init__(self, original: Callable) -> None:
+        self.original = original
+        # (order, owner, make_replacement) in the order of addition
+        self.layers: list[tuple[int, object, MAKE_REPLACEMENT_TYPE]] = []
+
+
+# (class, attribute name) -> patch
+_patches: dict[tuple[type, str], _Patch] = {}
+_lock = threading.Lock()
+
+
+def _apply(cls: type, name: str, patch: _Patch) -> None:
+    func = patch.original
+    # Stable sort: layers of the same order wrap each other in the order of addition
+    for _, _, make_replacement in sorted(patch.layers, key=lambda layer: layer[0]):
+        func = make_replacement(func)
+    setattr(cls, name, func)
+
+
+def add_patch(owner: object, cls: type, name: str, make_replacement: MAKE_REPLACEMENT_TYPE, order: int) -> None:
+    """
+    Replace method ``name`` of ``cls`` with ``make_replacement(current implementation)``.
+
+    Patches of all owners are kept in a single stack per method, ordered by ``order``
+    (lower ones are closer to the original), and the method is rebuilt from the original
+    whenever a layer is added or removed, so the owners can be removed in any order.
+    """
+
+    with _lock:
+        patch = _patches.get((cls, name))
+        if patch is None:
+            patch = _patches[(cls, name)] = _Patch(cls.__dict__[name])
+        patch.layers.append((order, owner, make_replacement))
+        _apply(cls, name, patch)
+
+
+def remove_patches(owner: object) -> None:
+    """Remove all of the owner's patches (see ``add_patch``)"""
+
+    with _lock:
+        for (cls, name), patch in list(_patches.items()):
+            remaining = [layer for layer in patch.layers if layer[1] is not owner]
+            if len(remaining) == len(patch.layers):
+                continue
+            patch.layers = remaining
+            if remaining:
+                _apply(cls, name, patch)
+            else:
+                setattr(cls, name, patch.original)
+                del _patches[(cls, name)]
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Type, Union
+
+import attr
+
+from basic_notion.base import NotionItemBase
+from basic_notion.property import TextProperty
+from basic_notion.property_schema import PropertySchema
+
+
+# Top-level keys of page data that are kept regardless of the projection
+ESSENTIAL_PAGE_KEYS = frozenset((
+    'object', 'id', 'parent', 'archived', 'url',
+    'created_time', 'last_edited_time',
+))
+
+
+_FIELD_REF = Union[PropertySchema, str]
+_KEYS = tuple[tuple[str, ...], ...]
+
+
+def _drop_key(dct: dict, key: tuple[str, ...]) -> None:
+    *parts, last_part = key
+    data: Any = dct
+    for part in parts:
+        data = data.get(part)
+        if not isinstance(data, dict):
+            return
+    data.pop(last_part, None)
+
+
+# Presentation data of rich text items that is dropped along with the derived attributes
+TEXT_PRESENTATION_KEYS: _KEYS = (('annotations',), ('href',))
+
+
+def _get_derived_keys(prop_cls: Type[NotionItemBase]) -> _KEYS:
+    keys: _KEYS = tuple(prop_cls.derived_keys.values())  # type: ignore
+    if issubclass(prop_cls, TextProperty):
+        keys += TEXT_PRESENTATION_KEYS
+    return keys
+
+
+def _get_property_schema(item_cls: Any, field: _FIELD_REF) -> PropertySchema:
+    if isinstance(field, PropertySchema):
+        return field
+    if isinstance(field, str):
+        for prop_sch in item_cls.schema.properties.values():
+            if prop_sch.property_name == field:
+                return prop_sch
+        raise KeyError(f'{item_cls.__name__} has no property {field!r}')
+    raise TypeError(f'Invalid field for projection: {field!r}')
+
+
+@attr.s(frozen=True)
+class Projection:
+    """
+    Describes which parts of raw page data should be kept in memory.
+
+    Only the listed properties and the essential page metadata
+    (see ``ESSENTIAL_PAGE_KEYS``) are kept.
+    If ``drop_derived`` is set, derived (read-only, computed by Notion)
+    attributes of the kept properties, such as the ``plain_text``
+    of rich text items or the ``color`` of select options, are dropped as well,
+    and so are the ``annotations`` and ``href`` of rich text items.
+    """
+
+    _property_names: frozenset[str] = attr.ib(kw_only=True)
+    # property_name -> (derived keys of the property, derived keys of its list items)
+    _derived_keys: dict[str, tuple[_KEYS, _KEYS]] = attr.ib(kw_only=True, factory=dict)
+
+    @property
+    def property_names(self) -> frozenset[str]:
+        return self._property_names
+
+    @classmethod
+    def from_fields(
+            cls, item_cls: Any, fields: Iterable[_FIELD_REF],
+            drop_derived: bool = False,
+    ) -> Projection:
+        """
+        Make projection from fields of the ``item_cls`` model.
+        Fields can be given as class attributes (``Model.field``)
+        or property names (like in ``Query.only``).
+        """
+
+        prop_schemas = [_get_property_schema(item_cls, field) for field in fields]
+
+        derived_keys: dict[str, tuple[_KEYS, _KEYS]] = {}
+        if drop_derived:
+            for prop_sch in prop_schemas:
+                prop_cls = prop_sch.PROP_CLS
+                item_prop_cls = getattr(prop_cls, 'ITEM_CLS', None)
+                derived_keys[prop_sch.property_name] = (
+                    _get_derived_keys(prop_cls),
+                    _get_derived_keys(item_prop_cls) if item_prop_cls is not None else (),
+                )
+
+        return cls(
+            property_names=frozenset(prop_sch.property_name for prop_sch in prop_schemas),
+            derived_keys=derived_keys,
+        )
+
+    def _prune_property_data(self, property_name: str, prop_data: dict) -> None:
+        prop_derived_keys, item_derived_keys = self._derived_keys[property_name]
+        for key in prop_derived_keys:
+            _drop_key(prop_data, key)
+        if item_derived_keys:
+            items = prop_data.get(prop_data.get('type', ''))
+            if isinstance(items, list):
+                for item_data in items:
+                    for key in item_derived_keys:
+                        _drop_key(item_data, key)
+
+    def project_page_data(self, data: dict) -> dict:
+        """Prune raw page data (in place) and return it"""
+
+        for key in [key for key in data if key not in ESSENTIAL_PAGE_KEYS and key != 'properties']:
+            del data[key]
+
+        properties_data = data.get('properties', {})
+        property_names = self._property_names
+        derived_keys = self._derived_keys
+        for property_name in list(properties_data):
+            if property_name not in property_names:
+                del properties_data[property_name]
+            elif property_name in derived_keys:
+                self._prune_property_data(property_name, properties_data[property_name])
+
+        return data
+
+    def project_list_data(self, data: dict) -> dict:
+        """Prune each of the results in raw page list data (in place) and return it"""
+
+        for item_data in data['results']:
+            self.project_page_data(item_data)
+        return data
+
+
+def make_projection(item_cls: Any, only: Union[Projection, Iterable[_FIELD_REF]]) -> Projection:
+    if isinstance(only, Projection):
+        return only
+    return Projection.from_fields(item_cls, only)
@@ -49,15 +49,15 @@ class PagePropertyBase(NotionItemBase):
             return cls.make(property_name=property_name, **value)
 
         assert cls.MAKE_FROM_SINGLE_ATTR is not None
-        key = cls.attr_keys[cls.MAKE_FROM_SINGLE_ATTR]  # type: ignore
+        layout = cls.__notion_layout__
+        key = layout.attr_keys[cls.MAKE_FROM_SINGLE_ATTR]
         data: dict[str, Any] = {}
         if cls.OBJECT_TYPE_STR and cls.OBJECT_TYPE_KEY_STR:
             data[cls.OBJECT_TYPE_KEY_STR] = cls.OBJECT_TYPE_STR
 
-        # Get attr descriptor and its `set_converter` callable
-        # (if it exists) to convert the value into its serializable form
-        prop = getattr(cls, cls.MAKE_FROM_SINGLE_ATTR)
-        set_converter = prop.set_converter
+        # Use the attr's `set_converter` callable (if it exists)
+        # to convert the value into its serializable form
+        set_converter = layout.set_converters.get(cls.MAKE_FROM_SINGLE_ATTR)
         if set_converter is not None:
             value = set_converter(value)
 
@@ -1,12 +1,53 @@
 from __future__ import annotations
 
-from typing import Any, Optional, Sequence, Type, TypeVar
+import time
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional, Sequence, Type, TypeVar, Union
 
 import attr
 
 from basic_notion.filter import PropertyFilter
 from basic_notion.sort import Sort
 
+if TYPE_CHECKING:
+    from basic_notion.page import NotionPage, NotionPageList
+    from basic_notion.property_schema import PropertySchema
+    from basic_notion.schema import Schema
+
+
+MAX_PAGE_SIZE = 100
+
+# Should accept the serialized query as keyword arguments and return the raw page list data,
+# for instance, ``notion_client.Client().databases.query``
+QUERY_DATABASE_TYPE = Callable[..., dict]
+
+_PAGE_TV = TypeVar('_PAGE_TV', bound='NotionPage')
+
+
+def _get_property_id(field: Union[PropertySchema, str], schema: Optional[Schema]) -> str:
+    """
+    Resolve a field (``PropertySchema`` or property name) to the property's id.
+    Falls back to the property's name if the id is not known.
+    """
+
+    from basic_notion.property_schema import PropertySchema
+
+    property_name: str
+    if isinstance(field, PropertySchema):
+        if field.data.get('id'):
+            return field.id
+        property_name = field.property_name
+    elif isinstance(field, str):
+        property_name = field
+    else:
+        raise TypeError(f'Invalid field: {field!r}')
+
+    if schema is not None and property_name in schema:
+        prop_sch = schema[property_name]
+        if prop_sch.data.get('id'):
+            return prop_sch.id
+
+    return property_name
+
 
 class QuerySerializer:
     @classmethod
@@ -38,6 +79,12 @@ class QuerySerializer:
                 if sorts_item.timestamp is not None:
                     sorts_item_data['timestamp'] = sorts_item.timestamp
                 data['sorts'].append(sorts_item_data)
+        if query.filter_properties_obj is not None:
+            data['filter_properties'] = list(query.filter_properties_obj)
+        if query.page_size_obj is not None:
+            data['page_size'] = query.page_size_obj
+        if query.start_cursor_obj is not None:
+            data['start_cursor'] = query.start_cursor_obj
 
         return data
 
@@ -50,6 +97,9 @@ class Query:
     _database_id: str = attr.ib(kw_only=True)
     _filter: Optional[PropertyFilter] = attr.ib(kw_only=True, default=None)
     _sorts: Optional[Sequence] = attr.ib(kw_only=True, default=None)
+    _filter_properties: Optional[Sequence[str]] = attr.ib(kw_only=True, default=None)
+    _page_size: Optional[int] = attr.ib(kw_only=True, default=None)
+    _start_cursor: Optional[str] = attr.ib(kw_only=True, default=None)
     _serializer: QuerySerializer = attr.ib(kw_only=True, factory=QuerySerializer)
 
     def clone(self, **kwargs: Any) -> Query:
@@ -67,6 +117,18 @@ class Query:
     def sorts_obj(self) -> Optional[Sequence[Sort]]:
         return self._sorts
 
+    @property
+    def filter_properties_obj(self) -> Optional[Sequence[str]]:
+        return self._filter_properties
+
+    @property
+    def page_size_obj(self) -> Optional[int]:
+        return self._page_size
+
+    @property
+    def start_cursor_obj(self) -> Optional[str]:
+        return self._start_cursor
+
     @classmethod
     def database(cls: Type[_QUERY_TV], database_id: str) -> _QUERY_TV:
         return cls(database_id=database_id)
@@ -77,5 +139,64 @@ class Query:
     def sorts(self, *sorts: Sort) -> Query:
         return self.clone(sorts=sorts)
 
+    def only(self, *fields: Union[PropertySchema, str], schema: Optional[Schema] = None) -> Query:
+        """
+        Request only the given properties of the pages.
+
+        Fields are resolved to property ids.
+        Model fields usually don't know the ids of their properties,
+        so pass the database's schema (``NotionDatabase.schema``) to look them up.
+        Properties with unknown ids are requested by name.
+        """
+        return self.clone(filter_properties=tuple(_get_property_id(field, schema) for field in fields))
+
+    def page_size(self, page_size: int) -> Query:
+        if not 0 < page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f'Page size must be between 1 and {MAX_PAGE_SIZE}, got {page_size}')
+        return self.clone(page_size=page_size)
+
+    def start_cursor(self, start_cursor: Optional[str]) -> Query:
+        return self.clone(start_cursor=start_cursor)
+
     def serialize(self) -> dict:
         return self._serializer.serialize(self)
+
+
+def iter_query_results(
+        query: Query, query_database: QUERY_DATABASE_TYPE,
+        list_cls: Type[NotionPageList[_PAGE_TV]],
+) -> Iterator[_PAGE_TV]:
+    """
+    Iterate over all of the pages matching the query, requesting the next ones via ``next_cursor``.
+
+    Serialization of the query, the requests, decoding of the responses
+    and processing of every page (the time the caller spends on it)
+    are reported to the telemetry (see ``basic_notion.telemetry``).
+    """
+
+    from basic_notion.telemetry import SPAN_DECODE, SPAN_PAGE_PROCESSING, SPAN_QUERY_SERIALIZE, get_telemetry
+
+    telemetry = get_telemetry()
+    database_id = query.database_id
+    start_cursor = query.start_cursor_obj
+    while True:
+        with telemetry.span(SPAN_QUERY_SERIALIZE, database_id=database_id):
+            data = query.start_cursor(start_cursor).serialize()
+        with telemetry.request('databases.query', database_id=database_id):
+            response = query_database(**data)
+        with telemetry.span(SPAN_DECODE, database_id=database_id):
+            pages = list_cls(data=response).items()
+
+        for page in pages:
+            if telemetry.enabled:
+                started = time.perf_counter()
+                yield page
+                telemetry.record_duration(
+                    SPAN_PAGE_PROCESSING, time.perf_counter() - started, database_id=database_id,
+                )
+            else:
+                yield page
+
+        if not response.get('has_more'):
+            return
+        start_cursor = response['next_cursor']
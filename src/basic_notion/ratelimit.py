@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+
+import attr
+
+
+# Average number of requests per second allowed by the Notion API
+NOTION_REQUESTS_PER_SECOND = 3.0
+
+
+@attr.s(slots=True)
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens are added at ``rate`` per second up to ``capacity``
+    (which is the size of the allowed bursts).
+    Waiting callers reserve their tokens in advance,
+    so they are served in the order of their calls.
+    """
+
+    _rate: float = attr.ib(kw_only=True, default=NOTION_REQUESTS_PER_SECOND)
+    _capacity: Optional[float] = attr.ib(kw_only=True, default=None)
+    _clock: Callable[[], float] = attr.ib(kw_only=True, default=time.monotonic)
+    _tokens: float = attr.ib(init=False)
+    _updated: float = attr.ib(init=False)
+    # Nothing is allowed until this time (see ``pause``)
+    _paused_until: float = attr.ib(init=False, default=0.0)
+    _lock: threading.Lock = attr.ib(init=False, factory=threading.Lock)
+
+    def __attrs_post_init__(self) -> None:
+        if self._rate <= 0:
+            raise ValueError('rate must be positive')
+        if self._capacity is None:
+            self._capacity = max(self._rate, 1.0)
+        self._tokens = self._capacity
+        self._updated = self._clock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def _reserve(self, tokens: float) -> float:
+        """Take the tokens and return the time to wait before they can be used"""
+
+        with self._lock:
+            now = self._clock()
+            assert self._capacity is not None
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= tokens
+            delay = -self._tokens / self._rate if self._tokens < 0 else 0.0
+            return max(delay, self._paused_until - now)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take the tokens only if they are available right away"""
+
+        with self._lock:
+            now = self._clock()
+            assert self._capacity is not None
+            tokens_now = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            if tokens_now < tokens or now < self._paused_until:
+                return False
+            self._tokens = tokens_now - tokens
+            self._updated = now
+            return True
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Wait until the tokens are available. Return the time spent waiting"""
+
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def pause(self, seconds: float) -> None:
+        """Don't give out any tokens for the given time (e.g. after a ``Retry-After`` response)"""
+
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import datetime
+import hashlib
+import random
+import uuid
+from typing import Any, Iterator, Optional, Sequence, Type, Union
+
+import attr
+
+from basic_notion.database import NotionDatabase
+from basic_notion.page import NotionPage
+from basic_notion.property_schema import PropertySchema
+from basic_notion.schema import Schema
+
+
+_SCHEMA_SOURCE_TYPE = Union[Type[NotionPage], NotionDatabase, Schema]
+
+_WORDS = (
+    'notion', 'page', 'database', 'block', 'property', 'model', 'query', 'filter',
+    'reading', 'list', 'book', 'article', 'author', 'status', 'project', 'task',
+    'meeting', 'note', 'idea', 'draft', 'review', 'release', 'the', 'a', 'of', 'and',
+    'to', 'in', 'with', 'for', 'on', 'about', 'new', 'old', 'quick', 'long',
+)
+_COLORS = ('default', 'gray', 'brown', 'orange', 'yellow', 'green', 'blue', 'purple', 'pink', 'red')
+_BASE_TIME = datetime.datetime(2021, 11, 5, 12, 0, tzinfo=datetime.timezone.utc)
+
+DEFAULT_BLOCK_TYPES = (
+    'paragraph', 'paragraph', 'paragraph', 'heading_2', 'bulleted_list_item',
+    'numbered_list_item', 'to_do', 'toggle', 'code', 'callout',
+)
+# Blocks of these types get children in generated trees
+NESTING_BLOCK_TYPES = frozenset(('paragraph', 'bulleted_list_item', 'numbered_list_item', 'to_do', 'toggle'))
+
+
+def _get_schema(source: _SCHEMA_SOURCE_TYPE) -> Schema:
+    if isinstance(source, Schema):
+        return source
+    if isinstance(source, NotionDatabase):
+        return source.schema
+    return source.__notion_layout__.schema
+
+
+def _make_property_id(property_name: str, property_type: str) -> str:
+    if property_type == 'title':
+        return 'title'
+    return hashlib.md5(property_name.encode()).hexdigest()[:4]
+
+
+def _format_time(value: datetime.datetime) -> str:
+    return value.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+@attr.s(slots=True)
+class SyntheticDataGenerator:
+    """
+    Generates realistic raw API data (pages, page lists, blocks) for benchmarks and tests.
+
+    The output is deterministic for the given ``seed``.
+    Select options are taken from the database schema (if it has them)
+    or named ``Option 1`` ... ``Option N``; they are chosen
+    with a skewed distribution, so that some options are much more common than others.
+    """
+
+    _seed: int = attr.ib(kw_only=True, default=0)
+    _option_count: int = attr.ib(kw_only=True, default=8)
+    _max_text_runs: int = attr.ib(kw_only=True, default=4)
+    _random: random.Random = attr.ib(init=False)
+    _option_cache: dict[str, list[dict]] = attr.ib(init=False, factory=dict)
+
+    def __attrs_post_init__(self) -> None:
+        self._random = random.Random(self._seed)
+
+    def make_id(self) -> str:
+        return str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+
+    def make_time(self, max_days: int = 365) -> str:
+        delta = datetime.timedelta(seconds=self._random.randrange(max_days * 24 * 3600))
+        return _format_time(_BASE_TIME - delta)
+
+    def make_words(self, min_count: int = 1, max_count: int = 6) -> str:
+        count = self._random.randint(min_count, max_count)
+        return ' '.join(self._random.choice(_WORDS) for _ in range(count))
+
+    def make_rich_text(self, max_runs: Optional[int] = None) -> list[dict]:
+        """Rich text with 1 to ``max_runs`` runs, most of them without annotations"""
+
+        rnd = self._random
+        max_runs = max_runs or self._max_text_runs
+        # Skewed towards fewer runs
+        run_count = min(rnd.randint(1, max_runs), rnd.randint(1, max_runs))
+        runs = []
+        for idx in range(run_count):
+            content = self.make_words() + (' ' if idx < run_count - 1 else '')
+            annotated = rnd.random() < 0.3
+            link = 'https://example.com/' + rnd.choice(_WORDS) if rnd.random() < 0.05 else None
+            runs.append({
+                'type': 'text',
+                'text': {'content': content, 'link': {'url': link} if link else None},
+                'annotations': {
+                    'bold': annotated and rnd.random() < 0.5,
+                    'italic': annotated and rnd.random() < 0.3,
+                    'strikethrough': annotated and rnd.random() < 0.05,
+                    'underline': annotated and rnd.random() < 0.05,
+                    'code': annotated and rnd.random() < 0.2,
+                    'color': rnd.choice(_COLORS) if annotated and rnd.random() < 0.1 else 'default',
+                },
+                'plain_text': content,
+                'href': link,
+            })
+        return runs
+
+    def _get_options(self, prop_sch: PropertySchema) -> list[dict]:
+        name = prop_sch.property_name
+        if name not in self._option_cache:
+            schema_options = (prop_sch.data.get(prop_sch.OBJECT_TYPE_STR) or {}).get('options')
+            self._option_cache[name] = schema_options or [
+                {'id': self.make_id(), 'name': f'Option {idx + 1}', 'color': _COLORS[idx % len(_COLORS)]}
+                for idx in range(self._option_count)
+            ]
+        return self._option_cache[name]
+
+    def _choose_options(self, options: Sequence[dict], count: int) -> list[dict]:
+        # Zipf-like weights: the first options are the most popular ones
+        weights = [1 / (idx + 1) for idx in range(len(options))]
+        chosen: list[dict] = []
+        while len(chosen) < min(count, len(options)):
+            option = self._random.choices(options, weights=weights)[0]
+            if option not in chosen:
+                chosen.append(option)
+        return chosen
+
+    def make_date(self) -> dict:
+        rnd = self._random
+        start = _BASE_TIME + datetime.timedelta(days=rnd.randint(-365, 365))
+        if rnd.random() < 0.5:
+            start_str = start.date().isoformat()
+            end = start + datetime.timedelta(days=rnd.randint(1, 14)) if rnd.random() < 0.2 else None
+            end_str = end.date().isoformat() if end is not None else None
+        else:
+            start += datetime.timedelta(minutes=15 * rnd.randrange(96))
+            start_str = start.isoformat()
+            end = start + datetime.timedelta(hours=rnd.randint(1, 8)) if rnd.random() < 0.2 else None
+            end_str = end.isoformat() if end is not None else None
+        return {'start': start_str, 'end': end_str, 'time_zone': None}
+
+    def make_property_value(self, prop_sch: PropertySchema) -> Any:
+        rnd = self._random
+        prop_type = prop_sch.OBJECT_TYPE_STR
+        if prop_type == 'title':
+            return self.make_rich_text(max_runs=2)
+        if prop_type in ('rich_text', 'text'):
+            return self.make_rich_text() if rnd.random() < 0.9 else []
+        if prop_type == 'number':
+            return rnd.randint(0, 1000) if rnd.random() < 0.7 else round(rnd.uniform(0, 1000), 2)
+        if prop_type == 'checkbox':
+            return rnd.random() < 0.5
+        if prop_type == 'select':
+            return self._choose_options(self._get_options(prop_sch), 1)[0] if rnd.random() < 0.9 else None
+        if prop_type == 'multi_select':
+            return self._choose_options(self._get_options(prop_sch), min(rnd.randint(0, 3), rnd.randint(0, 3)))
+        if prop_type == 'date':
+            return self.make_date() if rnd.random() < 0.8 else None
+        if prop_type == 'email':
+            return f'{self._random.choice(_WORDS)}{rnd.randrange(1000)}@example.com'
+        if prop_type == 'url':
+            return f'https://example.com/{self._random.choice(_WORDS)}/{rnd.randrange(1000)}'
+        if prop_type == 'phone_number':
+            return f'+1{rnd.randrange(10 ** 9, 10 ** 10)}'
+        return None
+
+    def make_page(self, source: _SCHEMA_SOURCE_TYPE, database_id: Optional[str] = None) -> dict:
+        """Raw page data (as returned by the API) for the schema of a model or a database"""
+
+        created_time = self.make_time()
+        properties = {}
+        for _, prop_sch in _get_schema(source).items():
+            prop_type = prop_sch.OBJECT_TYPE_STR
+            prop_id = prop_sch.data.get('id') or _make_property_id(prop_sch.property_name, prop_type)
+            properties[prop_sch.property_name] = {
+                'id': prop_id,
+                'type': prop_type,
+                prop_type: self.make_property_value(prop_sch),
+            }
+        page_id = self.make_id()
+        return {
+            'object': 'page',
+            'id': page_id,
+            'created_time': created_time,
+            'last_edited_time': max(created_time, self.make_time(max_days=30)),
+            'archived': False,
+            'cover': None,
+            'icon': None,
+            'url': f'https://www.notion.so/{page_id.replace("-", "")}',
+            'parent': {'type': 'database_id', 'database_id': database_id or str(uuid.UUID(int=self._seed))},
+            'properties': properties,
+        }
+
+    def iter_pages(
+            self, source: _SCHEMA_SOURCE_TYPE, count: int, database_id: Optional[str] = None,
+    ) -> Iterator[dict]:
+        for _ in range(count):
+            yield self.make_page(source, database_id=database_id)
+
+    def make_page_list(
+            self, source: _SCHEMA_SOURCE_TYPE, count: int,
+            database_id: Optional[str] = None, next_cursor: Optional[str] = None,
+    ) -> dict:
+        """Raw query response data with ``count`` pages"""
+
+        return {
+            'object': 'list',
+            'results': list(self.iter_pages(source, count, database_id=database_id)),
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None,
+        }
+
+    def make_block(self, block_type: str, has_children: bool = False) -> dict:
+        custom_data: dict[str, Any] = {'text': self.make_rich_text()}
+        if block_type == 'to_do':
+            custom_data['checked'] = self._random.random() < 0.5
+        elif block_type == 'code':
+            custom_data['language'] = self._random.choice(('python', 'javascript', 'plain text'))
+            code = '\n'.join(self.make_words() for _ in range(3))
+            custom_data['text'] = [{
+                'type': 'text', 'text': {'content': code, 'link': None},
+                'annotations': {}, 'plain_text': code, 'href': None,
+            }]
+        elif block_type == 'callout':
+            custom_data['icon'] = {'type': 'emoji', 'emoji': '💡'}
+        created_time = self.make_time()
+        return {
+            'object': 'block',
+            'id': self.make_id(),
+            'created_time': created_time,
+            'last_edited_time': max(created_time, self.make_time(max_days=30)),
+            'archived': False,
+            'has_children': has_children,
+            'type': block_type,
+            block_type: custom_data,
+        }
+
+    def make_block_tree(
+            self, root_id: str, depth: int = 2, fan_out: int = 10,
+            block_types: Sequence[str] = DEFAULT_BLOCK_TYPES, nesting_ratio: float = 0.3,
+    ) -> dict[str, list[dict]]:
+        """
+        Generate a tree of blocks under ``root_id`` and return it as
+        a mapping of parent block ids to lists of raw children data
+        (that's what the "Retrieve block children" endpoint returns for the parents).
+
+        Every level has ``fan_out`` children per parent,
+        about ``nesting_ratio`` of the blocks that can be nested have children themselves.
+        """
+
+        children: dict[str, list[dict]] = {}
+        level = [root_id]
+        for current_depth in range(depth):
+            next_level = []
+            for parent_id in level:
+                blocks = []
+                for _ in range(fan_out):
+                    block_type = self._random.choice(block_types)
+                    has_children = (
+                        current_depth < depth - 1
+                        and block_type in NESTING_BLOCK_TYPES
+                        and self._random.random() < nesting_ratio
+                    )
+                    block_data = self.make_block(block_type, has_children=has_children)
+                    blocks.append(block_data)
+                    if has_children:
+                        next_level.append(block_data['id'])
+                children[parent_id] = blocks
+            level = next_level
+        return children
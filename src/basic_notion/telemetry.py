@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import threading
+import time
+import weakref
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, ContextManager, Iterator, Optional, TypeVar
+
+import attr
+
+
+# Used by ``Telemetry.span`` when telemetry is disabled; ``nullcontext`` objects are reusable
+_NOOP_CONTEXT: ContextManager[None] = contextlib.nullcontext()
+
+# Names of spans and durations
+SPAN_QUERY_SERIALIZE = 'query.serialize'
+SPAN_DECODE = 'decode'
+SPAN_PAGE_PROCESSING = 'page.processing'
+
+
+_RESULT_TV = TypeVar('_RESULT_TV')
+
+
+def submit_in_context(executor: Executor, func: Callable[..., _RESULT_TV], *args: Any) -> Future[_RESULT_TV]:
+    """
+    Submit ``func(*args)`` to run in a copy of the caller's ``contextvars`` context,
+    so that spans started by the worker (e.g. OpenTelemetry ones) keep the caller's span as their parent
+    """
+
+    return executor.submit(contextvars.copy_context().run, func, *args)
+
+
+def _get_error_status(err: BaseException) -> str:
+    status = getattr(err, 'status', None)
+    return str(status) if status is not None else type(err).__name__
+
+
+class Telemetry:
+    """
+    Metrics and tracing interface used by the I/O helpers of the library
+    (pagination, block fetches, bulk writes).
+
+    This base implementation does nothing; subclasses record the data somewhere.
+    ``request`` and ``span`` return a shared no-op context manager
+    unless ``enabled`` is true, so disabled telemetry costs almost nothing.
+    """
+
+    enabled: bool = False
+
+    def span(self, name: str, **attributes: Any) -> ContextManager[None]:
+        """Context manager that traces a unit of work"""
+        return _NOOP_CONTEXT
+
+    def record_duration(self, name: str, duration: float, **labels: Any) -> None:
+        """Record the duration (in seconds) of a unit of work that is not a span"""
+
+    def record_request(
+            self, endpoint: str, duration: float,
+            database_id: Optional[str] = None, error: Optional[BaseException] = None,
+    ) -> None:
+        """Record the latency of a request to the API and its error (if any)"""
+
+    def request(self, endpoint: str, database_id: Optional[str] = None) -> ContextManager[None]:
+        """Context manager around a request to the API: a span + latency and error metrics"""
+
+        if not self.enabled:
+            return _NOOP_CONTEXT
+        return self._request(endpoint, database_id)
+
+    @contextlib.contextmanager
+    def _request(self, endpoint: str, database_id: Optional[str]) -> Iterator[None]:
+        attributes = {'endpoint': endpoint}
+        if database_id is not None:
+            attributes['database_id'] = database_id
+        started = time.perf_counter()
+        with self.span(f'notion.{endpoint}', **attributes):
+            try:
+                yield
+            except Exception as err:
+                self.record_request(endpoint, time.perf_counter() - started, database_id=database_id, error=err)
+                raise
+        self.record_request(endpoint, time.perf_counter() - started, database_id=database_id)
+
+
+_telemetry = Telemetry()
+
+
+def get_telemetry() -> Telemetry:
+    return _telemetry
+
+
+def set_telemetry(telemetry: Optional[Telemetry]) -> None:
+    """Set the telemetry used by the library (``None`` to disable it)"""
+
+    global _telemetry
+    _telemetry = telemetry if telemetry is not None else Telemetry()
+
+
+@attr.s(slots=True, frozen=True)
+class RecordedSpan:
+    name: str = attr.ib(kw_only=True)
+    duration: float = attr.ib(kw_only=True)
+    attributes: dict[str, Any] = attr.ib(kw_only=True)
+    error: Optional[str] = attr.ib(kw_only=True, default=None)
+
+
+@attr.s(slots=True, frozen=True)
+class RecordedRequest:
+    endpoint: str = attr.ib(kw_only=True)
+    duration: float = attr.ib(kw_only=True)
+    database_id: Optional[str] = attr.ib(kw_only=True, default=None)
+    # Status of the error response (or the type of the exception)
+    error: Optional[str] = attr.ib(kw_only=True, default=None)
+
+
+@attr.s(slots=True)
+class InMemoryTelemetry(Telemetry):
+    """Keeps all of the spans, durations and requests in memory (for tests and debugging)"""
+
+    enabled = True
+
+    spans: list[RecordedSpan] = attr.ib(init=False, factory=list)
+    # name -> (labels, duration) list
+    durations: dict[str, list[tuple[dict[str, Any], float]]] = attr.ib(init=False, factory=dict)
+    requests: list[RecordedRequest] = attr.ib(init=False, factory=list)
+    _lock: threading.Lock = attr.ib(init=False, factory=threading.Lock)
+
+    @contextlib.contextmanager
+    def _span(self, name: str, attributes: dict[str, Any]) -> Iterator[None]:
+        started = time.perf_counter()
+        error: Optional[str] = None
+        try:
+            yield
+        except Exception as err:
+            error = _get_error_status(err)
+            raise
+        finally:
+            span = RecordedSpan(
+                name=name, duration=time.perf_counter() - started, attributes=attributes, error=error,
+            )
+            with self._lock:
+                self.spans.append(span)
+
+    def span(self, name: str, **attributes: Any) -> ContextManager[None]:
+        return self._span(name, attributes)
+
+    def record_duration(self, name: str, duration: float, **labels: Any) -> None:
+        with self._lock:
+            self.durations.setdefault(name, []).append((labels, duration))
+
+    def record_request(
+            self, endpoint: str, duration: float,
+            database_id: Optional[str] = None, error: Optional[BaseException] = None,
+    ) -> None:
+        request = RecordedRequest(
+            endpoint=endpoint, duration=duration, database_id=database_id,
+            error=_get_error_status(error) if error is not None else None,
+        )
+        with self._lock:
+            self.requests.append(request)
+
+    def get_span_names(self) -> list[str]:
+        return [span.name for span in self.spans]
+
+
+# registry -> namespace -> (request duration, request errors, duration) collectors.
+# A collector can only be registered once, so the instances with the same registry share them
+_prometheus_collectors: weakref.WeakKeyDictionary[Any, dict[str, tuple[Any, Any, Any]]] = weakref.WeakKeyDictionary()
+_prometheus_lock = threading.Lock()
+
+
+def _get_prometheus_collectors(registry: Any, namespace: str) -> tuple[Any, Any, Any]:
+    # Optional dependency
+    import prometheus_client
+
+    if registry is None:
+        registry = prometheus_client.REGISTRY
+    with _prometheus_lock:
+        by_namespace = _prometheus_collectors.setdefault(registry, {})
+        if namespace not in by_namespace:
+            by_namespace[namespace] = (
+                prometheus_client.Histogram(
+                    'request_duration_seconds', 'Duration of Notion API requests',
+                    ['endpoint', 'database_id'], namespace=namespace, registry=registry,
+                ),
+                prometheus_client.Counter(
+                    'request_errors_total', 'Failed Notion API requests',
+                    ['endpoint', 'database_id', 'status'], namespace=namespace, registry=registry,
+                ),
+                prometheus_client.Histogram(
+                    'duration_seconds', 'Duration of the work done by basic-notion',
+                    ['name'], namespace=namespace, registry=registry,
+                ),
+            )
+        return by_namespace[namespace]
+
+
+@attr.s(slots=True)
+class PrometheusTelemetry(Telemetry):
+    """
+    Exports metrics via ``prometheus_client`` (``pip install basic-notion[prometheus]``):
+    - ``<namespace>_request_duration_seconds`` histogram (``endpoint``, ``database_id``);
+    - ``<namespace>_request_errors_total`` counter (``endpoint``, ``database_id``, ``status``);
+    - ``<namespace>_duration_seconds`` histogram of spans and other durations (``name``).
+
+    Instances with the same registry and namespace share the metrics.
+    """
+
+    enabled = True
+
+    # ``prometheus_client.CollectorRegistry`` (the default registry if not given)
+    _registry: Any = attr.ib(kw_only=True, default=None)
+    _namespace: str = attr.ib(kw_only=True, default='basic_notion')
+    request_duration: Any = attr.ib(init=False)
+    request_errors: Any = attr.ib(init=False)
+    duration: Any = attr.ib(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.request_duration, self.request_errors, self.duration = _get_prometheus_collectors(
+            self._registry, self._namespace,
+        )
+
+    @contextlib.contextmanager
+    def _span(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.duration.labels(name=name).observe(time.perf_counter() - started)
+
+    def span(self, name: str, **attributes: Any) -> ContextManager[None]:
+        return self._span(name)
+
+    def record_duration(self, name: str, duration: float, **labels: Any) -> None:
+        self.duration.labels(name=name).observe(duration)
+
+    def record_request(
+            self, endpoint: str, duration: float,
+            database_id: Optional[str] = None, error: Optional[BaseException] = None,
+    ) -> None:
+        database_label = database_id or ''
+        self.request_duration.labels(endpoint=endpoint, database_id=database_label).observe(duration)
+        if error is not None:
+            self.request_errors.labels(
+                endpoint=endpoint, database_id=database_label, status=_get_error_status(error),
+            ).inc()
+
+
+@attr.s(slots=True)
+class OpenTelemetryTelemetry(Telemetry):
+    """
+    Traces and metrics via the OpenTelemetry API (``pip install basic-notion[opentelemetry]``).
+    Uses the global tracer and meter providers unless a ``tracer`` or a ``meter`` is given.
+    """
+
+    enabled = True
+
+    tracer: Any = attr.ib(kw_only=True, default=None)
+    _meter: Any = attr.ib(kw_only=True, default=None)
+    request_duration: Any = attr.ib(init=False)
+    request_errors: Any = attr.ib(init=False)
+    duration: Any = attr.ib(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        # Optional dependency
+        from opentelemetry import metrics, trace
+
+        if self.tracer is None:
+            self.tracer = trace.get_tracer('basic_notion')
+        meter = self._meter if self._meter is not None else metrics.get_meter('basic_notion')
+        self.request_duration = meter.create_histogram(
+            'notion.request.duration', unit='s', description='Duration of Notion API requests',
+        )
+        self.request_errors = meter.create_counter(
+            'notion.request.errors', description='Failed Notion API requests',
+        )
+        self.duration = meter.create_histogram(
+            'basic_notion.duration', unit='s', description='Duration of the work done by basic-notion',
+        )
+
+    def span(self, name: str, **attributes: Any) -> ContextManager[None]:
+        return self.tracer.start_as_current_span(name, attributes=attributes)
+
+    def record_duration(self, name: str, duration: float, **labels: Any) -> None:
+        self.duration.record(duration, attributes={'name': name, **labels})
+
+    def record_request(
+            self, endpoint: str, duration: float,
+            database_id: Optional[str] = None, error: Optional[BaseException] = None,
+    ) -> None:
+        attributes = {'endpoint': endpoint}
+        if database_id is not None:
+            attributes['database_id'] = database_id
+        self.request_duration.record(duration, attributes=attributes)
+        if error is not None:
+            self.request_errors.add(1, attributes={**attributes, 'status': _get_error_status(error)})
@@ -0,0 +1,5 @@
+"""
+Test doubles of the Notion API (see ``testing.fake_api``).
+
+Not meant to be used in production code: nothing outside of this package imports it.
+"""
@@ -0,0 +1,746 @@
+from __future__ import annotations
+
+import copy
+import datetime
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qs, urlparse
+
+import attr
+
+from basic_notion.exc import NotionAPIError
+from basic_notion.ratelimit import TokenBucket
+
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 100
+
+_DEFAULT_ANNOTATIONS = {
+    'bold': False, 'italic': False, 'strikethrough': False,
+    'underline': False, 'code': False, 'color': 'default',
+}
+_TEXT_PROPERTY_TYPES = frozenset(('title', 'rich_text', 'text'))
+
+
+class FakeAPIError(NotionAPIError):
+    """Error response of the fake API"""
+
+
+def _not_found(object_id: str) -> FakeAPIError:
+    return FakeAPIError(404, 'object_not_found', f'Could not find object with ID: {object_id}')
+
+
+def _validation_error(message: str) -> FakeAPIError:
+    return FakeAPIError(400, 'validation_error', message)
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+
+def _normalize_rich_text(rich_text: list[dict]) -> list[dict]:
+    """Fill in the attributes of rich text runs that are added by the API"""
+
+    result = []
+    for run in rich_text:
+        text_data = dict(run.get('text') or {})
+        text_data.setdefault('link', None)
+        link = text_data['link']
+        result.append({
+            'type': 'text',
+            'text': text_data,
+            'annotations': {**_DEFAULT_ANNOTATIONS, **(run.get('annotations') or {})},
+            'plain_text': text_data.get('content', ''),
+            'href': link.get('url') if isinstance(link, dict) else None,
+        })
+    return result
+
+
+def _get_plain_text(value: Any) -> str:
+    if isinstance(value, list):
+        return ''.join(run.get('plain_text', '') for run in value)
+    return value or ''
+
+
+# Property value (from page data) -> comparable value for filtering and sorting
+def _get_comparable_value(prop_type: str, value: Any) -> Any:
+    if prop_type in _TEXT_PROPERTY_TYPES:
+        return _get_plain_text(value)
+    if prop_type == 'select':
+        return value['name'] if value else None
+    if prop_type == 'multi_select':
+        return [option['name'] for option in value or ()]
+    if prop_type == 'date':
+        return value['start'] if value else None
+    return value
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == '' or value == []
+
+
+def _match_condition(prop_type: str, value: Any, condition: str, expected: Any) -> bool:
+    if condition == 'is_empty':
+        return _is_empty(value) == bool(expected)
+    if condition == 'is_not_empty':
+        return _is_empty(value) != bool(expected)
+
+    if prop_type == 'multi_select':
+        if condition in ('contains', 'equals'):
+            return expected in value
+        if condition in ('does_not_contain', 'does_not_equal'):
+            return expected not in value
+    elif condition in ('equals', 'does_not_equal'):
+        if prop_type == 'date' and value is not None:
+            value = value[:len(expected)]
+        return (value == expected) == (condition == 'equals')
+    elif condition == 'contains':
+        return value is not None and expected in value
+    elif condition == 'does_not_contain':
+        return value is None or expected not in value
+    elif condition == 'starts_with':
+        return value is not None and value.startswith(expected)
+    elif condition == 'ends_with':
+        return value is not None and value.endswith(expected)
+    elif value is None:
+        return False
+    elif condition in ('greater_than', 'after'):
+        return value > expected
+    elif condition in ('less_than', 'before'):
+        return value < expected
+    elif condition in ('greater_than_or_equal_to', 'on_or_after'):
+        return value >= expected
+    elif condition in ('less_than_or_equal_to', 'on_or_before'):
+        return value <= expected
+
+    raise _validation_error(f'Unsupported filter condition for {prop_type}: {condition}')
+
+
+def _find_property(page_data: dict, name_or_id: str) -> Optional[tuple[str, dict]]:
+    properties = page_data['properties']
+    if name_or_id in properties:
+        return name_or_id, properties[name_or_id]
+    for name, prop_data in properties.items():
+        if prop_data.get('id') == name_or_id:
+            return name, prop_data
+    return None
+
+
+def _match_filter(page_data: dict, filter_data: dict) -> bool:
+    if 'and' in filter_data:
+        return all(_match_filter(page_data, sub_filter) for sub_filter in filter_data['and'])
+    if 'or' in filter_data:
+        return any(_match_filter(page_data, sub_filter) for sub_filter in filter_data['or'])
+
+    found = _find_property(page_data, filter_data['property'])
+    if found is None:
+        raise _validation_error(f'Could not find property with name or id: {filter_data["property"]}')
+    _, prop_data = found
+    prop_type = prop_data['type']
+    conditions = filter_data.get(prop_type)
+    if conditions is None:
+        raise _validation_error(f'Property type mismatch in filter: {prop_type}')
+    value = _get_comparable_value(prop_type, prop_data.get(prop_type))
+    return all(
+        _match_condition(prop_type, value, condition, expected)
+        for condition, expected in conditions.items()
+    )
+
+
+def _get_sort_value(page_data: dict, sort: dict) -> Any:
+    if 'timestamp' in sort:
+        return page_data[sort['timestamp']]
+    found = _find_property(page_data, sort['property'])
+    value = _get_comparable_value(found[1]['type'], found[1].get(found[1]['type'])) if found else None
+    if isinstance(value, list):
+        value = ', '.join(value)
+    return value
+
+
+def _sort_pages(pages: list[dict], sort: dict) -> list[dict]:
+    """Sort pages by a single sort (stable). Empty values go last in either direction"""
+
+    values = [(page, _get_sort_value(page, sort)) for page in pages]
+    non_empty = [item for item in values if not _is_empty(item[1])]
+    non_empty.sort(key=lambda item: item[1], reverse=sort.get('direction') == 'descending')
+    return [page for page, _ in non_empty] + [page for page, value in values if _is_empty(value)]
+
+
+def _paginate(items: list, start_cursor: Optional[str], page_size: Optional[int]) -> tuple[list, Optional[str]]:
+    page_size = min(page_size or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    try:
+        start = int(start_cursor) if start_cursor else 0
+    except ValueError:
+        raise _validation_error(f'Invalid start_cursor: {start_cursor}')
+    end = start + page_size
+    return items[start:end], (str(end) if end < len(items) else None)
+
+
+def _make_list_response(results: list, next_cursor: Optional[str]) -> dict:
+    return {'object': 'list', 'results': results, 'next_cursor': next_cursor, 'has_more': next_cursor is not None}
+
+
+class _Endpoint:
+    def __init__(self, api: FakeNotionAPI) -> None:
+        self._api = api
+
+
+class _DatabasesEndpoint(_Endpoint):
+    def create(self, **kwargs: Any) -> dict:
+        return self._api.request('databases.create', self._api.create_database, kwargs)
+
+    def retrieve(self, database_id: str, **kwargs: Any) -> dict:
+        return self._api.request('databases.retrieve', self._api.retrieve_database, dict(database_id=database_id))
+
+    def query(self, database_id: str, **kwargs: Any) -> dict:
+        return self._api.request('databases.query', self._api.query_database, dict(database_id=database_id, **kwargs))
+
+
+class _PagesEndpoint(_Endpoint):
+    def create(self, **kwargs: Any) -> dict:
+        return self._api.request('pages.create', self._api.create_page, kwargs)
+
+    def retrieve(self, page_id: str, **kwargs: Any) -> dict:
+        return self._api.request('pages.retrieve', self._api.retrieve_page, dict(page_id=page_id))
+
+    def update(self, page_id: str, **kwargs: Any) -> dict:
+        return self._api.request('pages.update', self._api.update_page, dict(page_id=page_id, **kwargs))
+
+
+class _BlockChildrenEndpoint(_Endpoint):
+    def list(self, block_id: str, **kwargs: Any) -> dict:
+        return self._api.request('blocks.children.list', self._api.list_block_children, dict(block_id=block_id, **kwargs))
+
+    def append(self, block_id: str, **kwargs: Any) -> dict:
+        return self._api.request(
+            'blocks.children.append', self._api.append_block_children, dict(block_id=block_id, **kwargs),
+        )
+
+
+class _BlocksEndpoint(_Endpoint):
+    def __init__(self, api: FakeNotionAPI) -> None:
+        super().__init__(api)
+        self.children = _BlockChildrenEndpoint(api)
+
+    def retrieve(self, block_id: str, **kwargs: Any) -> dict:
+        return self._api.request('blocks.retrieve', self._api.retrieve_block, dict(block_id=block_id))
+
+    def update(self, block_id: str, **kwargs: Any) -> dict:
+        return self._api.request('blocks.update', self._api.update_block, dict(block_id=block_id, **kwargs))
+
+
+@attr.s(slots=True)
+class FakeNotionAPI:
+    """
+    In-memory implementation of a subset of the Notion API
+    with the same interface as ``notion_client.Client``:
+    database create/retrieve/query, page create/retrieve/update,
+    block retrieve/update and block children list/append.
+
+    ``latency`` (plus a random ``latency_jitter``) seconds are spent in every request.
+    Requests fail with a 429 error (with a ``Retry-After`` header)
+    if they exceed ``rate_limit`` requests per second
+    or randomly with the probability of ``error_rate``.
+    """
+
+    latency: float = attr.ib(kw_only=True, default=0.0)
+    latency_jitter: float = attr.ib(kw_only=True, default=0.0)
+    rate_limit: Optional[float] = attr.ib(kw_only=True, default=None)
+    error_rate: float = attr.ib(kw_only=True, default=0.0)
+    retry_after: float = attr.ib(kw_only=True, default=1.0)
+    # Return copies of the stored data, as if it was decoded from a response
+    copy_results: bool = attr.ib(kw_only=True, default=True)
+    seed: int = attr.ib(kw_only=True, default=0)
+
+    request_counts: Counter = attr.ib(init=False, factory=Counter)
+    _databases: dict[str, dict] = attr.ib(init=False, factory=dict)
+    # database id -> ids of its pages
+    _database_pages: dict[str, list[str]] = attr.ib(init=False, factory=dict)
+    _pages: dict[str, dict] = attr.ib(init=False, factory=dict)
+    _blocks: dict[str, dict] = attr.ib(init=False, factory=dict)
+    # parent (page or block) id -> ids of child blocks
+    _children: dict[str, list[str]] = attr.ib(init=False, factory=dict)
+    # (database id, filter, sorts) -> (data version, page ids); used for fast pagination
+    _query_cache: dict[tuple, tuple[int, list[str]]] = attr.ib(init=False, factory=dict)
+    _version: int = attr.ib(init=False, default=0)
+    _lock: threading.RLock = attr.ib(init=False, factory=threading.RLock)
+    _random: random.Random = attr.ib(init=False)
+    _rate_limiter: Optional[TokenBucket] = attr.ib(init=False, default=None)
+
+    databases: _DatabasesEndpoint = attr.ib(init=False)
+    pages: _PagesEndpoint = attr.ib(init=False)
+    blocks: _BlocksEndpoint = attr.ib(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self._random = random.Random(self.seed)
+        if self.rate_limit is not None:
+            self._rate_limiter = TokenBucket(rate=self.rate_limit)
+        self.databases = _DatabasesEndpoint(self)
+        self.pages = _PagesEndpoint(self)
+        self.blocks = _BlocksEndpoint(self)
+
+    @property
+    def request_count(self) -> int:
+        return sum(self.request_counts.values())
+
+    def request(self, endpoint: str, handler: Callable[..., dict], kwargs: dict) -> dict:
+        """Handle a request to ``endpoint`` applying the latency and error injection"""
+
+        with self._lock:
+            self.request_counts[endpoint] += 1
+            rejected = (
+                (self._rate_limiter is not None and not self._rate_limiter.try_acquire())
+                or (self.error_rate > 0 and self._random.random() < self.error_rate)
+            )
+            delay = self.latency + (self._random.random() * self.latency_jitter if self.latency_jitter else 0.0)
+
+        if delay > 0:
+            time.sleep(delay)
+        if rejected:
+            raise FakeAPIError(
+                429, 'rate_limited', 'You have been rate limited. Please try again in a few minutes.',
+                headers={'Retry-After': str(self.retry_after)},
+            )
+
+        with self._lock:
+            result = handler(**kwargs)
+            return copy.deepcopy(result) if self.copy_results else result
+
+    def _new_id(self) -> str:
+        return str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+
+    def _changed(self) -> None:
+        self._version += 1
+
+    # Databases
+
+    def create_database(self, parent: dict, properties: dict, title: Optional[list] = None, **kwargs: Any) -> dict:
+        database_id = self._new_id()
+        schema = {}
+        for name, prop_data in properties.items():
+            prop_type = prop_data.get('type') or next(key for key in prop_data if key not in ('id', 'name'))
+            type_data = dict(prop_data.get(prop_type) or {})
+            if prop_type in ('select', 'multi_select'):
+                type_data['options'] = [
+                    {'id': option.get('id') or self._new_id(), 'color': option.get('color', 'default'), **option}
+                    for option in type_data.get('options', [])
+                ]
+            schema[name] = {
+                'id': 'title' if prop_type == 'title' else self._new_id()[:4],
+                'name': name, 'type': prop_type, prop_type: type_data,
+            }
+        timestamp = _now()
+        self._databases[database_id] = {
+            'object': 'database',
+            'id': database_id,
+            'created_time': timestamp,
+            'last_edited_time': timestamp,
+            'title': _normalize_rich_text(title or []),
+            'parent': parent,
+            'url': f'https://www.notion.so/{database_id.replace("-", "")}',
+            'cover': None,
+            'icon': None,
+            'properties': schema,
+        }
+        self._database_pages[database_id] = []
+        return self._databases[database_id]
+
+    def retrieve_database(self, database_id: str) -> dict:
+        if database_id not in self._databases:
+            raise _not_found(database_id)
+        return self._databases[database_id]
+
+    def query_database(
+            self, database_id: str, filter: Optional[dict] = None, sorts: Optional[list[dict]] = None,
+            start_cursor: Optional[str] = None, page_size: Optional[int] = None,
+            filter_properties: Optional[list[str]] = None, **kwargs: Any,
+    ) -> dict:
+        if database_id not in self._databases:
+            raise _not_found(database_id)
+
+        cache_key = (database_id, json.dumps(filter, sort_keys=True), json.dumps(sorts, sort_keys=True))
+        cached = self._query_cache.get(cache_key)
+        if cached is not None and cached[0] == self._version:
+            page_ids = cached[1]
+        else:
+            pages = [
+                self._pages[page_id] for page_id in self._database_pages[database_id]
+                if not self._pages[page_id]['archived']
+            ]
+            if filter:
+                pages = [page for page in pages if _match_filter(page, filter)]
+            for sort in reversed(sorts or ()):
+                pages = _sort_pages(pages, sort)
+            page_ids = [page['id'] for page in pages]
+            self._query_cache[cache_key] = (self._version, page_ids)
+
+        page_ids, next_cursor = _paginate(page_ids, start_cursor, page_size)
+        results = [self._pages[page_id] for page_id in page_ids]
+        if filter_properties is not None:
+            results = [self._project_page(page, filter_properties) for page in results]
+        return _make_list_response(results, next_cursor)
+
+    @staticmethod
+    def _project_page(page_data: dict, filter_properties: list[str]) -> dict:
+        properties = {
+            name: prop_data for name, prop_data in page_data['properties'].items()
+            if name in filter_properties or prop_data.get('id') in filter_properties
+        }
+        return {**page_data, 'properties': properties}
+
+    # Pages
+
+    def _normalize_property(self, name: str, prop_data: dict, database: Optional[dict]) -> dict:
+        schema_data = database['properties'].get(name) if database is not None else None
+        if database is not None and schema_data is None:
+            raise _validation_error(f'{name} is not a property that exists.')
+        if schema_data is not None:
+            prop_type = schema_data['type']
+            prop_id = schema_data['id']
+        else:
+            prop_type = prop_data.get('type') or next(key for key in prop_data if key not in ('id', 'type'))
+            prop_id = 'title' if prop_type == 'title' else prop_data.get('id', name[:4])
+
+        value = prop_data.get(prop_type)
+        if prop_type in _TEXT_PROPERTY_TYPES:
+            value = _normalize_rich_text(value or [])
+        elif prop_type in ('select', 'multi_select') and schema_data is not None and value:
+            options = schema_data[prop_type]['options']
+            values = [self._get_option(options, item) for item in (value if prop_type == 'multi_select' else [value])]
+            value = values if prop_type == 'multi_select' else values[0]
+        elif prop_type == 'date' and value:
+            value = {'start': value['start'], 'end': value.get('end'), 'time_zone': value.get('time_zone')}
+        return {'id': prop_id, 'type': prop_type, prop_type: value}
+
+    def _get_option(self, options: list[dict], value: dict) -> dict:
+        for option in options:
+            if option['name'] == value.get('name') or option['id'] == value.get('id'):
+                return option
+        # New options are added to the schema automatically
+        option = {'id': self._new_id(), 'name': value['name'], 'color': value.get('color', 'default')}
+        options.append(option)
+        return option
+
+    def create_page(self, parent: dict, properties: dict, children: Optional[list[dict]] = None, **kwargs: Any) -> dict:
+        database: Optional[dict] = None
+        if 'database_id' in parent:
+            database = self.retrieve_database(parent['database_id'])
+        elif 'page_id' in parent:
+            self.retrieve_page(parent['page_id'])
+        else:
+            raise _validation_error('Invalid parent')
+
+        page_id = self._new_id()
+        timestamp = _now()
+        page_data: dict[str, Any] = {
+            'object': 'page',
+            'id': page_id,
+            'created_time': timestamp,
+            'last_edited_time': timestamp,
+            'archived': False,
+            'cover': kwargs.get('cover'),
+            'icon': kwargs.get('icon'),
+            'url': f'https://www.notion.so/{page_id.replace("-", "")}',
+            'parent': {'type': next(iter(parent)), **parent} if 'type' not in parent else parent,
+            'properties': {
+                name: self._normalize_property(name, prop_data, database)
+                for name, prop_data in properties.items()
+            },
+        }
+        if database is not None:
+            # All of the database's properties are present in its pages
+            for name, schema_data in database['properties'].items():
+                if name not in page_data['properties']:
+                    page_data['properties'][name] = self._normalize_property(name, {}, database)
+            self._database_pages[database['id']].append(page_id)
+        self._pages[page_id] = page_data
+        if children:
+            self._append_blocks(page_id, children, after=None)
+        self._changed()
+        return page_data
+
+    def retrieve_page(self, page_id: str) -> dict:
+        if page_id not in self._pages:
+            raise _not_found(page_id)
+        return self._pages[page_id]
+
+    def update_page(
+            self, page_id: str, properties: Optional[dict] = None,
+            archived: Optional[bool] = None, **kwargs: Any,
+    ) -> dict:
+        page_data = self.retrieve_page(page_id)
+        database_id = page_data['parent'].get('database_id')
+        database = self._databases.get(database_id) if database_id else None
+        for name, prop_data in (properties or {}).items():
+            page_data['properties'][name] = self._normalize_property(name, prop_data, database)
+        if archived is not None:
+            page_data['archived'] = archived
+        for key in ('icon', 'cover'):
+            if key in kwargs:
+                page_data[key] = kwargs[key]
+        page_data['last_edited_time'] = _now()
+        self._changed()
+        return page_data
+
+    # Blocks
+
+    def _append_blocks(self, parent_id: str, blocks: list[dict], after: Optional[str]) -> list[dict]:
+        child_ids = self._children.setdefault(parent_id, [])
+        position = len(child_ids)
+        if after is not None:
+            if after not in child_ids:
+                raise _validation_error(f'Block {after} is not a child of {parent_id}')
+            position = child_ids.index(after) + 1
+
+        created = []
+        for block in blocks:
+            block_type = block['type']
+            custom_data = dict(block.get(block_type) or {})
+            nested = custom_data.pop('children', None)
+            if 'text' in custom_data:
+                custom_data['text'] = _normalize_rich_text(custom_data['text'])
+            block_id = self._new_id()
+            timestamp = _now()
+            block_data = {
+                'object': 'block',
+                'id': block_id,
+                'created_time': timestamp,
+                'last_edited_time': timestamp,
+                'archived': False,
+                'has_children': False,
+                'type': block_type,
+                block_type: custom_data,
+            }
+            self._blocks[block_id] = block_data
+            child_ids.insert(position, block_id)
+            position += 1
+            if nested:
+                self._append_blocks(block_id, nested, after=None)
+            created.append(block_data)
+
+        if parent_id in self._blocks:
+            self._blocks[parent_id]['has_children'] = True
+        return created
+
+    def append_block_children(self, block_id: str, children: list[dict], after: Optional[str] = None) -> dict:
+        if block_id not in self._blocks and block_id not in self._pages:
+            raise _not_found(block_id)
+        created = self._append_blocks(block_id, children, after=after)
+        self._changed()
+        return _make_list_response(created, None)
+
+    def list_block_children(
+            self, block_id: str, start_cursor: Optional[str] = None, page_size: Optional[int] = None,
+    ) -> dict:
+        if block_id not in self._blocks and block_id not in self._pages:
+            raise _not_found(block_id)
+        child_ids = [
+            child_id for child_id in self._children.get(block_id, ())
+            if not self._blocks[child_id]['archived']
+        ]
+        child_ids, next_cursor = _paginate(child_ids, start_cursor, page_size)
+        return _make_list_response([self._blocks[child_id] for child_id in child_ids], next_cursor)
+
+    def retrieve_block(self, block_id: str) -> dict:
+        if block_id not in self._blocks:
+            raise _not_found(block_id)
+        return self._blocks[block_id]
+
+    def update_block(self, block_id: str, archived: Optional[bool] = None, **kwargs: Any) -> dict:
+        block_data = self.retrieve_block(block_id)
+        block_type = block_data['type']
+        if block_type in kwargs:
+            custom_data = dict(kwargs[block_type])
+            if 'text' in custom_data:
+                custom_data['text'] = _normalize_rich_text(custom_data['text'])
+            block_data[block_type] = {**block_data[block_type], **custom_data}
+        if archived is not None:
+            block_data['archived'] = archived
+        block_data['last_edited_time'] = _now()
+        self._changed()
+        return block_data
+
+    # Data loading helpers (not counted as requests)
+
+    def add_pages(self, database_id: str, pages: list[dict]) -> None:
+        """Add raw page data (e.g. from ``synthetic.SyntheticDataGenerator``) to a database as is"""
+
+        with self._lock:
+            database_pages = self._database_pages[database_id]
+            for page_data in pages:
+                self._pages[page_data['id']] = page_data
+                database_pages.append(page_data['id'])
+            self._changed()
+
+    def add_blocks(self, children: dict[str, list[dict]]) -> None:
+        """Add raw block data given as a mapping of parent ids to lists of children"""
+
+        with self._lock:
+            for parent_id, blocks in children.items():
+                child_ids = self._children.setdefault(parent_id, [])
+                for block_data in blocks:
+                    self._blocks[block_data['id']] = block_data
+                    child_ids.append(block_data['id'])
+            self._changed()
+
+
+# (HTTP method, path pattern, endpoint name)
+_ROUTES: list[tuple[str, tuple[str, ...], str]] = [
+    ('POST', ('databases',), 'databases.create'),
+    ('GET', ('databases', '{database_id}'), 'databases.retrieve'),
+    ('POST', ('databases', '{database_id}', 'query'), 'databases.query'),
+    ('POST', ('pages',), 'pages.create'),
+    ('GET', ('pages', '{page_id}'), 'pages.retrieve'),
+    ('PATCH', ('pages', '{page_id}'), 'pages.update'),
+    ('GET', ('blocks', '{block_id}'), 'blocks.retrieve'),
+    ('PATCH', ('blocks', '{block_id}'), 'blocks.update'),
+    ('GET', ('blocks', '{block_id}', 'children'), 'blocks.children.list'),
+    ('PATCH', ('blocks', '{block_id}', 'children'), 'blocks.children.append'),
+]
+
+
+def _match_route(method: str, parts: list[str]) -> Optional[tuple[str, dict[str, str]]]:
+    for route_method, pattern, endpoint in _ROUTES:
+        if route_method != method or len(pattern) != len(parts):
+            continue
+        params = {}
+        for pattern_part, part in zip(pattern, parts):
+            if pattern_part.startswith('{'):
+                params[pattern_part[1:-1]] = part
+            elif pattern_part != part:
+                break
+        else:
+            return endpoint, params
+    return None
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server: _FakeHTTPServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send_json(self, status: int, data: dict, headers: Optional[dict[str, str]] = None) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method: str) -> None:
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        if parts[:1] == ['v1']:
+            parts = parts[1:]
+        route = _match_route(method, parts)
+        if route is None:
+            error = FakeAPIError(400, 'invalid_request_url', 'Invalid request URL.')
+            self._send_json(error.status, error.body)
+            return
+
+        endpoint, params = route
+        kwargs: dict[str, Any] = dict(params)
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            kwargs.update(json.loads(self.rfile.read(length)))
+        for name, values in parse_qs(url.query).items():
+            if name == 'filter_properties':
+                kwargs[name] = values
+            elif name == 'page_size':
+                kwargs[name] = int(values[0])
+            else:
+                kwargs[name] = values[0]
+
+        api = self.server.api
+        handlers: dict[str, Callable[..., dict]] = {
+            'databases.create': api.create_database,
+            'databases.retrieve': api.retrieve_database,
+            'databases.query': api.query_database,
+            'pages.create': api.create_page,
+            'pages.retrieve': api.retrieve_page,
+            'pages.update': api.update_page,
+            'blocks.retrieve': api.retrieve_block,
+            'blocks.update': api.update_block,
+            'blocks.children.list': api.list_block_children,
+            'blocks.children.append': api.append_block_children,
+        }
+        try:
+            result = api.request(endpoint, handlers[endpoint], kwargs)
+        except FakeAPIError as err:
+            self._send_json(err.status, err.body, headers=err.headers)
+        except TypeError as err:
+            error = _validation_error(str(err))
+            self._send_json(error.status, error.body)
+        else:
+            self._send_json(200, result)
+
+    def do_GET(self) -> None:
+        self._handle('GET')
+
+    def do_POST(self) -> None:
+        self._handle('POST')
+
+    def do_PATCH(self) -> None:
+        self._handle('PATCH')
+
+
+class _FakeHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], api: FakeNotionAPI) -> None:
+        super().__init__(address, _RequestHandler)
+        self.api = api
+
+
+@attr.s(slots=True)
+class FakeNotionServer:
+    """
+    Serves ``FakeNotionAPI`` over HTTP (the same paths as ``https://api.notion.com/v1/...``).
+
+    Usage::
+
+        with FakeNotionServer() as server:
+            client = notion_client.Client(auth='secret', base_url=server.url)
+    """
+
+    api: FakeNotionAPI = attr.ib(kw_only=True, factory=FakeNotionAPI)
+    _host: str = attr.ib(kw_only=True, default='127.0.0.1')
+    _port: int = attr.ib(kw_only=True, default=0)
+    _server: Optional[_FakeHTTPServer] = attr.ib(init=False, default=None)
+    _thread: Optional[threading.Thread] = attr.ib(init=False, default=None)
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError('Server is not running')
+        return f'http://{self._host}:{self._server.server_port}'
+
+    def start(self) -> None:
+        self._server = _FakeHTTPServer((self._host, self._port), api=self.api)
+        self._thread = threading.Thread(target=self._server.serve_forever, name='FakeNotionServer', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> FakeNotionServer:
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import gzip
+import json
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Iterator, Optional
+
+import attr
+
+from basic_notion.exc import NotionAPIError
+
+
+SCRUBBED = '***'
+
+# Keys whose values are always replaced with ``SCRUBBED`` (compared case-insensitively)
+DEFAULT_SCRUB_KEYS = frozenset((
+    'auth', 'authorization', 'token', 'access_token', 'refresh_token',
+    'secret', 'client_secret', 'password', 'cookie', 'api_key',
+))
+# Notion integration tokens
+TOKEN_RE = re.compile(r'\b(?:secret_[A-Za-z0-9]{20,}|ntn_[A-Za-z0-9]{20,})\b')
+
+
+def scrub(value: Any, scrub_keys: frozenset[str] = DEFAULT_SCRUB_KEYS) -> Any:
+    """Return a copy of JSON-like data with secrets replaced"""
+
+    if isinstance(value, dict):
+        return {
+            key: SCRUBBED if key.lower() in scrub_keys else scrub(item, scrub_keys)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [scrub(item, scrub_keys) for item in value]
+    if isinstance(value, str):
+        return TOKEN_RE.sub(SCRUBBED, value)
+    return value
+
+
+def _get_request_key(endpoint: str, request: dict) -> str:
+    return json.dumps([endpoint, request], sort_keys=True)
+
+
+def iter_records(path: str) -> Iterator[dict]:
+    """Iterate over the records of a traffic file"""
+
+    with gzip.open(path, 'rt', encoding='utf-8') as traffic_file:
+        for line in traffic_file:
+            if line.strip():
+                yield json.loads(line)
+
+
+@attr.s(slots=True)
+class TrafficRecorder:
+    """
+    Records the requests and responses of fetch callables
+    (e.g. ``client.databases.query``) to a gzip-compressed JSON Lines file.
+
+    Every record contains the endpoint name, the request's keyword arguments,
+    the response (or the error's status and code), the duration of the call
+    and its start time relative to the start of the recording.
+    Secrets are scrubbed from requests and responses before they are written.
+    The file is appended to, so it can be recorded in several sessions.
+    """
+
+    _path: str = attr.ib(kw_only=True)
+    _scrub_keys: frozenset[str] = attr.ib(kw_only=True, default=DEFAULT_SCRUB_KEYS)
+    _clock: Callable[[], float] = attr.ib(kw_only=True, default=time.monotonic)
+    _file: Optional[Any] = attr.ib(init=False, default=None)
+    _started: Optional[float] = attr.ib(init=False, default=None)
+    _count: int = attr.ib(init=False, default=0)
+    _lock: threading.Lock = attr.ib(init=False, factory=threading.Lock)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def _write(self, record: dict) -> None:
+        line = json.dumps(scrub(record, self._scrub_keys), ensure_ascii=False) + '\n'
+        with self._lock:
+            if self._file is None:
+                self._file = gzip.open(self._path, 'at', encoding='utf-8')
+            self._file.write(line)
+            self._count += 1
+
+    def wrap(self, func: Callable[..., dict], endpoint: Optional[str] = None) -> Callable[..., dict]:
+        """
+        Return a version of ``func`` that records its calls.
+        ``endpoint`` (the function's qualified name by default)
+        is used to tell the requests of different callables apart.
+        """
+
+        endpoint_name = endpoint or getattr(func, '__qualname__', repr(func))
+
+        def recorded(**kwargs: Any) -> dict:
+            started = self._clock()
+            if self._started is None:
+                self._started = started
+            record: dict[str, Any] = {
+                'endpoint': endpoint_name,
+                'offset': started - self._started,
+                'request': kwargs,
+            }
+            try:
+                response = func(**kwargs)
+            except Exception as err:
+                record['duration'] = self._clock() - started
+                record['error'] = {
+                    'status': getattr(err, 'status', None),
+                    'code': getattr(err, 'code', None),
+                    'message': str(err),
+                }
+                self._write(record)
+                raise
+            record['duration'] = self._clock() - started
+            record['response'] = response
+            self._write(record)
+            return response
+
+        return recorded
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> TrafficRecorder:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+@attr.s(slots=True)
+class TrafficReplayer:
+    """
+    Serves recorded responses back.
+
+    Requests are matched by the endpoint name and keyword arguments,
+    which are scrubbed the same way as when they were recorded
+    (so live secrets, e.g. ``auth``, match the scrubbed ones).
+    Repeated identical requests get the recorded responses in their original order
+    (the last one is served again when they run out).
+    Each call takes the recorded duration multiplied by ``time_scale``
+    (``0`` to serve the responses immediately).
+    Recorded errors are raised as ``exc.NotionAPIError``.
+    """
+
+    _path: str = attr.ib(kw_only=True)
+    _scrub_keys: frozenset[str] = attr.ib(kw_only=True, default=DEFAULT_SCRUB_KEYS)
+    _time_scale: float = attr.ib(kw_only=True, default=1.0)
+    _sleep: Callable[[float], Any] = attr.ib(kw_only=True, default=time.sleep)
+    # request key -> records
+    _records: dict[str, deque[dict]] = attr.ib(init=False, factory=dict)
+    _lock: threading.Lock = attr.ib(init=False, factory=threading.Lock)
+
+    def __attrs_post_init__(self) -> None:
+        for record in iter_records(self._path):
+            key = _get_request_key(record['endpoint'], record['request'])
+            if 'response' in record:
+                # Responses are decoded on every replay, as an HTTP client would do
+                record['response'] = json.dumps(record['response'])
+            self._records.setdefault(key, deque()).append(record)
+
+    @property
+    def endpoints(self) -> list[str]:
+        return sorted({records[0]['endpoint'] for records in self._records.values()})
+
+    def _get_record(self, endpoint: str, request: dict) -> dict:
+        request = scrub(request, self._scrub_keys)
+        key = _get_request_key(endpoint, request)
+        with self._lock:
+            records = self._records.get(key)
+            if records is None:
+                raise LookupError(f'No recorded response for {endpoint} with {request!r}')
+            return records.popleft() if len(records) > 1 else records[0]
+
+    def replay(self, endpoint: str, **kwargs: Any) -> dict:
+        record = self._get_record(endpoint, kwargs)
+        if self._time_scale > 0 and record['duration'] > 0:
+            self._sleep(record['duration'] * self._time_scale)
+        if 'error' in record:
+            error = record['error']
+            raise NotionAPIError(error['status'], error['code'], error['message'])
+        return json.loads(record['response'])
+
+    def make_fetch(self, endpoint: str) -> Callable[..., dict]:
+        """Return a callable that can be used instead of the one recorded as ``endpoint``"""
+
+        def fetch(**kwargs: Any) -> dict:
+            return self.replay(endpoint, **kwargs)
+
+        return fetch
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, Optional, Type, TypeVar
+
+from basic_notion.base import NotionItemBase
+from basic_notion.field import NotionField
+from basic_notion.utils import get_from_dict
+
+
+_ITEM_TV = TypeVar('_ITEM_TV', bound=NotionItemBase)
+
+
+class _ReusedFieldDescriptor:
+    """
+    Wraps a ``NotionField`` of a view class.
+    The property object is created on first access and then
+    re-pointed at the view's current data on subsequent accesses.
+    """
+
+    __slots__ = ('__field', '__name')
+
+    def __init__(self, field: NotionField) -> None:
+        self.__field = field
+        self.__name: Optional[str] = None
+
+    def get_field(self) -> NotionField:
+        return self.__field
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.__name = name
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self.__field.__get__(None, owner)
+
+        cache = instance._field_cache
+        value = cache.get(self.__name)
+        if value is None:
+            value = self.__field.__get__(instance, owner)
+            cache[self.__name] = value
+        else:
+            value._data = get_from_dict(instance.data, self.__field.key)
+        return value
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        self.__field.__set__(instance, value)
+
+
+_VIEW_CLS_CACHE: dict[type, type] = {}
+# view class -> item class
+_VIEW_BASE_CLS: dict[type, type] = {}
+
+
+def get_view_base_cls(cls: type) -> type:
+    """Return the item class of a view class (see ``get_view_cls``). Other classes are returned as is"""
+
+    return _VIEW_BASE_CLS.get(cls, cls)
+
+
+def get_view_cls(item_cls: Type[_ITEM_TV]) -> Type[_ITEM_TV]:
+    """
+    Return a subclass of ``item_cls`` whose instances can be re-pointed
+    at different raw data dicts and re-use their property objects.
+    """
+
+    if item_cls in _VIEW_CLS_CACHE:
+        return _VIEW_CLS_CACHE[item_cls]  # type: ignore
+
+    dct: dict[str, Any] = {
+        '__slots__': ('_field_cache',),
+        '__module__': item_cls.__module__,
+        '__qualname__': f'{item_cls.__qualname__}View',
+    }
+    for name, field in item_cls.__notion_layout__.fields.items():
+        dct[name] = _ReusedFieldDescriptor(field)
+
+    metaclass: Any = type(item_cls)
+    view_cls = metaclass(f'{item_cls.__name__}View', (item_cls,), dct)
+    _VIEW_CLS_CACHE[item_cls] = view_cls
+    _VIEW_BASE_CLS[view_cls] = item_cls
+    return view_cls  # type: ignore
+
+
+def iter_views(item_cls: Type[_ITEM_TV], data_items: Iterable[dict]) -> Iterator[_ITEM_TV]:
+    """
+    Iterate over raw item data yielding the same view object
+    (an instance of ``item_cls``'s view class) re-pointed at each item in turn.
+
+    The yielded object (and the property objects returned by its fields)
+    is only valid until the next iteration step,
+    so it must not be stored or used after that.
+    """
+
+    view = get_view_cls(item_cls)()
+    view._field_cache = {}  # type: ignore
+    for data in data_items:
+        view._data = data
+        yield view
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import attr
+
+from basic_notion.executor import is_retryable_error
+from basic_notion.page import NotionPage
+from basic_notion.telemetry import get_telemetry
+from basic_notion.utils import get_from_dict, set_to_dict
+
+
+DEFAULT_MAX_PAGES = 50
+DEFAULT_MAX_DELAY = 1.0
+DEFAULT_MAX_ATTEMPTS = 5
+
+# Types of properties that are computed by Notion and can't be updated
+READ_ONLY_PROPERTY_TYPES = frozenset((
+    'formula', 'rollup', 'created_time', 'created_by',
+    'last_edited_time', 'last_edited_by', 'unique_id',
+))
+
+# Should accept ``page_id`` and the update payload as keyword arguments,
+# for instance, ``notion_client.Client().pages.update``
+UPDATE_PAGE_TYPE = Callable[..., Any]
+
+
+def make_page_update_payload(page: NotionPage, names: tuple[str, ...] = ()) -> dict:
+    """
+    Make the payload for updating the page.
+
+    ``names`` are names of the model's fields and editable attributes (e.g. ``archived``)
+    to include in the payload. If no names are given, all of the model's fields
+    that are present in the page's data are included, except read-only ones
+    (see ``READ_ONLY_PROPERTY_TYPES``).
+    """
+
+    page_cls = type(page)
+    data = page.data
+    layout = page_cls.__notion_layout__
+    schema = layout.schema
+    properties_data = data.get('properties', {})
+    if not names:
+        properties: dict[str, dict] = {}
+        for _, prop_sch in schema.items():
+            prop_data = properties_data.get(prop_sch.property_name)
+            if prop_data is not None and prop_data.get('type') not in READ_ONLY_PROPERTY_TYPES:
+                properties[prop_sch.property_name] = prop_data
+        return {'properties': properties}
+
+    payload: dict[str, Any] = {}
+    editable_keys = layout.editable_keys
+    for name in names:
+        if name in schema:
+            property_name = schema[name].property_name
+            prop_data = properties_data[property_name]
+            if prop_data.get('type') in READ_ONLY_PROPERTY_TYPES:
+                raise ValueError(f'Property {property_name!r} of type {prop_data["type"]!r} is read-only')
+            payload.setdefault('properties', {})[property_name] = prop_data
+        elif name in editable_keys:
+            key = editable_keys[name]
+            set_to_dict(payload, key, get_from_dict(data, key))
+        else:
+            raise KeyError(f'{page_cls.__name__} has no field or editable attribute {name!r}')
+    return payload
+
+
+def _merge_payloads(target: dict, payload: dict) -> None:
+    """Merge ``payload`` into ``target``. Properties are merged one by one, later values win"""
+
+    for key, value in payload.items():
+        if key == 'properties' and key in target:
+            target[key].update(value)
+        else:
+            target[key] = dict(value) if key == 'properties' else value
+
+
+@attr.s(slots=True)
+class _PendingUpdate:
+    payload: dict = attr.ib(kw_only=True, factory=dict)
+    pages: list[NotionPage] = attr.ib(kw_only=True, factory=list)
+    # Time of the first change
+    created: float = attr.ib(kw_only=True)
+    # Number of failed attempts to send the update
+    failures: int = attr.ib(kw_only=True, default=0)
+
+
+@attr.s(slots=True, frozen=True)
+class FlushResult:
+    persisted: list[NotionPage] = attr.ib(kw_only=True, factory=list)
+    # page id -> error
+    failed: dict[str, Exception] = attr.ib(kw_only=True, factory=dict)
+    request_count: int = attr.ib(kw_only=True, default=0)
+
+
+@attr.s(slots=True)
+class PageWriteQueue:
+    """
+    Write-behind queue of page updates.
+
+    Changes of the same page made before the queue is flushed
+    are merged into a single ``update(page_id=..., **payload)`` request.
+    The queue is flushed when it contains ``max_pages`` pages,
+    when its oldest change is ``max_delay`` seconds old
+    (checked when changes are added and by the background thread, see ``start``)
+    or when ``flush`` is called.
+    Results of automatic flushes are passed to ``on_flush``.
+
+    Failed updates are reported in ``FlushResult.failed``.
+    If the error is transient (``is_retryable(err)``, e.g. 429 or 5xx),
+    the update is put back into the queue (changes made since then take precedence),
+    so it is retried by the next flush, up to ``max_attempts`` attempts in total.
+    Other updates (e.g. rejected with a 400 ``validation_error``) are dropped,
+    as are all of the failed updates if ``requeue_failed`` is ``False``;
+    they are lost unless they are handled in ``on_flush``.
+
+    Usage::
+
+        with PageWriteQueue(update=client.pages.update) as queue:
+            page.archived = True
+            queue.add(page, 'archived')
+    """
+
+    _update: UPDATE_PAGE_TYPE = attr.ib(kw_only=True)
+    _max_pages: int = attr.ib(kw_only=True, default=DEFAULT_MAX_PAGES)
+    _max_delay: float = attr.ib(kw_only=True, default=DEFAULT_MAX_DELAY)
+    _on_flush: Optional[Callable[[FlushResult], None]] = attr.ib(kw_only=True, default=None)
+    _requeue_failed: bool = attr.ib(kw_only=True, default=True)
+    _is_retryable: Callable[[BaseException], bool] = attr.ib(kw_only=True, default=is_retryable_error)
+    _max_attempts: int = attr.ib(kw_only=True, default=DEFAULT_MAX_ATTEMPTS)
+    _clock: Callable[[], float] = attr.ib(kw_only=True, default=time.monotonic)
+    # page id -> pending update
+    _pending: dict[str, _PendingUpdate] = attr.ib(init=False, factory=dict)
+    _lock: threading.Lock = attr.ib(init=False, factory=threading.Lock)
+    # Serializes flushes, so that updates of a page are sent in order
+    _flush_lock: threading.Lock = attr.ib(init=False, factory=threading.Lock)
+    _stop_event: threading.Event = attr.ib(init=False, factory=threading.Event)
+    _thread: Optional[threading.Thread] = attr.ib(init=False, default=None)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, page: NotionPage, *names: str) -> None:
+        """Schedule an update of the page (see ``make_page_update_payload`` for ``names``)"""
+
+        payload = make_page_update_payload(page, names)
+        with self._lock:
+            pending = self._pending.get(page.id)
+            if pending is None:
+                pending = self._pending[page.id] = _PendingUpdate(created=self._clock())
+            _merge_payloads(pending.payload, payload)
+            if not any(queued_page is page for queued_page in pending.pages):
+                pending.pages.append(page)
+            is_due = self._is_due()
+
+        if is_due:
+            self._auto_flush()
+
+    def _is_due(self) -> bool:
+        if len(self._pending) >= self._max_pages:
+            return True
+        oldest = min((pending.created for pending in self._pending.values()), default=None)
+        return oldest is not None and self._clock() - oldest >= self._max_delay
+
+    def flush_if_due(self) -> Optional[FlushResult]:
+        with self._lock:
+            is_due = self._is_due()
+        return self._auto_flush() if is_due else None
+
+    def _auto_flush(self) -> FlushResult:
+        result = self.flush()
+        if self._on_flush is not None:
+            self._on_flush(result)
+        return result
+
+    def flush(self) -> FlushResult:
+        """Send all pending updates and return the pages that were persisted"""
+
+        with self._flush_lock:
+            with self._lock:
+                pending_updates, self._pending = self._pending, {}
+
+            persisted: list[NotionPage] = []
+            failed: dict[str, Exception] = {}
+            telemetry = get_telemetry()
+            for page_id, pending in pending_updates.items():
+                database_id = (pending.pages[0].data.get('parent') or {}).get('database_id')
+                try:
+                    with telemetry.request('pages.update', database_id=database_id):
+                        self._update(page_id=page_id, **pending.payload)
+                except Exception as err:
+                    failed[page_id] = err
+                    pending.failures += 1
+                    if self._should_requeue(err, pending):
+                        self._requeue(page_id, pending)
+                else:
+                    persisted.extend(pending.pages)
+
+        return FlushResult(persisted=persisted, failed=failed, request_count=len(pending_updates))
+
+    def _should_requeue(self, err: Exception, pending: _PendingUpdate) -> bool:
+        return self._requeue_failed and pending.failures < self._max_attempts and self._is_retryable(err)
+
+    def _requeue(self, page_id: str, failed: _PendingUpdate) -> None:
+        """Put a failed update back into the queue under the changes made since the flush started"""
+
+        with self._lock:
+            newer = self._pending.get(page_id)
+            if newer is not None:
+                _merge_payloads(failed.payload, newer.payload)
+                failed.pages.extend(
+                    page for page in newer.pages
+                    if not any(failed_page is page for failed_page in failed.pages)
+                )
+            # Wait for another ``max_delay`` before retrying
+            failed.created = newer.created if newer is not None else self._clock()
+            self._pending[page_id] = failed
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._max_delay / 2):
+            self.flush_if_due()
+
+    def start(self) -> None:
+        """Start a background thread that flushes the queue when the oldest change is due"""
+
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='PageWriteQueue', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> FlushResult:
+        """Stop the background thread and flush the remaining updates"""
+
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        return self._auto_flush()
+
+    def __enter__(self) -> PageWriteQueue:
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
@@ -0,0 +1,117 @@
+import copy
+import uuid
+from typing import Optional
+
+
+def make_text_data(content: str, bold: bool = False) -> dict:
+    return {
+        'type': 'text',
+        'text': {'content': content, 'link': None},
+        'annotations': {
+            'bold': bold, 'italic': False, 'strikethrough': False,
+            'underline': False, 'code': False, 'color': 'default',
+        },
+        'plain_text': content,
+        'href': None,
+    }
+
+
+def make_reading_list_item_data(
+        name: str, type: str = 'Book',
+        authors: tuple[str, ...] = ('John Doe',),
+        page_id: Optional[str] = None,
+) -> dict:
+    """Raw page data (as returned by the API) for ``tests.models.ReadingListItem``"""
+
+    return {
+        'object': 'page',
+        'id': page_id or str(uuid.uuid4()),
+        'created_time': '2021-11-05T12:00:00.000Z',
+        'last_edited_time': '2021-11-05T12:30:00.000Z',
+        'archived': False,
+        'cover': None,
+        'icon': None,
+        'url': 'https://www.notion.so/page',
+        'parent': {'type': 'database_id', 'database_id': str(uuid.uuid4())},
+        'properties': {
+            'Type': {
+                'id': 'type', 'type': 'select',
+                'select': {'id': str(uuid.uuid4()), 'name': type, 'color': 'blue'},
+            },
+            'Name': {
+                'id': 'title', 'type': 'title',
+                'title': [make_text_data(name)],
+            },
+            'Status': {
+                'id': 'stat', 'type': 'select',
+                'select': {'id': str(uuid.uuid4()), 'name': 'Done', 'color': 'green'},
+            },
+            'Author': {
+                'id': 'auth', 'type': 'multi_select',
+                'multi_select': [
+                    {'id': str(uuid.uuid4()), 'name': author, 'color': 'red'}
+                    for author in authors
+                ],
+            },
+        },
+    }
+
+
+def make_reading_list_data(names: list[str]) -> dict:
+    """Raw query response data for ``tests.models.ReadingList``"""
+
+    return {
+        'object': 'list',
+        'results': [make_reading_list_item_data(name=name) for name in names],
+        'next_cursor': None,
+        'has_more': False,
+    }
+
+
+def make_block_data(
+        block_type: str, text: str = '', block_id: Optional[str] = None,
+        has_children: bool = False, **extra,
+) -> dict:
+    """Raw block data (as returned by the API)"""
+
+    return {
+        'object': 'block',
+        'id': block_id or str(uuid.uuid4()),
+        'created_time': '2021-11-05T12:00:00.000Z',
+        'last_edited_time': '2021-11-05T12:30:00.000Z',
+        'archived': False,
+        'has_children': has_children,
+        'type': block_type,
+        block_type: {'text': [make_text_data(text)] if text else [], **extra},
+    }
+
+
+class BlockChildrenStore:
+    """In-memory storage of block children with an API-like paginated ``list`` method"""
+
+    def __init__(self, page_size: int = 2) -> None:
+        self.page_size = page_size
+        self.children: dict[str, list[dict]] = {}
+        self.blocks: dict[str, dict] = {}
+        self.request_count = 0
+
+    def add(self, parent_id: str, block_type: str = 'paragraph', text: str = '', **extra) -> dict:
+        block_data = make_block_data(block_type, text=text, **extra)
+        self.children.setdefault(parent_id, []).append(block_data)
+        self.blocks[block_data['id']] = block_data
+        if parent_id in self.blocks:
+            self.blocks[parent_id]['has_children'] = True
+        return block_data
+
+    def list(self, block_id: str, start_cursor: Optional[str] = None) -> dict:
+        self.request_count += 1
+        children = self.children.get(block_id, [])
+        start = int(start_cursor) if start_cursor else 0
+        end = start + self.page_size
+        return {
+            'object': 'list',
+            # Copied, as if it was decoded from a response
+            'results': copy.deepcopy(children[start:end]),
+            'has_more': end < len(children),
+            'next_cursor': str(end) if end < len(children) else None,
+        }
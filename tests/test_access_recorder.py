@@ -0,0 +1,108 @@
+import pytest
+
+from basic_notion.access_recorder import FieldAccessRecorder
+from basic_notion.attr import ItemAttrDescriptor
+from basic_notion.database import NotionDatabase
+from basic_notion.field import NotionField
+from basic_notion import instrumentation
+from basic_notion.instrumentation import instrument
+from basic_notion.query import Query
+
+from tests.data import make_reading_list_data
+from tests.models import ReadingList, ReadingListItem
+
+
+def test_field_access_recorder():
+    original_get = NotionField.__dict__['__get__']
+    page_list = ReadingList(data=make_reading_list_data(['First', 'Second', 'Third']))
+
+    with FieldAccessRecorder() as recorder:
+        for item in page_list.items():
+            item.name.get_text()
+            item.id
+            if item.type.name == 'Book':
+                item.authors.get_text()
+        # Class-level access is not a read of page data
+        ReadingListItem.status
+
+    assert NotionField.__dict__['__get__'] is original_get
+    assert recorder.get_field_counts(ReadingListItem) == {'Type': 3, 'Name': 3, 'Status': 0, 'Author': 3}
+    assert recorder.get_projection(ReadingListItem) == ['Type', 'Name', 'Author']
+    assert recorder.get_unused_fields(ReadingListItem) == ['Status']
+    assert recorder.get_attr_counts(ReadingListItem)['id'] == 3
+
+    query = recorder.apply(Query.database('database'), ReadingListItem)
+    assert query.serialize()['filter_properties'] == ['Type', 'Name', 'Author']
+
+    report = recorder.report()
+    assert report['ReadingListItem']['unused_fields'] == ['Status']
+    assert 'projection: Type, Name, Author' in recorder.format_report()
+
+
+def test_field_access_recorder_with_instrumentation():
+    original_get = ItemAttrDescriptor.__dict__['__get__']
+    page_list = ReadingList(data=make_reading_list_data(['First']))
+    with instrument() as stats:
+        with FieldAccessRecorder() as recorder:
+            page_list.items()[0].id
+    assert ItemAttrDescriptor.__dict__['__get__'] is original_get
+    assert recorder.get_attr_counts(ReadingListItem) == {'id': 1}
+    assert stats.get('attr_get', 'ReadingListItem', 'id').calls == 1
+
+
+def test_field_access_recorder_cursor():
+    page_list = ReadingList(data=make_reading_list_data(['First', 'Second', 'Third']))
+    database = NotionDatabase(data={'object': 'database', 'id': 'db', 'title': [], 'properties': {}})
+
+    with FieldAccessRecorder() as recorder:
+        for item in page_list.cursor():
+            item.name.get_text()
+            item.id
+        # Not a page model
+        database.id
+
+    # Every read is counted under the model, not its view class
+    assert recorder.get_field_counts(ReadingListItem) == {'Type': 0, 'Name': 3, 'Status': 0, 'Author': 0}
+    assert recorder.get_attr_counts(ReadingListItem) == {'id': 3}
+    assert recorder.models == [ReadingListItem]
+
+
+def test_field_access_recorder_empty_projection():
+    page_list = ReadingList(data=make_reading_list_data(['First']))
+    with FieldAccessRecorder() as recorder:
+        page_list.items()[0].id
+
+    with pytest.raises(ValueError):
+        recorder.get_projection(ReadingListItem)
+    with pytest.raises(ValueError):
+        recorder.apply(Query.database('database'), ReadingListItem)
+    assert recorder.report()['ReadingListItem']['projection'] == []
+
+
+def test_field_access_recorder_with_instrumentation_out_of_order():
+    original_get = ItemAttrDescriptor.__dict__['__get__']
+    page_list = ReadingList(data=make_reading_list_data(['First']))
+
+    # The recorder is started first and stopped last
+    recorder = FieldAccessRecorder()
+    recorder.start()
+    stats = instrumentation.install()
+    page_list.items()[0].id
+    recorder.stop()
+    page_list.items()[0].id
+    instrumentation.uninstall()
+    assert ItemAttrDescriptor.__dict__['__get__'] is original_get
+    assert recorder.get_attr_counts(ReadingListItem) == {'id': 1}
+    assert stats.get('attr_get', 'ReadingListItem', 'id').calls == 2
+
+    # The instrumentation is installed first and uninstalled first
+    stats = instrumentation.install()
+    recorder = FieldAccessRecorder()
+    recorder.start()
+    instrumentation.uninstall()
+    assert not instrumentation.is_installed()
+    page_list.items()[0].id
+    recorder.stop()
+    assert ItemAttrDescriptor.__dict__['__get__'] is original_get
+    assert recorder.get_attr_counts(ReadingListItem) == {'id': 1}
+    assert stats.get('attr_get', 'ReadingListItem', 'id').calls == 0
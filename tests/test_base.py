@@ -0,0 +1,49 @@
+from basic_notion.attr import ItemAttrDescriptor
+from basic_notion.base import NotionItemBase
+from basic_notion.property import DateProperty, SelectProperty
+from basic_notion.utils import serialize_date
+
+from tests.models import ReadingListItem
+
+
+class Item(NotionItemBase):
+    id: ItemAttrDescriptor[str] = ItemAttrDescriptor()
+    name: ItemAttrDescriptor[str] = ItemAttrDescriptor(key=('inner', 'name'), editable=True)
+    color: ItemAttrDescriptor[str] = ItemAttrDescriptor(derived=True)
+
+
+class SubItem(Item):
+    # Override editable attribute with a non-editable one
+    name: ItemAttrDescriptor[str] = ItemAttrDescriptor(key=('inner', 'name'))
+    size: ItemAttrDescriptor[int] = ItemAttrDescriptor(editable=True)
+
+
+def test_layout_keys():
+    assert Item.attr_keys == {'id': ('id',), 'name': ('inner', 'name'), 'color': ('color',)}
+    assert Item.editable_keys == {'name': ('inner', 'name')}
+    assert Item.derived_keys == {'color': ('color',)}
+
+    assert set(SubItem.attr_keys) == {'id', 'name', 'color', 'size'}
+    assert SubItem.editable_keys == {'size': ('size',)}
+    assert SubItem.derived_keys == {'color': ('color',)}
+
+
+def test_layout_converters():
+    layout = DateProperty.__notion_layout__
+    assert layout.set_converters == {'start': serialize_date, 'end': serialize_date}
+
+
+def test_layout_schema():
+    layout = ReadingListItem.__notion_layout__
+    assert set(layout.fields) == {'type', 'name', 'status', 'authors'}
+    assert ReadingListItem.schema is layout.schema
+    assert layout.schema['authors'].property_name == 'Author'
+
+
+def test_make_and_clear_derived_attrs():
+    item = Item.make(name='Name', color='red')
+    assert item.data == {'inner': {'name': 'Name'}}
+
+    prop = SelectProperty(data={'type': 'select', 'select': {'id': '1', 'name': 'A', 'color': 'red'}})
+    prop.name = 'B'
+    assert prop.data == {'type': 'select', 'select': {'name': 'B'}}
@@ -0,0 +1,61 @@
+from basic_notion.testing.fake_api import FakeNotionAPI
+from basic_notion.traffic import TrafficRecorder
+
+from benchmarks import bench_memory, bench_micro, bench_replay, bench_scenarios
+from benchmarks.runner import compare, measure, run_benchmarks
+
+
+def test_micro_benchmarks_run():
+    benchmarks = bench_micro.make_benchmarks()
+    assert len(benchmarks) > 20
+    for func in benchmarks.values():
+        func()
+
+
+def test_runner():
+    result = measure(lambda: None, repeat=2, min_time=0.001)
+    assert result['min_us'] <= result['median_us']
+    assert result['number'] >= 1
+
+    current = run_benchmarks({'a': lambda: None, 'b': lambda: None}, repeat=1, min_time=0.001, name_filter='a')
+    assert list(current['results']) == ['a']
+    baseline = {'results': {'a': {**current['results']['a'], 'min_us': current['results']['a']['min_us'] / 2}}}
+    assert abs(compare(current, baseline)['a'] - 1.0) < 1e-9
+
+
+def test_scenario_benchmarks_run():
+    for name in bench_scenarios.SCENARIOS:
+        result = bench_scenarios.run_scenario(name, size=120, trace_allocations=True)
+        assert result['items'] == 120
+        assert result['requests'] > 0
+        assert result['latency_p50_ms'] <= result['latency_p99_ms']
+        assert result['peak_rss_mb'] > 0
+        assert result['traced_peak_mb'] > 0
+
+
+def test_replay_benchmarks_run(tmp_path):
+    path = str(tmp_path / 'traffic.jsonl.gz')
+    api = FakeNotionAPI()
+    database_id = api.create_database(parent={'page_id': 'root'}, properties={'Name': {'title': {}}})['id']
+    for idx in range(150):
+        api.create_page(parent={'database_id': database_id}, properties={
+            'Name': {'title': [{'type': 'text', 'text': {'content': f'Page {idx}'}}]},
+        })
+    with TrafficRecorder(path=path) as recorder:
+        query = recorder.wrap(api.databases.query, endpoint='databases.query')
+        next_cursor = query(database_id=database_id)['next_cursor']
+        query(database_id=database_id, start_cursor=next_cursor)
+
+    benchmarks = bench_replay.make_benchmarks(path)
+    assert len(benchmarks) == 3
+    for func in benchmarks.values():
+        result = func()
+        assert isinstance(result, list) and len(result) in (2, 150)
+
+
+def test_memory_benchmarks_run():
+    result = bench_memory.measure_size(150)
+    assert result['page_count'] == 150
+    assert result['traced_bytes_per_page'] > 0
+    assert abs(result['bytes_per_page'] / result['traced_bytes_per_page'] - 1) < 0.2
+    assert bench_memory.compare({'results': [result]}, {'results': [result]}) == {'150': 0.0}
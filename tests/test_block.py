@@ -1,14 +1,20 @@
 import abc
 from typing import ClassVar, Type
 
+import pytest
+
+from basic_notion import block as block_module, exc
 from basic_notion.block import (
     NotionBlock, ParagraphBlock,
     Heading1Block, Heading2Block, Heading3Block,
     CalloutBlock, BulletedListItemBlock, NumberedListItemBlock,
     ToDoBlock, ToggleBlock, CodeBlock,
-    ChildPageBlock, ChildDatabaseBlock,
+    ChildPageBlock, ChildDatabaseBlock, GenericBlock,
+    get_block_cls, decode_block, decode_blocks,
 )
 
+from tests.data import make_block_data
+
 
 def test_nested_blocks(sync_client, titled_page):
     page = titled_page
@@ -194,3 +200,56 @@ class ChildPageBlockBlock(BaseTestBlock):
 
     def check_updated_block(self, block: ChildPageBlock) -> None:
         assert block.title == 'New text'
+
+
+def test_block_registry():
+    assert get_block_cls('paragraph') is ParagraphBlock
+    assert get_block_cls('heading_1') is Heading1Block
+    assert get_block_cls('to_do') is ToDoBlock
+    assert get_block_cls('child_page') is ChildPageBlock
+    assert get_block_cls('some_new_type') is GenericBlock
+
+
+def test_block_registry_duplicates(monkeypatch):
+    # Keep the classes defined here out of the global registry
+    monkeypatch.setattr(block_module, '_BLOCK_CLS_REGISTRY', dict(block_module._BLOCK_CLS_REGISTRY))
+
+    with pytest.warns(exc.DuplicateBlockTypeWarning):
+        class MyParagraphBlock(NotionBlock):
+            BLOCK_TYPE_STR = 'paragraph'
+
+    assert get_block_cls('paragraph') is MyParagraphBlock
+
+    class MyEquationBlock(NotionBlock):
+        BLOCK_TYPE_STR = 'test_equation'
+        OVERRIDE_BLOCK_TYPE = True
+
+    # Re-definition in the same module (as on reload)
+    class MyOtherEquationBlock(NotionBlock):
+        BLOCK_TYPE_STR = 'test_equation'
+
+    assert get_block_cls('test_equation') is MyOtherEquationBlock
+
+
+def test_block_registry_is_restored():
+    assert get_block_cls('paragraph') is ParagraphBlock
+    assert get_block_cls('test_equation') is GenericBlock
+
+
+def test_decode_blocks():
+    raw_blocks = [
+        make_block_data('paragraph', text='Paragraph'),
+        make_block_data('code', text='print()', language='python'),
+        make_block_data('to_do', text='Do it', checked=True),
+        make_block_data('equation', expression='e=mc^2'),
+    ]
+    block = decode_block(raw_blocks[0])
+    assert isinstance(block, ParagraphBlock)
+    assert block.text.get_text() == 'Paragraph'
+
+    blocks = decode_blocks(raw_blocks)
+    assert [type(block) for block in blocks] == [ParagraphBlock, CodeBlock, ToDoBlock, GenericBlock]
+    assert blocks[1].language == 'python'
+    assert blocks[2].checked is True
+    assert blocks[3].type == 'equation'
+    assert blocks[3]._custom_data['expression'] == 'e=mc^2'
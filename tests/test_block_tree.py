@@ -0,0 +1,87 @@
+import asyncio
+
+from basic_notion.block import Heading1Block, ToggleBlock, BulletedListItemBlock
+from basic_notion.block_tree import fetch_block_tree, fetch_block_tree_async
+
+from tests.data import BlockChildrenStore
+
+
+def _make_store() -> BlockChildrenStore:
+    store = BlockChildrenStore(page_size=2)
+    heading = store.add('page', 'heading_1', text='Title')
+    for i in range(3):
+        store.add('page', 'paragraph', text=f'Paragraph {i}')
+    toggle = store.add('page', 'toggle', text='Toggle')
+    nested = store.add(toggle['id'], 'bulleted_list_item', text='Nested')
+    store.add(nested['id'], 'bulleted_list_item', text='Deeply nested')
+    child_page = store.add('page', 'child_page', title='Sub-page')
+    store.add(child_page['id'], 'paragraph', text='Sub-page content')
+    assert heading
+    return store
+
+
+def _get_texts(tree) -> list[tuple[int, str]]:
+    return [
+        (depth, (node.block.data[node.block.type]['text'] or [{}])[0].get('plain_text', ''))
+        for depth, node in tree.iter_nodes()
+    ]
+
+
+EXPECTED_TEXTS = [
+    (0, 'Title'), (0, 'Paragraph 0'), (0, 'Paragraph 1'), (0, 'Paragraph 2'),
+    (0, 'Toggle'), (1, 'Nested'), (2, 'Deeply nested'), (0, ''),
+]
+
+
+def test_fetch_block_tree():
+    store = _make_store()
+    tree = fetch_block_tree(store.list, root_id='page', max_concurrency=4)
+    assert tree.root_id == 'page'
+    assert len(tree) == 8
+    assert _get_texts(tree) == EXPECTED_TEXTS
+    # 3 pages for the root + 1 for each of the nested levels
+    assert store.request_count == 5
+
+    assert isinstance(tree.children[0].block, Heading1Block)
+    toggle_node = tree.children[4]
+    assert isinstance(toggle_node.block, ToggleBlock)
+    assert isinstance(toggle_node.children[0].block, BulletedListItemBlock)
+    assert toggle_node.children[0].block.text.get_text() == 'Nested'
+
+
+def test_fetch_block_tree_max_depth_and_child_pages():
+    store = _make_store()
+    tree = fetch_block_tree(store.list, root_id='page', max_depth=1)
+    assert len(tree) == 6
+
+    tree = fetch_block_tree(store.list, root_id='page', follow_child_pages=True)
+    assert len(tree) == 9
+
+
+def test_fetch_block_tree_async():
+    store = _make_store()
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fetch_children(**kwargs) -> dict:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(in_flight, max_in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return store.list(**kwargs)
+
+    tree = asyncio.run(fetch_block_tree_async(fetch_children, root_id='page', max_concurrency=1))
+    assert _get_texts(tree) == EXPECTED_TEXTS
+    assert max_in_flight == 1
+
+
+def test_deep_tree():
+    store = BlockChildrenStore(page_size=100)
+    parent_id = 'page'
+    for _ in range(2000):
+        parent_id = store.add(parent_id, 'toggle', text='Level')['id']
+
+    tree = fetch_block_tree(store.list, root_id='page')
+    depths = [depth for depth, _ in tree.iter_nodes()]
+    assert depths == list(range(2000))
@@ -0,0 +1,128 @@
+import uuid
+
+from basic_notion.bulk import (
+    STATUS_DONE, STATUS_FAILED, STATUS_PENDING, STATUS_UNKNOWN, BulkCreateJournal, bulk_create_pages,
+)
+from basic_notion.parent import ParentDatabase
+
+from tests.models import ReadingListItem
+
+
+class CreateError(Exception):
+    def __init__(self, status: int) -> None:
+        super().__init__(f'Status {status}')
+        self.status = status
+
+
+class FakeCreate:
+    def __init__(self, fail_on=(), error_status=None) -> None:
+        self.created: list[dict] = []
+        self.fail_on = set(fail_on)
+        self.error_status = error_status
+
+    def __call__(self, **page_data) -> dict:
+        name = page_data['properties']['Name']['title'][0]['text']['content']
+        if name in self.fail_on:
+            if self.error_status is not None:
+                raise CreateError(self.error_status)
+            raise RuntimeError(f'Failed to create {name}')
+        self.created.append(page_data)
+        return {'object': 'page', 'id': str(uuid.uuid4()), **page_data}
+
+
+PARENT = ParentDatabase.make(database_id=str(uuid.uuid4()))
+
+
+def _make_page_data(row: dict) -> dict:
+    return ReadingListItem.make(parent=PARENT, name=[row['name']]).data
+
+
+def _get_key(row: dict) -> str:
+    return row['name']
+
+
+def test_bulk_create_resumes(tmp_path):
+    rows = [{'name': f'Row {i}'} for i in range(20)]
+    journal_path = str(tmp_path / 'journal.sqlite')
+
+    create = FakeCreate(fail_on={'Row 5', 'Row 12'})
+    with BulkCreateJournal(path=journal_path) as journal:
+        stats = bulk_create_pages(rows, _make_page_data, create, journal=journal, get_key=_get_key, max_concurrency=3)
+    assert (stats.created, stats.failed, stats.skipped) == (18, 2, 0)
+    assert 'Row 12' in stats.errors['Row 12']
+
+    # The rerun only creates the failed rows (even if the order of the rows changes)
+    create = FakeCreate()
+    with BulkCreateJournal(path=journal_path) as journal:
+        stats = bulk_create_pages(reversed(rows), _make_page_data, create, journal=journal, get_key=_get_key)
+        assert (stats.created, stats.failed, stats.skipped) == (2, 0, 18)
+        assert [data['properties']['Name']['title'][0]['text']['content'] for data in create.created] == [
+            'Row 12', 'Row 5',
+        ]
+        assert journal.get_status('Row 5') == STATUS_DONE
+        assert len(journal.get_keys(STATUS_DONE)) == 20
+        assert len(journal.get_page_id('Row 19')) == 36
+
+
+def test_bulk_create_pending_rows(tmp_path):
+    rows = [{'name': 'First'}, {'name': 'Second'}]
+    with BulkCreateJournal(path=str(tmp_path / 'journal.sqlite')) as journal:
+        # As if the process crashed while the request was being sent
+        journal.mark_pending('First')
+        journal.mark_failed('Second', 'error')
+        assert journal.get_keys(STATUS_FAILED) == ['Second']
+
+        # Pending rows are not sent again by default, as their pages might exist
+        create = FakeCreate()
+        stats = bulk_create_pages(rows, _make_page_data, create, journal=journal, get_key=_get_key)
+        assert (stats.created, stats.skipped) == (1, 1)
+        assert journal.get_status('First') == STATUS_PENDING
+
+        # They can be reconciled with the existing pages
+        stats = bulk_create_pages(
+            rows, _make_page_data, create, journal=journal, get_key=_get_key,
+            find_existing=lambda row: 'existing-page-id',
+        )
+        assert (stats.created, stats.reconciled, stats.skipped) == (0, 1, 1)
+        assert journal.get_page_id('First') == 'existing-page-id'
+
+        journal.mark_pending('First')
+        stats = bulk_create_pages(
+            rows, _make_page_data, create, journal=journal, get_key=_get_key,
+            find_existing=lambda row: None,
+        )
+        assert (stats.created, stats.reconciled) == (1, 0)
+        assert journal.get_status('First') == STATUS_DONE
+
+        journal.mark_pending('First')
+        stats = bulk_create_pages(rows, _make_page_data, create, journal=journal, get_key=_get_key, retry_pending=True)
+        assert stats.created == 1
+
+
+def test_bulk_create_ambiguous_failures(tmp_path):
+    rows = [{'name': 'Timed out'}, {'name': 'Rejected'}]
+    with BulkCreateJournal(path=str(tmp_path / 'journal.sqlite')) as journal:
+        stats = bulk_create_pages(
+            rows[:1], _make_page_data, FakeCreate(fail_on=['Timed out'], error_status=504),
+            journal=journal, get_key=_get_key,
+        )
+        stats = bulk_create_pages(
+            rows[1:], _make_page_data, FakeCreate(fail_on=['Rejected'], error_status=400),
+            journal=journal, get_key=_get_key,
+        )
+        # The page might have been created despite the 504
+        assert journal.get_status('Timed out') == STATUS_UNKNOWN
+        assert journal.get_status('Rejected') == STATUS_FAILED
+
+        # Only the unambiguous failure is sent again without checks
+        create = FakeCreate()
+        stats = bulk_create_pages(rows, _make_page_data, create, journal=journal, get_key=_get_key)
+        assert (stats.created, stats.skipped) == (1, 1)
+        assert journal.get_status('Timed out') == STATUS_UNKNOWN
+
+        stats = bulk_create_pages(
+            rows, _make_page_data, create, journal=journal, get_key=_get_key,
+            find_existing=lambda row: 'existing-page-id',
+        )
+        assert stats.reconciled == 1
+        assert journal.get_page_id('Timed out') == 'existing-page-id'
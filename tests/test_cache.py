@@ -0,0 +1,132 @@
+from basic_notion.block import ParagraphBlock
+from basic_notion.block_tree import BlockTree
+from basic_notion.cache import (
+    BlockTreeCache, CacheEntry, DiskCacheBackend, MemoryCacheBackend, estimate_tree_size,
+)
+
+from tests.data import BlockChildrenStore
+
+
+def _make_store() -> tuple[BlockChildrenStore, dict]:
+    store = BlockChildrenStore(page_size=2)
+    store.add('page', 'heading_1', text='Title')
+    toggle = store.add('page', 'toggle', text='Toggle')
+    nested = store.add(toggle['id'], 'paragraph', text='Nested')
+    store.add(nested['id'], 'paragraph', text='Deeply nested')
+    store.add('page', 'paragraph', text='End')
+    return store, toggle
+
+
+def test_block_tree_cache_revalidation():
+    store, toggle = _make_store()
+    cache = BlockTreeCache(fetch_children=store.list)
+    tree = cache.get('page')
+    assert len(tree) == 5
+    assert cache.misses == 1
+    assert store.request_count == 4  # 2 pages of the root + 2 nested levels
+
+    # Nothing has changed: the cached tree is returned as is
+    store.request_count = 0
+    assert cache.get('page') is tree
+    assert cache.hits == 1
+    assert store.request_count == 4
+    assert cache.get('page', revalidate=False) is tree
+    assert store.request_count == 4
+
+    # Editing a nested block doesn't change its parent, but the edit is still picked up
+    nested = store.children[toggle['id']][0]
+    nested['last_edited_time'] = '2021-11-06T00:00:00.000Z'
+    nested['paragraph']['text'][0]['plain_text'] = 'Edited'
+    store.request_count = 0
+    toggle_block = tree.children[1].block
+    deeply_nested_node = tree.children[1].children[0].children[0]
+    tree = cache.get('page')
+    assert cache.misses == 2
+    assert store.request_count == 4
+    # Unchanged blocks are not decoded again
+    assert tree.children[1].block is toggle_block
+    assert tree.children[1].children[0].children[0] is deeply_nested_node
+    assert tree.children[1].children[0].block.text[0].plain_text == 'Edited'
+    assert len(tree) == 5
+
+
+class RecordingBackend(MemoryCacheBackend):
+    def __init__(self) -> None:
+        super().__init__()
+        self.stored: list[str] = []
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self.stored.append(key)
+        super().set(key, entry)
+
+
+def test_block_tree_cache_unchanged_tree_is_not_stored_again():
+    store, _ = _make_store()
+    backend = RecordingBackend()
+    cache = BlockTreeCache(fetch_children=store.list, backend=backend)
+    cache.get('page')
+    cache.get('page')
+    assert cache.hits == 1
+    assert backend.stored == ['page']
+
+
+def test_block_tree_cache_root_check():
+    store, _ = _make_store()
+    root_data = {'id': 'page', 'last_edited_time': '2021-11-05T12:30:00.000Z'}
+    cache = BlockTreeCache(fetch_children=store.list, fetch_block=lambda block_id: root_data)
+    tree = cache.get('page')
+    store.request_count = 0
+    assert cache.get('page') is tree
+    assert store.request_count == 0
+
+    root_data['last_edited_time'] = '2021-11-06T00:00:00.000Z'
+    store.add('page', 'paragraph', text='New')
+    assert len(cache.get('page')) == 6
+
+
+def _make_entry(text: str) -> CacheEntry:
+    store = BlockChildrenStore()
+    store.add('page', 'paragraph', text=text)
+    tree = BlockTreeCache(fetch_children=store.list).get('page')
+    return CacheEntry(tree=tree, size=estimate_tree_size(tree))
+
+
+def test_memory_cache_backend_lru():
+    entry_size = _make_entry('x').size
+    backend = MemoryCacheBackend(max_size=entry_size * 2)
+    for key in ('a', 'b'):
+        backend.set(key, _make_entry('x'))
+    assert backend.get('a') is not None  # "b" is now the least recently used
+    backend.set('c', _make_entry('x'))
+    assert backend.get('b') is None
+    assert backend.get('a') is not None
+    assert len(backend) == 2
+    assert backend.total_size == entry_size * 2
+
+
+def test_disk_cache_backend(tmp_path):
+    backend = DiskCacheBackend(directory=str(tmp_path))
+    backend.set('page-1', _make_entry('Cached'))
+    entry = DiskCacheBackend(directory=str(tmp_path)).get('page-1')
+    assert entry is not None
+    assert isinstance(entry.tree, BlockTree)
+    block = entry.tree.children[0].block
+    assert isinstance(block, ParagraphBlock)
+    assert block.text[0].plain_text == 'Cached'
+
+    file_size = backend.total_size
+    backend = DiskCacheBackend(directory=str(tmp_path), max_size=file_size * 2)
+    backend.set('page-2', _make_entry('Cached'))
+    backend.get('page-1')
+    backend.set('page-3', _make_entry('Cached'))
+    assert backend.get('page-2') is None
+    assert backend.get('page-1') is not None
+    assert len(backend) == 2
+    assert backend.total_size == sum(path.stat().st_size for path in tmp_path.iterdir())
+    backend.delete('page-3')
+    assert backend.total_size == file_size
+
+    backend.clear()
+    assert len(backend) == 0
+    assert backend.total_size == 0
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from basic_notion.block import ParagraphBlock
+from basic_notion.children import (
+    iter_children_batches, append_children_batches, append_children_batches_async,
+)
+
+
+def _make_blocks(count: int) -> list[ParagraphBlock]:
+    return [ParagraphBlock.make(text=[f'Paragraph {i}']) for i in range(count)]
+
+
+def test_iter_children_batches_by_count():
+    payloads = list(iter_children_batches('parent', _make_blocks(250)))
+    assert [len(payload['children']) for payload in payloads] == [100, 100, 50]
+    assert all(payload['block_id'] == 'parent' for payload in payloads)
+    texts = [
+        child['paragraph']['text'][0]['text']['content']
+        for payload in payloads for child in payload['children']
+    ]
+    assert texts == [f'Paragraph {i}' for i in range(250)]
+
+
+def test_iter_children_batches_by_size():
+    blocks = [ParagraphBlock.make(text=['x' * 1000]) for _ in range(10)]
+    payloads = list(iter_children_batches('parent', blocks, max_size=3500))
+    assert [len(payload['children']) for payload in payloads] == [3, 3, 3, 1]
+
+    with pytest.raises(ValueError):
+        list(iter_children_batches('parent', blocks, max_size=500))
+
+
+def test_iter_children_batches_nested_blocks():
+    block = ParagraphBlock.make(text=['Parent']).data
+    block['paragraph']['children'] = [b.data for b in _make_blocks(9)]
+    payloads = list(iter_children_batches('parent', [block] * 3, max_blocks=25))
+    assert [len(payload['children']) for payload in payloads] == [2, 1]
+
+
+def test_append_children_batches():
+    lock = threading.Lock()
+    in_flight: dict[str, int] = {}
+    max_in_flight = 0
+    appended: dict[str, list[str]] = {}
+
+    def append(block_id: str, children: list[dict]) -> dict:
+        nonlocal max_in_flight
+        with lock:
+            assert not in_flight.get(block_id), 'Concurrent appends to the same block'
+            in_flight[block_id] = 1
+            max_in_flight = max(max_in_flight, sum(in_flight.values()))
+        time.sleep(0.005)
+        with lock:
+            in_flight[block_id] = 0
+            appended.setdefault(block_id, []).extend(
+                child['paragraph']['text'][0]['text']['content'] for child in children)
+        return {'block_id': block_id, 'count': len(children)}
+
+    payloads = []
+    for parent in ('a', 'b', 'c'):
+        payloads.extend(iter_children_batches(parent, _make_blocks(30), max_blocks=10))
+
+    responses = list(append_children_batches(append, payloads, max_concurrency=2))
+    assert [response['block_id'] for response in responses] == ['a'] * 3 + ['b'] * 3 + ['c'] * 3
+    assert max_in_flight <= 2
+    for parent in ('a', 'b', 'c'):
+        assert appended[parent] == [f'Paragraph {i}' for i in range(30)]
+
+
+def test_append_children_batches_async():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def append(block_id: str, children: list[dict]) -> str:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(in_flight, max_in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return block_id
+
+    payloads = [
+        payload
+        for parent in ('a', 'b', 'c', 'd')
+        for payload in iter_children_batches(parent, _make_blocks(5))
+    ]
+
+    async def run() -> list[str]:
+        return [
+            response async for response in
+            append_children_batches_async(append, payloads, max_concurrency=3)
+        ]
+
+    assert asyncio.run(run()) == ['a', 'b', 'c', 'd']
+    assert max_in_flight == 3
@@ -0,0 +1,187 @@
+from basic_notion.block import BulletedListItemBlock, Heading1Block, ParagraphBlock, ToggleBlock
+from basic_notion.block_tree import BlockTree, BlockTreeNode, fetch_block_tree
+from basic_notion.diff import (
+    AppendBlocks, ArchiveBlock, UpdateBlock, diff_block_trees, get_block_content_hash,
+)
+
+from tests.data import BlockChildrenStore
+
+
+def _make_existing() -> BlockTree:
+    store = BlockChildrenStore()
+    store.add('page', 'heading_1', text='Title', color='default')
+    for i in range(3):
+        store.add('page', 'paragraph', text=f'Paragraph {i}')
+    toggle = store.add('page', 'toggle', text='Toggle')
+    store.add(toggle['id'], 'bulleted_list_item', text='Nested')
+    return fetch_block_tree(store.list, root_id='page')
+
+
+def _node(block, *children: BlockTreeNode) -> BlockTreeNode:
+    return BlockTreeNode(block=block, children=list(children))
+
+
+def _make_desired(paragraphs=('Paragraph 0', 'Paragraph 1', 'Paragraph 2'), nested='Nested') -> list[BlockTreeNode]:
+    return [
+        _node(Heading1Block.make(text=['Title'])),
+        *(_node(ParagraphBlock.make(text=[text])) for text in paragraphs),
+        _node(ToggleBlock.make(text=['Toggle']), _node(BulletedListItemBlock.make(text=[nested]))),
+    ]
+
+
+def test_content_hash():
+    existing = _make_existing()
+    assert (
+        get_block_content_hash(existing.children[1].block.data)
+        == get_block_content_hash(ParagraphBlock.make(text=['Paragraph 0']).data)
+    )
+    assert (
+        get_block_content_hash(existing.children[1].block.data)
+        != get_block_content_hash(Heading1Block.make(text=['Paragraph 0']).data)
+    )
+
+
+def test_diff_unchanged():
+    assert len(diff_block_trees(_make_existing(), _make_desired())) == 0
+
+
+def test_diff_update():
+    existing = _make_existing()
+    plan = diff_block_trees(existing, _make_desired(paragraphs=('Paragraph 0', 'Edited', 'Paragraph 2')))
+    assert len(plan) == 1
+    operation = plan.operations[0]
+    assert isinstance(operation, UpdateBlock)
+    assert operation.payload == {
+        'block_id': existing.children[2].id,
+        'paragraph': {'text': [{'type': 'text', 'text': {'content': 'Edited'}}]},
+    }
+
+    plan = diff_block_trees(existing, _make_desired(nested='Edited'))
+    assert len(plan) == 1
+    assert plan.operations[0].payload['block_id'] == existing.children[4].children[0].id
+
+
+def test_diff_append_and_archive():
+    existing = _make_existing()
+    plan = diff_block_trees(existing, _make_desired(paragraphs=('Paragraph 0', 'New', 'Paragraph 1')))
+    # Paragraph 2 is archived, the new one is appended after Paragraph 0
+    assert len(plan) == 2
+    appends = [op for op in plan if isinstance(op, AppendBlocks)]
+    archives = [op for op in plan if isinstance(op, ArchiveBlock)]
+    assert archives[0].block_id == existing.children[3].id
+    assert appends[0].payload['after'] == existing.children[1].id
+    assert appends[0].payload['children'][0]['paragraph']['text'][0]['text']['content'] == 'New'
+
+    # Nested blocks of new blocks are appended together with them
+    desired = [*_make_desired(), _node(ToggleBlock.make(text=['New']), _node(ParagraphBlock.make(text=['Child'])))]
+    plan = diff_block_trees(existing, desired)
+    assert len(plan) == 1
+    children = plan.operations[0].payload['children']
+    assert children[0]['toggle']['children'][0]['type'] == 'paragraph'
+
+
+def test_diff_insert_first():
+    existing = _make_existing()
+    desired = [_node(ParagraphBlock.make(text=['Intro'])), *_make_desired()]
+    plan = diff_block_trees(existing, desired)
+    # Blocks can't be inserted before the first child, so the first paragraph is turned into the new one,
+    # the heading before it is archived, and both are appended after it
+    assert [type(op) for op in plan] == [ArchiveBlock, UpdateBlock, AppendBlocks]
+    assert plan.operations[0].block_id == existing.children[0].id
+    assert plan.operations[1].block_id == existing.children[1].id
+    assert plan.operations[2].payload['after'] == existing.children[1].id
+    assert [block_data['type'] for block_data in plan.operations[2].payload['children']] == [
+        'heading_1', 'paragraph',
+    ]
+
+    # Prepending to a long list of blocks costs an update and an append
+    store = BlockChildrenStore()
+    for i in range(50):
+        store.add('page', 'paragraph', text=f'Paragraph {i}')
+    existing = fetch_block_tree(store.list, root_id='page')
+    desired = [_node(ParagraphBlock.make(text=[f'Paragraph {i}'])) for i in range(-1, 50)]
+    plan = diff_block_trees(existing, desired)
+    assert [type(op) for op in plan] == [UpdateBlock, AppendBlocks]
+    assert plan.operations[1].payload['after'] == existing.children[0].id
+
+    # All blocks are rewritten only if none of them can be turned into the first one
+    existing = _make_existing()
+    desired = [_node(BulletedListItemBlock.make(text=['Intro'])), *_make_desired()]
+    plan = diff_block_trees(existing, desired)
+    assert [type(op) for op in plan] == [ArchiveBlock] * 5 + [AppendBlocks]
+    assert len(plan.operations[-1].payload['children']) == 6
+
+
+def test_sync_plan_apply():
+    existing = _make_existing()
+    plan = diff_block_trees(existing, _make_desired(paragraphs=('Paragraph 0', 'Edited')))
+    calls = []
+    plan.apply(
+        update=lambda **kwargs: calls.append(('update', kwargs)),
+        append=lambda **kwargs: calls.append(('append', kwargs)),
+    )
+    assert calls == [
+        ('update', plan.operations[0].payload),
+        ('update', {'block_id': existing.children[3].id, 'archived': True}),
+    ]
+
+
+def test_sync_plan_apply_splits_appends():
+    existing = _make_existing()
+    deep = _node(ToggleBlock.make(text=['Level 0']))
+    node = deep
+    for level in range(1, 4):
+        child = _node(ToggleBlock.make(text=[f'Level {level}']))
+        node.children.append(child)
+        node = child
+    desired = [
+        _node(BulletedListItemBlock.make(text=['Intro'])),
+        *(_node(ParagraphBlock.make(text=[f'Paragraph {i}'])) for i in range(150)),
+        deep,
+    ]
+    plan = diff_block_trees(existing, desired)
+    # All blocks are rewritten in a single operation
+    assert len(plan.operations[-1].payload['children']) == 152
+
+    calls = []
+    created_count = 0
+
+    def append(block_id, children, after=None):
+        nonlocal created_count
+        calls.append((block_id, children, after))
+        results = []
+        for block_data in children:
+            created_count += 1
+            results.append({**block_data, 'id': f'created-{created_count}'})
+        return {'object': 'list', 'results': results}
+
+    responses = plan.apply(update=lambda **kwargs: None, append=append)
+    # 5 archived blocks and 3 append requests
+    assert len(responses) == 8
+    # Top-level blocks are split into batches of at most 100
+    assert [len(children) for _, children, _ in calls] == [100, 52, 1]
+    assert calls[0][0] == calls[1][0] == 'page'
+    # The nested toggles are too deep for a single request,
+    # so they are appended to the created block separately
+    assert calls[1][1][-1]['toggle'].get('children') is None
+    assert calls[2][0] == 'created-152'
+    nested = calls[2][1][0]
+    assert nested['toggle']['text'][0]['text']['content'] == 'Level 1'
+    assert nested['toggle']['children'][0]['toggle']['children'][0]['type'] == 'toggle'
+
+
+def test_sync_plan_apply_chains_after():
+    existing = _make_existing()
+    desired = _make_desired()
+    desired[1:1] = [_node(ParagraphBlock.make(text=[f'New {i}'])) for i in range(120)]
+    plan = diff_block_trees(existing, desired)
+    assert len(plan) == 1
+
+    calls = []
+
+    def append(block_id, children, after=None):
+        calls.append(after)
+        return {'results': [{'id': f'{after}-{idx}'} for idx in range(len(children))]}
+
+    plan.apply(update=lambda **kwargs: None, append=append)
+    assert calls == [existing.children[0].id, f'{existing.children[0].id}-99']
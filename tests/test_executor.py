@@ -0,0 +1,166 @@
+import asyncio
+import time
+
+import pytest
+
+from basic_notion.executor import (
+    RequestExecutor, get_retry_after, is_retryable_error, is_safely_retryable_error,
+)
+from basic_notion.ratelimit import TokenBucket
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status: int, headers=None) -> None:
+        super().__init__(f'Status {status}')
+        self.status = status
+        self.headers = headers or {}
+
+
+class StubCallable:
+    """Raises the given errors one by one, then returns the call's kwargs"""
+
+    def __init__(self, *errors: Exception) -> None:
+        self.errors = list(errors)
+        self.call_count = 0
+
+    def __call__(self, **kwargs):
+        self.call_count += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return kwargs
+
+
+def _make_executor(sleeps: list, **kwargs) -> RequestExecutor:
+    return RequestExecutor(
+        rate_limiter=TokenBucket(rate=1000), sleep=sleeps.append, random=lambda: 0.5, **kwargs,
+    )
+
+
+def test_executor_retries_with_backoff():
+    sleeps: list[float] = []
+    executor = _make_executor(sleeps, backoff_base=1.0)
+    stub = StubCallable(FakeAPIError(502), FakeAPIError(503))
+    assert executor.call(stub, page_id='123') == {'page_id': '123'}
+    assert stub.call_count == 3
+    assert sleeps == [0.5, 1.0]  # Jittered 1 and 2 seconds
+    assert executor.metrics.retries == 2
+    assert executor.metrics.calls == 1
+    assert executor.metrics.in_flight == executor.metrics.queue_depth == 0
+    assert len(executor.metrics.latencies) == 1
+
+
+def test_executor_retry_after():
+    assert get_retry_after(FakeAPIError(429, {'Retry-After': '2'})) == 2.0
+    sleeps: list[float] = []
+    executor = _make_executor(sleeps)
+    stub = StubCallable(FakeAPIError(429, {'Retry-After': '0.05'}))
+    started = time.monotonic()
+    assert executor.wrap(stub)(a=1) == {'a': 1}
+    # The wait is done by the shared rate limiter instead
+    assert time.monotonic() - started >= 0.05
+    assert sleeps == []
+    assert stub.call_count == 2
+    assert executor.metrics.rate_limited == 1
+
+
+def test_executor_gives_up():
+    sleeps: list[float] = []
+    executor = _make_executor(sleeps, max_retries=2)
+    stub = StubCallable(*(FakeAPIError(500) for _ in range(3)))
+    with pytest.raises(FakeAPIError):
+        executor.call(stub)
+    assert stub.call_count == 3
+    assert executor.metrics.failures == 1
+
+    # Errors that are not retryable are raised right away
+    stub = StubCallable(FakeAPIError(400))
+    with pytest.raises(FakeAPIError):
+        executor.call(stub)
+    assert stub.call_count == 1
+
+
+def test_executor_non_idempotent_calls():
+    sleeps: list[float] = []
+    executor = _make_executor(sleeps)
+
+    class Pages:
+        def __init__(self, *errors: Exception) -> None:
+            self.create = StubCallable(*errors)
+            self.create.__name__ = 'create'
+
+    # Creates are not repeated after errors that might have happened after the page was created
+    for status in (409, 500, 502, 504):
+        pages = Pages(FakeAPIError(status))
+        with pytest.raises(FakeAPIError):
+            executor.call(pages.create, parent={})
+        assert pages.create.call_count == 1
+
+    pages = Pages(TimeoutError())
+    with pytest.raises(TimeoutError):
+        executor.wrap(pages.create)()
+    assert pages.create.call_count == 1
+
+    pages = Pages(FakeAPIError(429), ConnectionRefusedError())
+    assert executor.call(pages.create, parent={}) == {'parent': {}}
+    assert pages.create.call_count == 3
+
+    # Unless the caller opts in
+    pages = Pages(FakeAPIError(502))
+    assert executor.wrap(pages.create, idempotent=True)(parent={}) == {'parent': {}}
+    assert pages.create.call_count == 2
+
+
+def test_executor_client_transport_errors():
+    httpx = pytest.importorskip('httpx')
+    notion_errors = pytest.importorskip('notion_client.errors')
+
+    # Connection failures of ``notion_client`` (not subclasses of the built-in exceptions)
+    for err in (httpx.ConnectError('Connection refused'), httpx.ConnectTimeout('Timed out')):
+        assert not isinstance(err, (ConnectionError, TimeoutError))
+        assert is_retryable_error(err)
+        assert is_safely_retryable_error(err)
+    # The request might have been processed
+    for err in (
+            notion_errors.RequestTimeoutError(), httpx.ReadTimeout('Timed out'),
+            httpx.ReadError('Connection reset'),
+    ):
+        assert is_retryable_error(err)
+        assert not is_safely_retryable_error(err)
+
+    sleeps: list[float] = []
+    executor = _make_executor(sleeps)
+    create = StubCallable(httpx.ConnectError('Connection refused'))
+    create.__name__ = 'create'
+    assert executor.call(create, parent={}) == {'parent': {}}
+    assert create.call_count == 2
+
+    create = StubCallable(notion_errors.RequestTimeoutError())
+    create.__name__ = 'create'
+    with pytest.raises(notion_errors.RequestTimeoutError):
+        executor.call(create, parent={})
+    assert create.call_count == 1
+
+    update = StubCallable(notion_errors.RequestTimeoutError(), httpx.ReadTimeout('Timed out'))
+    assert executor.call(update, page_id='123') == {'page_id': '123'}
+    assert update.call_count == 3
+
+
+def test_executor_async_concurrency():
+    sleeps: list[float] = []
+    executor = _make_executor(sleeps, max_concurrency=2)
+    max_in_flight = 0
+
+    async def request(idx: int) -> int:
+        nonlocal max_in_flight
+        max_in_flight = max(max_in_flight, executor.metrics.in_flight)
+        await asyncio.sleep(0.001)
+        return idx
+
+    async def run() -> list[int]:
+        return await asyncio.gather(*(executor.wrap_async(request)(idx) for idx in range(10)))
+
+    assert asyncio.run(run()) == list(range(10))
+    assert max_in_flight == 2
+    assert executor.metrics.max_queue_depth >= 8
+    assert executor.metrics.calls == 10
+    assert executor.metrics.latency_p50 <= executor.metrics.latency_p99
@@ -0,0 +1,92 @@
+import asyncio
+import json
+import os
+import threading
+
+from basic_notion.export import export_pages, export_pages_async
+from basic_notion.ratelimit import TokenBucket
+
+from tests.data import BlockChildrenStore, make_reading_list_item_data
+from tests.models import ReadingListItem
+
+
+def _make_pages_and_store(count: int) -> tuple[list[ReadingListItem], BlockChildrenStore]:
+    store = BlockChildrenStore(page_size=2)
+    pages = []
+    for i in range(count):
+        page = ReadingListItem(data=make_reading_list_item_data(name=f'Page {i}'))
+        pages.append(page)
+        store.add(page.id, 'heading_1', text=f'Page {i}')
+        toggle = store.add(page.id, 'toggle', text='Toggle')
+        store.add(toggle['id'], 'paragraph', text='Nested')
+    return pages, store
+
+
+def test_export_pages(tmp_path):
+    pages, store = _make_pages_and_store(10)
+    progress = []
+    stats = export_pages(
+        pages, store.list, directory=str(tmp_path / 'out'), max_workers=3,
+        rate_limiter=TokenBucket(rate=1000), on_progress=lambda stats: progress.append(stats.exported),
+    )
+    assert stats.exported == 10
+    assert stats.failed == 0
+    assert stats.blocks == 30
+    assert stats.requests == store.request_count == 20
+    assert progress == list(range(1, 11))
+    with open(tmp_path / 'out' / f'{pages[3].id}.md') as md_file:
+        assert md_file.read() == '# Page 3\n\n- Toggle\n\n    Nested\n\n'
+
+
+def test_export_pages_shared_fetch_pool(tmp_path):
+    pages, store = _make_pages_and_store(12)
+    fetch_threads = set()
+
+    def fetch(**kwargs):
+        fetch_threads.add(threading.get_ident())
+        return store.list(**kwargs)
+
+    stats = export_pages(pages, fetch, directory=str(tmp_path / 'out'), max_workers=4, max_concurrency=2)
+    assert stats.exported == 12
+    # All page trees are fetched in a single pool of ``max_concurrency`` threads
+    assert len(fetch_threads) <= 2
+
+
+def test_export_pages_checkpoint(tmp_path):
+    pages, store = _make_pages_and_store(6)
+    checkpoint_path = str(tmp_path / 'checkpoint.txt')
+
+    def failing_fetch(**kwargs):
+        if kwargs['block_id'] == pages[2].id:
+            raise RuntimeError('Server error')
+        return store.list(**kwargs)
+
+    stats = export_pages(
+        pages, failing_fetch, directory=str(tmp_path), format='json', checkpoint_path=checkpoint_path,
+    )
+    assert (stats.exported, stats.failed) == (5, 1)
+    assert 'Server error' in stats.errors[pages[2].id]
+
+    # Only the failed page is exported when restarted
+    stats = export_pages(
+        pages, store.list, directory=str(tmp_path), format='json', checkpoint_path=checkpoint_path,
+    )
+    assert (stats.exported, stats.skipped, stats.failed) == (1, 5, 0)
+    with open(tmp_path / f'{pages[2].id}.json') as json_file:
+        data = json.load(json_file)
+    assert data['page']['id'] == pages[2].id
+    assert len(data['body']['children']) == 2
+    assert len(os.listdir(tmp_path)) == 7
+
+
+def test_export_pages_async(tmp_path):
+    pages, store = _make_pages_and_store(5)
+
+    async def fetch(**kwargs):
+        await asyncio.sleep(0)
+        return store.list(**kwargs)
+
+    stats = asyncio.run(export_pages_async(pages, fetch, directory=str(tmp_path), format='text'))
+    assert stats.exported == 5
+    with open(tmp_path / f'{pages[0].id}.txt') as text_file:
+        assert text_file.read() == 'Page 0\nToggle\n  Nested\n'
@@ -0,0 +1,195 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from basic_notion.block_tree import fetch_block_tree
+from basic_notion.database import NotionDatabase
+from basic_notion.executor import RequestExecutor
+from basic_notion.parent import ParentDatabase
+from basic_notion.query import Query
+from basic_notion.ratelimit import TokenBucket
+from basic_notion.testing.fake_api import FakeAPIError, FakeNotionAPI, FakeNotionServer
+
+from tests.models import ReadingList, ReadingListItem
+
+
+def _make_database(api: FakeNotionAPI) -> NotionDatabase:
+    database = NotionDatabase.make(title=['Reading List'], parent={'page_id': 'root'}, properties=ReadingListItem.schema)
+    return NotionDatabase(data=api.databases.create(**database.data))
+
+
+def _create_items(api: FakeNotionAPI, database_id: str, count: int) -> None:
+    for idx in range(count):
+        item = ReadingListItem.make(
+            parent=ParentDatabase.make(database_id=database_id),
+            name=[f'Item {idx:03}'],
+            type='Book' if idx % 3 else 'Article',
+            status='Done' if idx % 2 else 'New',
+            authors=['Author 1', f'Author {idx % 4 + 2}'],
+        )
+        api.pages.create(**item.data)
+
+
+def test_fake_api_create_and_retrieve_page():
+    api = FakeNotionAPI()
+    database = _make_database(api)
+    assert database.schema['Type'].data['type'] == 'select'
+    item = ReadingListItem.make(
+        parent=ParentDatabase.make(database_id=database.id),
+        name=['The Book'], type='Book', status='New', authors=['Somebody'],
+    )
+    page = ReadingListItem(data=api.pages.create(**item.data))
+    assert page.name.get_text() == 'The Book'
+    assert page.type.name == 'Book'
+    assert page.authors.get_text() == 'Somebody'
+    assert page.data['properties']['Name']['id'] == 'title'
+
+    updated = ReadingListItem(data=api.pages.update(page_id=page.id, properties={
+        'Status': {'type': 'select', 'select': {'name': 'Done'}},
+    }))
+    assert updated.status.name == 'Done'
+    assert ReadingListItem(data=api.pages.retrieve(page_id=page.id)).status.name == 'Done'
+
+    with pytest.raises(FakeAPIError) as exc_info:
+        api.pages.retrieve(page_id='missing')
+    assert exc_info.value.status == 404
+
+
+def test_fake_api_query():
+    api = FakeNotionAPI()
+    database = _make_database(api)
+    _create_items(api, database.id, 30)
+
+    query = Query.database(database.id).filter(
+        ReadingListItem.type.filter.equals('Book')
+    ).sorts(ReadingListItem.name.sort.descending)
+    page_list = ReadingList(data=api.databases.query(**query.serialize()))
+    names = [item.name.get_text() for item in page_list.items()]
+    assert names == [f'Item {idx:03}' for idx in range(29, -1, -1) if idx % 3]
+
+    compound_filter = {'and': [
+        {'property': 'Type', 'select': {'equals': 'Book'}},
+        {'property': 'Status', 'select': {'equals': 'Done'}},
+    ]}
+    page_list = ReadingList(data=api.databases.query(database_id=database.id, filter=compound_filter))
+    names = [item.name.get_text() for item in page_list.items()]
+    assert names == [f'Item {idx:03}' for idx in range(30) if idx % 3 and idx % 2]
+
+    query = Query.database(database.id).filter(ReadingListItem.authors.filter.equals('Author 2'))
+    page_list = ReadingList(data=api.databases.query(**query.serialize()))
+    assert len(page_list.items()) == 8
+
+
+def test_fake_api_query_sorts_empty_values_last():
+    api = FakeNotionAPI()
+    database = _make_database(api)
+    for name, status in [('A', 'New'), ('B', None), ('C', 'Done'), ('D', None)]:
+        kwargs = {'status': status} if status is not None else {}
+        item = ReadingListItem.make(parent=ParentDatabase.make(database_id=database.id), name=[name], **kwargs)
+        api.pages.create(**item.data)
+
+    for sort, expected in [
+        (ReadingListItem.status.sort.ascending, ['C', 'A', 'B', 'D']),
+        (ReadingListItem.status.sort.descending, ['A', 'C', 'B', 'D']),
+    ]:
+        query = Query.database(database.id).sorts(sort)
+        page_list = ReadingList(data=api.databases.query(**query.serialize()))
+        assert [item.name.get_text() for item in page_list.items()] == expected
+
+
+def test_fake_api_query_pagination():
+    api = FakeNotionAPI()
+    database = _make_database(api)
+    _create_items(api, database.id, 25)
+
+    names = []
+    start_cursor = None
+    request_count = 0
+    while True:
+        data = api.databases.query(database_id=database.id, page_size=10, start_cursor=start_cursor)
+        request_count += 1
+        names += [item.name.get_text() for item in ReadingList(data=data).items()]
+        if not data['has_more']:
+            break
+        start_cursor = data['next_cursor']
+    assert request_count == 3
+    assert names == [f'Item {idx:03}' for idx in range(25)]
+
+    data = api.databases.query(database_id=database.id, page_size=1000)
+    assert len(data['results']) == 25
+
+    data = api.databases.query(database_id=database.id, filter_properties=['title'])
+    assert list(data['results'][0]['properties']) == ['Name']
+
+
+def test_fake_api_block_children():
+    api = FakeNotionAPI()
+    database = _make_database(api)
+    page_data = api.pages.create(parent={'database_id': database.id}, properties={}, children=[
+        {'object': 'block', 'type': 'paragraph', 'paragraph': {'text': [{'type': 'text', 'text': {'content': 'One'}}]}},
+        {'object': 'block', 'type': 'toggle', 'toggle': {
+            'text': [{'type': 'text', 'text': {'content': 'Two'}}],
+            'children': [{'object': 'block', 'type': 'paragraph', 'paragraph': {'text': []}}],
+        }},
+    ])
+    first_id = api.blocks.children.list(block_id=page_data['id'])['results'][0]['id']
+    api.blocks.children.append(block_id=page_data['id'], after=first_id, children=[
+        {'object': 'block', 'type': 'paragraph', 'paragraph': {'text': [{'type': 'text', 'text': {'content': 'Half'}}]}},
+    ])
+
+    tree = fetch_block_tree(api.blocks.children.list, page_data['id'])
+    assert [node.block.data['type'] for node in tree.children] == ['paragraph', 'paragraph', 'toggle']
+    assert tree.children[1].block.data['paragraph']['text'][0]['plain_text'] == 'Half'
+    assert len(tree.children[2].children) == 1
+
+    data = api.blocks.children.list(block_id=page_data['id'], page_size=2)
+    assert len(data['results']) == 2
+    assert data['has_more']
+
+
+def test_fake_api_rate_limit():
+    api = FakeNotionAPI(rate_limit=1.0, retry_after=0.25)
+    _make_database(api)
+    with pytest.raises(FakeAPIError) as exc_info:
+        for _ in range(10):
+            _make_database(api)
+    assert exc_info.value.status == 429
+    assert exc_info.value.headers['Retry-After'] == '0.25'
+
+    api = FakeNotionAPI(error_rate=0.5, retry_after=0.001, seed=1)
+    executor = RequestExecutor(rate_limiter=TokenBucket(rate=1000.0), max_retries=10)
+    for _ in range(10):
+        executor.call(_make_database, api)
+    assert api.request_counts['databases.create'] == 10 + executor.metrics.retries
+    assert executor.metrics.retries > 0
+
+
+def test_fake_notion_server():
+    with FakeNotionServer(api=FakeNotionAPI(error_rate=0.0)) as server:
+        database = NotionDatabase.make(
+            title=['Reading List'], parent={'page_id': 'root'}, properties=ReadingListItem.schema,
+        )
+        request = urllib.request.Request(
+            f'{server.url}/v1/databases', method='POST', data=json.dumps(database.data).encode(),
+            headers={'Content-Type': 'application/json'},
+        )
+        with urllib.request.urlopen(request) as response:
+            database_id = json.load(response)['id']
+
+        _create_items(server.api, database_id, 3)
+        query = Query.database(database_id).filter(ReadingListItem.type.filter.equals('Article'))
+        body = query.serialize()
+        del body['database_id']
+        request = urllib.request.Request(
+            f'{server.url}/v1/databases/{database_id}/query', method='POST', data=json.dumps(body).encode(),
+        )
+        with urllib.request.urlopen(request) as response:
+            page_list = ReadingList(data=json.load(response))
+        assert [item.name.get_text() for item in page_list.items()] == ['Item 000']
+
+        with pytest.raises(urllib.error.HTTPError) as exc_info:
+            urllib.request.urlopen(f'{server.url}/v1/pages/missing')
+        assert exc_info.value.code == 404
+        assert json.load(exc_info.value)['code'] == 'object_not_found'
@@ -0,0 +1,61 @@
+import subprocess
+import sys
+
+
+def _run(code: str) -> str:
+    return subprocess.check_output([sys.executable, '-c', code]).decode().strip()
+
+
+def test_package_import_is_lazy():
+    output = _run(
+        'import sys, basic_notion\n'
+        'print(",".join(sorted(m for m in sys.modules if m.startswith("basic_notion"))))'
+    )
+    assert output == 'basic_notion'
+
+
+def test_page_module_import():
+    output = _run(
+        'import sys, basic_notion.page\n'
+        'print(",".join(sorted(m for m in sys.modules if m.startswith("basic_notion"))))'
+    )
+    loaded = set(output.split(','))
+    assert 'basic_notion.page' in loaded
+    for module_name in ('property', 'property_schema', 'filter', 'sort', 'schema'):
+        assert f'basic_notion.{module_name}' not in loaded
+
+
+def test_query_module_import():
+    output = _run(
+        'import sys, basic_notion.query\n'
+        'print(",".join(sorted(m for m in sys.modules if m.startswith("basic_notion"))))'
+    )
+    loaded = set(output.split(','))
+    for module_name in ('telemetry', 'property_schema', 'schema'):
+        assert f'basic_notion.{module_name}' not in loaded
+
+
+def test_lazy_attrs():
+    import basic_notion
+    from basic_notion.page import NotionPage
+
+    assert basic_notion.NotionPage is NotionPage
+    assert 'NotionPage' in dir(basic_notion)
+
+
+def test_schema_is_created_lazily():
+    from basic_notion.page import NotionPage
+    from basic_notion.field import TitleField, SelectField
+
+    class Model(NotionPage):
+        name = TitleField(property_name='Name')
+
+    class SubModel(Model):
+        type = SelectField(property_name='Type')
+
+    assert Model.__notion_layout__._schema is None
+    assert SubModel.__notion_layout__._schema is None
+    assert set(SubModel.schema.properties) == {'name', 'type'}
+    assert Model.__notion_layout__._schema is None
+    assert set(Model.schema.properties) == {'name'}
+    assert Model.schema is Model.schema
@@ -0,0 +1,68 @@
+import datetime
+
+import pytest
+
+from basic_notion import instrumentation
+from basic_notion.attr import ItemAttrDescriptor
+from basic_notion.field import NotionField
+
+from tests.data import make_reading_list_data, make_reading_list_item_data
+from tests.models import ReadingList, ReadingListItem
+
+
+def test_instrumentation():
+    original_get = ItemAttrDescriptor.__dict__['__get__']
+    original_field_get = NotionField.__dict__['__get__']
+    page = ReadingListItem(data=make_reading_list_item_data(name='The Book'))
+
+    with instrumentation.instrument() as stats:
+        assert instrumentation.is_installed()
+        assert ItemAttrDescriptor.__dict__['__get__'] is not original_get
+        for _ in range(3):
+            assert isinstance(page.created_time, datetime.datetime)
+            assert page.name.get_text() == 'The Book'
+        page.archived = True
+        page.type = {'name': 'Article'}
+
+    assert not instrumentation.is_installed()
+    assert ItemAttrDescriptor.__dict__['__get__'] is original_get
+    assert NotionField.__dict__['__get__'] is original_field_get
+
+    created_time_stat = stats.get(instrumentation.ATTR_GET, 'ReadingListItem', 'created_time')
+    assert created_time_stat.calls == 3
+    assert created_time_stat.total_time > 0
+    assert stats.get(instrumentation.CONVERTER, 'ReadingListItem', 'deserialize_date').calls == 3
+    assert stats.get(instrumentation.FIELD_GET, 'ReadingListItem', 'Name').calls == 3
+    assert stats.get(instrumentation.ATTR_SET, 'ReadingListItem', 'archived').calls == 1
+    assert stats.get(instrumentation.CLEAR_DERIVED_ATTRS, 'ReadingListItem', '').calls == 1
+    assert stats.get(instrumentation.FIELD_SET, 'ReadingListItem', 'Type').calls == 1
+
+    data = stats.as_dict()
+    assert data['attr_get']['ReadingListItem']['created_time']['calls'] == 3
+    table = stats.format_table()
+    assert table.splitlines()[0].startswith('category')
+    assert 'deserialize_date' in table
+
+    # Nothing is recorded after uninstalling
+    page.id
+    assert stats.get(instrumentation.ATTR_GET, 'ReadingListItem', 'id').calls == 0
+
+
+def test_instrumentation_cursor():
+    reading_list = ReadingList(data=make_reading_list_data(['First', 'Second', 'Third']))
+    with instrumentation.instrument() as stats:
+        for item in reading_list.cursor():
+            item.name.get_text()
+            item.created_time
+
+    # Every access is reported under the model, not its view class
+    assert stats.get(instrumentation.FIELD_GET, 'ReadingListItem', 'Name').calls == 3
+    assert stats.get(instrumentation.ATTR_GET, 'ReadingListItem', 'created_time').calls == 3
+    assert 'ReadingListItemView' not in stats.format_table()
+
+
+def test_instrumentation_install_twice():
+    with instrumentation.instrument():
+        with pytest.raises(RuntimeError):
+            instrumentation.install()
+    assert not instrumentation.is_installed()
@@ -0,0 +1,147 @@
+import io
+
+from basic_notion.block import decode_block
+from basic_notion.block_tree import BlockTree, BlockTreeNode
+from basic_notion.children import iter_children_batches
+from basic_notion.markdown import (
+    MAX_TEXT_LENGTH, iter_blocks_from_markdown, parse_rich_text,
+    render_markdown, render_plain_text, write_markdown,
+)
+
+from tests.data import make_block_data, make_text_data
+
+
+def _node(block_type: str, text: str = '', children=(), **extra) -> BlockTreeNode:
+    block_data = make_block_data(block_type, text=text, has_children=bool(children), **extra)
+    return BlockTreeNode(block=decode_block(block_data), children=list(children))
+
+
+def _make_tree() -> BlockTree:
+    styled = _node('paragraph')
+    styled.block.data['paragraph']['text'] = [
+        make_text_data('Some '),
+        make_text_data('bold ', bold=True),
+        make_text_data('and'),
+        {**make_text_data('link'), 'href': 'https://example.com'},
+    ]
+    return BlockTree(root_id='page', children=[
+        _node('heading_1', 'Title'),
+        styled,
+        _node('bulleted_list_item', 'First', children=[
+            _node('numbered_list_item', 'One'),
+            _node('numbered_list_item', 'Two'),
+        ]),
+        _node('to_do', 'Done', checked=True),
+        _node('to_do', 'Not done', checked=False),
+        _node('code', 'print("hi")\nprint("bye")', language='python'),
+        _node('toggle', 'Toggle', children=[_node('paragraph', 'Hidden')]),
+        _node('callout', 'Note', icon={'type': 'emoji', 'emoji': '💡'}),
+        _node('heading_2', 'End'),
+    ])
+
+
+EXPECTED_MARKDOWN = '''# Title
+
+Some **bold** and[link](https://example.com)
+
+- First
+    1. One
+    2. Two
+- [x] Done
+- [ ] Not done
+
+```python
+print("hi")
+print("bye")
+```
+
+- Toggle
+
+    Hidden
+
+> 💡 Note
+
+## End
+
+'''
+
+
+def test_render_markdown():
+    assert render_markdown(_make_tree()) == EXPECTED_MARKDOWN
+
+    stream = io.StringIO()
+    write_markdown(_make_tree().children, stream)
+    assert stream.getvalue() == EXPECTED_MARKDOWN
+
+
+def test_render_plain_text():
+    text = render_plain_text(_make_tree())
+    assert text == (
+        'Title\nSome bold andlink\nFirst\n  One\n  Two\nDone\nNot done\n'
+        'print("hi")\nprint("bye")\nToggle\n  Hidden\nNote\nEnd\n'
+    )
+
+
+def test_render_deep_tree():
+    node = _node('bulleted_list_item', 'Leaf')
+    for _ in range(5000):
+        node = _node('bulleted_list_item', 'Item', children=[node])
+    text = render_plain_text(BlockTree(root_id='page', children=[node]))
+    assert text.count('\n') == 5001
+
+
+def test_parse_rich_text():
+    runs = parse_rich_text('Plain **bold *both*** `x_y` [link](https://example.com) snake_case')
+    assert [run['text']['content'] for run in runs] == [
+        'Plain ', 'bold ', 'both', ' ', 'x_y', ' ', 'link', ' snake_case',
+    ]
+    assert 'annotations' not in runs[0]
+    assert runs[1]['annotations'] == {'bold': True}
+    assert runs[2]['annotations'] == {'bold': True, 'italic': True}
+    assert runs[4]['annotations'] == {'code': True}
+    assert runs[6]['text']['link'] == {'url': 'https://example.com'}
+
+    long_runs = parse_rich_text('a' * (MAX_TEXT_LENGTH + 1))
+    assert [len(run['text']['content']) for run in long_runs] == [MAX_TEXT_LENGTH, 1]
+
+
+MARKDOWN_DOC = """# Title ##
+First line
+second line
+
+- Item
+- [x] Done
+1. One
+2) Two
+```python
+print("hi")
+
+print("bye")
+```
+> Quote
+---
+### Notes on C#
+"""
+
+
+def test_iter_blocks_from_markdown():
+    blocks = list(iter_blocks_from_markdown(io.StringIO(MARKDOWN_DOC)))
+    assert [block['type'] for block in blocks] == [
+        'heading_1', 'paragraph', 'bulleted_list_item', 'to_do',
+        'numbered_list_item', 'numbered_list_item', 'code', 'quote', 'divider', 'heading_3',
+    ]
+    assert blocks[0]['heading_1']['text'][0]['text']['content'] == 'Title'
+    assert blocks[1]['paragraph']['text'][0]['text']['content'] == 'First line second line'
+    assert blocks[3]['to_do']['checked'] is True
+    assert blocks[6]['code']['language'] == 'python'
+    assert blocks[6]['code']['text'][0]['text']['content'] == 'print("hi")\n\nprint("bye")'
+    assert blocks[9]['heading_3']['text'][0]['text']['content'] == 'Notes on C#'
+
+    # The output can be decoded as regular blocks
+    assert decode_block(blocks[0]).text[0].content == 'Title'
+
+
+def test_markdown_to_children_batches():
+    lines = (f'- Item {i}\n' for i in range(250))
+    payloads = list(iter_children_batches('page', iter_blocks_from_markdown(lines)))
+    assert [len(payload['children']) for payload in payloads] == [100, 100, 50]
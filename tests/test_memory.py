@@ -0,0 +1,31 @@
+import json
+
+from basic_notion.memory import KINDS, deep_sizeof, measure_retained, profile_pages
+
+from tests.data import make_reading_list_data
+from tests.models import ReadingList
+
+
+def test_deep_sizeof():
+    shared = 'x' * 1000
+    assert deep_sizeof([shared, shared]) < 2 * len(shared)
+    assert deep_sizeof({'a': [shared]}) > len(shared)
+
+
+def test_profile_pages():
+    text = json.dumps(make_reading_list_data(['First', 'Second', 'Third']))
+    page_list, retained = measure_retained(lambda: ReadingList(data=json.loads(text)))
+    assert retained > 0
+
+    report = profile_pages(page_list)
+    assert report.page_count == 3
+    assert set(report.by_kind) == set(KINDS)
+    assert all(report.by_kind[kind] > 0 for kind in KINDS)
+    assert set(report.by_property) == set(page_list.data['results'][0]['properties'])
+    assert sum(report.by_property.values()) < report.total_bytes
+    assert report.bytes_per_page == report.total_bytes / 3
+    # Raw data is also accepted (without the wrappers)
+    raw_report = profile_pages(json.loads(text)['results'])
+    assert raw_report.by_kind['wrappers'] == 0
+    assert raw_report.total_bytes == report.total_bytes - report.by_kind['wrappers']
+    assert 'bytes per page' in report.format_table()
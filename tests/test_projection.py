@@ -0,0 +1,57 @@
+import pytest
+
+from basic_notion.projection import Projection
+
+from tests.data import make_reading_list_data, make_reading_list_item_data
+from tests.models import ReadingList, ReadingListItem
+
+
+def test_page_projection():
+    data = make_reading_list_item_data(name='The Name')
+    page = ReadingListItem.from_data(data, only=[ReadingListItem.name, 'Type'])
+    assert set(page.data['properties']) == {'Name', 'Type'}
+    assert 'cover' not in page.data
+    assert page.id
+    assert page.created_time
+    assert page.name.get_text() == 'The Name'
+    assert page.name.one_item.plain_text == 'The Name'
+    assert page.type.name == 'Book'
+    with pytest.raises(KeyError):
+        page.authors
+
+
+def test_page_list_projection():
+    reading_list = ReadingList.from_data(
+        make_reading_list_data(['First', 'Second']),
+        only=[ReadingListItem.name],
+    )
+    items = reading_list.items()
+    assert [item.name.get_text() for item in items] == ['First', 'Second']
+    for item in items:
+        assert set(item.data['properties']) == {'Name'}
+
+
+def test_projection_drop_derived():
+    projection = Projection.from_fields(
+        ReadingListItem, [ReadingListItem.name, ReadingListItem.type, ReadingListItem.authors],
+        drop_derived=True,
+    )
+    reading_list = ReadingList.from_data(make_reading_list_data(['First']), only=projection)
+    item = reading_list.items()[0]
+    assert item.name.get_text() == 'First'
+    text_data = item.data['properties']['Name']['title'][0]
+    assert 'plain_text' not in text_data
+    assert 'annotations' not in text_data
+    assert 'href' not in text_data
+    assert item.type.name == 'Book'
+    assert 'color' not in item.data['properties']['Type']['select']
+    assert item.authors.get_text() == 'John Doe'
+    assert 'color' not in item.data['properties']['Author']['multi_select'][0]
+
+
+def test_projection_field_names():
+    # Strings are property names, like in ``Query.only``
+    projection = Projection.from_fields(ReadingListItem, ['Name', 'Author'])
+    assert projection.property_names == {'Name', 'Author'}
+    with pytest.raises(KeyError):
+        Projection.from_fields(ReadingListItem, ['authors'])
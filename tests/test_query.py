@@ -0,0 +1,46 @@
+import pytest
+
+from basic_notion.query import Query
+from basic_notion.schema import load_schema_from_dict
+
+from tests.models import ReadingListItem
+
+
+def test_query_serialize():
+    data = Query.database('qwerty').filter(
+        ReadingListItem.type.filter.equals('Book')
+    ).sorts(
+        ReadingListItem.name.sort.ascending
+    ).serialize()
+    assert data == {
+        'database_id': 'qwerty',
+        'filter': {'property': 'Type', 'select': {'equals': 'Book'}},
+        'sorts': [{'property': 'Name', 'direction': 'ascending'}],
+    }
+
+
+def test_query_only_and_page_size():
+    data = Query.database('qwerty').only(
+        ReadingListItem.name, ReadingListItem.type,
+    ).page_size(50).start_cursor('next').serialize()
+    assert data == {
+        'database_id': 'qwerty',
+        'filter_properties': ['Name', 'Type'],
+        'page_size': 50,
+        'start_cursor': 'next',
+    }
+
+    with pytest.raises(ValueError):
+        Query.database('qwerty').page_size(101)
+
+
+def test_query_only_with_database_schema():
+    schema = load_schema_from_dict({
+        'Name': {'id': 'title', 'type': 'title', 'title': {}},
+        'Type': {'id': 'a%3Ab', 'type': 'select', 'select': {'options': []}},
+    })
+    data = Query.database('qwerty').only(
+        ReadingListItem.name, ReadingListItem.type, ReadingListItem.status,
+        schema=schema,
+    ).serialize()
+    assert data['filter_properties'] == ['title', 'a%3Ab', 'Status']
@@ -0,0 +1,37 @@
+import asyncio
+
+from basic_notion.ratelimit import TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    clock.now = 0.5
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    bucket.pause(10)
+    clock.now = 5
+    assert not bucket.try_acquire()
+    clock.now = 10.5
+    assert bucket.try_acquire()
+
+
+def test_token_bucket_acquire():
+    bucket = TokenBucket(rate=100, capacity=1)
+    assert bucket.acquire() == 0
+    # The second token becomes available in 1/100 s
+    assert 0 < bucket.acquire() <= 0.01
+    assert 0 < asyncio.run(bucket.acquire_async()) <= 0.02
@@ -0,0 +1,66 @@
+import collections
+
+from basic_notion.block_tree import fetch_block_tree
+from basic_notion.database import NotionDatabase
+from basic_notion.synthetic import SyntheticDataGenerator
+
+from tests.models import ReadingList, ReadingListItem
+
+
+def test_synthetic_pages_are_deterministic():
+    first = SyntheticDataGenerator(seed=1).make_page_list(ReadingListItem, count=5)
+    second = SyntheticDataGenerator(seed=1).make_page_list(ReadingListItem, count=5)
+    other = SyntheticDataGenerator(seed=2).make_page_list(ReadingListItem, count=5)
+    assert first == second
+    assert first != other
+
+
+def test_synthetic_pages_match_model():
+    generator = SyntheticDataGenerator(seed=0)
+    page_list = ReadingList(data=generator.make_page_list(ReadingListItem, count=200, next_cursor='next'))
+    assert page_list.data['has_more'] is True
+    items = page_list.items()
+    assert len(items) == 200
+    type_counts: collections.Counter = collections.Counter()
+    for item in items:
+        assert len(item.id) == 36
+        assert item.name.get_text()
+        item.authors.get_text()
+        if item.data['properties']['Type']['select'] is not None:
+            type_counts[item.type.name] += 1
+    # Options have a skewed distribution
+    most_common = type_counts.most_common()
+    assert most_common[0][1] > 2 * most_common[-1][1]
+
+
+def test_synthetic_pages_from_database_schema():
+    database = NotionDatabase(data={
+        'object': 'database',
+        'id': 'db',
+        'title': [],
+        'parent': {'type': 'page_id', 'page_id': 'page'},
+        'properties': {
+            'Name': {'id': 'title', 'type': 'title', 'title': {}},
+            'Size': {'id': 'a%3Ab', 'type': 'select', 'select': {'options': [
+                {'id': '1', 'name': 'Small', 'color': 'red'},
+                {'id': '2', 'name': 'Large', 'color': 'blue'},
+            ]}},
+        },
+    })
+    pages = list(SyntheticDataGenerator().iter_pages(database, count=50, database_id='db'))
+    names = {page['properties']['Size']['select']['name'] for page in pages if page['properties']['Size']['select']}
+    assert names == {'Small', 'Large'}
+    assert pages[0]['properties']['Size']['id'] == 'a%3Ab'
+    assert pages[0]['parent']['database_id'] == 'db'
+
+
+def test_synthetic_block_tree():
+    children = SyntheticDataGenerator(seed=3).make_block_tree('page', depth=3, fan_out=5, nesting_ratio=0.5)
+    assert len(children['page']) == 5
+
+    def fetch_children(block_id, start_cursor=None):
+        return {'object': 'list', 'results': children.get(block_id, []), 'has_more': False, 'next_cursor': None}
+
+    tree = fetch_block_tree(fetch_children, root_id='page')
+    assert len(tree) == sum(len(blocks) for blocks in children.values())
+    assert max(depth for depth, _ in tree.iter_nodes()) <= 2
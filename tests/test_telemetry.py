@@ -0,0 +1,143 @@
+import contextvars
+import os
+
+import pytest
+
+from basic_notion.block_tree import fetch_block_tree
+from basic_notion.bulk import BulkCreateJournal, bulk_create_pages
+from basic_notion.database import NotionDatabase
+from basic_notion.parent import ParentDatabase
+from basic_notion.query import Query, iter_query_results
+from basic_notion.telemetry import (
+    SPAN_DECODE, SPAN_PAGE_PROCESSING, SPAN_QUERY_SERIALIZE,
+    InMemoryTelemetry, Telemetry, get_telemetry, set_telemetry,
+)
+from basic_notion.testing.fake_api import FakeAPIError, FakeNotionAPI
+from basic_notion.write_queue import PageWriteQueue
+
+from tests.data import BlockChildrenStore
+from tests.models import ReadingList, ReadingListItem
+
+
+@pytest.fixture
+def telemetry():
+    telemetry = InMemoryTelemetry()
+    set_telemetry(telemetry)
+    yield telemetry
+    set_telemetry(None)
+
+
+def _make_database(api: FakeNotionAPI) -> str:
+    database = NotionDatabase.make(title=['Reading List'], parent={'page_id': 'root'}, properties=ReadingListItem.schema)
+    return api.databases.create(**database.data)['id']
+
+
+def _make_page_data(database_id: str, idx: int) -> dict:
+    return ReadingListItem.make(
+        parent=ParentDatabase.make(database_id=database_id),
+        name=[f'Item {idx}'], type='Book', status='New', authors=['Somebody'],
+    ).data
+
+
+def test_telemetry_disabled_by_default():
+    telemetry = get_telemetry()
+    assert type(telemetry) is Telemetry
+    assert not telemetry.enabled
+    # The same no-op context manager is used every time
+    assert telemetry.request('pages.create') is telemetry.span('decode')
+    with telemetry.request('pages.create'):
+        pass
+
+
+def test_telemetry_query_pagination(telemetry):
+    api = FakeNotionAPI()
+    database_id = _make_database(api)
+    for idx in range(25):
+        api.pages.create(**_make_page_data(database_id, idx))
+
+    query = Query.database(database_id).page_size(10)
+    names = [page.name.get_text() for page in iter_query_results(query, api.databases.query, ReadingList)]
+    assert names == [f'Item {idx}' for idx in range(25)]
+
+    assert [request.endpoint for request in telemetry.requests] == ['databases.query'] * 3
+    assert all(request.database_id == database_id and request.error is None for request in telemetry.requests)
+    span_names = telemetry.get_span_names()
+    assert span_names.count(SPAN_QUERY_SERIALIZE) == 3
+    assert span_names.count('notion.databases.query') == 3
+    assert span_names.count(SPAN_DECODE) == 3
+    assert len(telemetry.durations[SPAN_PAGE_PROCESSING]) == 25
+
+
+def test_telemetry_errors(telemetry):
+    api = FakeNotionAPI()
+    with pytest.raises(FakeAPIError):
+        list(iter_query_results(Query.database('missing'), api.databases.query, ReadingList))
+    assert telemetry.requests[-1].error == '404'
+    assert telemetry.spans[-1].name == 'notion.databases.query'
+    assert telemetry.spans[-1].error == '404'
+
+
+def test_telemetry_block_fetches_and_writes(telemetry, tmp_path):
+    store = BlockChildrenStore(page_size=2)
+    for idx in range(3):
+        store.add('page', text=f'Block {idx}')
+    fetch_block_tree(store.list, root_id='page')
+    assert [request.endpoint for request in telemetry.requests] == ['blocks.children.list'] * 2
+
+    api = FakeNotionAPI()
+    database_id = _make_database(api)
+    with BulkCreateJournal(path=os.path.join(tmp_path, 'journal.sqlite')) as journal:
+        bulk_create_pages(
+            range(3), make_page_data=lambda idx: _make_page_data(database_id, idx),
+            create=api.pages.create, journal=journal, get_key=str,
+        )
+    created = [request for request in telemetry.requests if request.endpoint == 'pages.create']
+    assert len(created) == 3
+    assert created[0].database_id == database_id
+
+    page = ReadingListItem(data=api.pages.retrieve(page_id=journal.get_page_id('0')))
+    page.status = {'name': 'Done'}
+    queue = PageWriteQueue(update=api.pages.update)
+    queue.add(page, 'status')
+    queue.flush()
+    assert telemetry.requests[-1].endpoint == 'pages.update'
+    assert telemetry.requests[-1].database_id == database_id
+
+
+def test_telemetry_context_is_propagated_to_workers():
+    # Stands in for the current span of a tracer
+    current_span = contextvars.ContextVar('current_span', default=None)
+    store = BlockChildrenStore()
+    block_data = store.add('root')
+    store.add(block_data['id'])
+    seen_spans = []
+
+    def fetch_children(**kwargs):
+        seen_spans.append(current_span.get())
+        return store.list(**kwargs)
+
+    current_span.set('export')
+    fetch_block_tree(fetch_children, root_id='root')
+    assert seen_spans == ['export', 'export']
+
+
+def test_prometheus_telemetry():
+    prometheus_client = pytest.importorskip('prometheus_client')
+    from basic_notion.telemetry import PrometheusTelemetry
+
+    registry = prometheus_client.CollectorRegistry()
+    telemetry = PrometheusTelemetry(registry=registry)
+    with telemetry.request('pages.create', database_id='db'):
+        pass
+    with pytest.raises(FakeAPIError):
+        with telemetry.request('pages.create', database_id='db'):
+            raise FakeAPIError(429, 'rate_limited', 'Rate limited')
+    labels = {'endpoint': 'pages.create', 'database_id': 'db'}
+    assert registry.get_sample_value('basic_notion_request_duration_seconds_count', labels) == 2
+    assert registry.get_sample_value('basic_notion_request_errors_total', {**labels, 'status': '429'}) == 1
+
+    # Another instance with the same registry reuses the metrics
+    other_telemetry = PrometheusTelemetry(registry=registry)
+    with other_telemetry.request('pages.create', database_id='db'):
+        pass
+    assert registry.get_sample_value('basic_notion_request_duration_seconds_count', labels) == 3
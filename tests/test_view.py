@@ -0,0 +1,43 @@
+from basic_notion.property_schema import TitlePropertySchema
+from basic_notion.view import get_view_cls, iter_views
+
+from tests.data import make_reading_list_data, make_reading_list_item_data
+from tests.models import ReadingList, ReadingListItem
+
+
+def test_page_list_cursor():
+    names = ['First', 'Second', 'Third']
+    reading_list = ReadingList(data=make_reading_list_data(names))
+
+    seen_ids = []
+    views = set()
+    name_props = set()
+    for item, expected_item in zip(reading_list.cursor(), reading_list.items()):
+        assert isinstance(item, ReadingListItem)
+        assert item.id == expected_item.id
+        assert item.name.get_text() == expected_item.name.get_text()
+        assert item.type.name == 'Book'
+        assert item.authors.get_text() == 'John Doe'
+        seen_ids.append(item.id)
+        views.add(id(item))
+        name_props.add(id(item.name))
+
+    assert len(seen_ids) == 3
+    # The same objects are re-used for all of the items
+    assert len(views) == 1
+    assert len(name_props) == 1
+
+
+def test_view_cls():
+    view_cls = get_view_cls(ReadingListItem)
+    assert get_view_cls(ReadingListItem) is view_cls
+    assert issubclass(view_cls, ReadingListItem)
+    assert isinstance(view_cls.name, TitlePropertySchema)
+    assert view_cls.schema.properties.keys() == ReadingListItem.schema.properties.keys()
+
+
+def test_view_set_field():
+    data = make_reading_list_item_data(name='Name')
+    view = next(iter_views(ReadingListItem, [data]))
+    view.type = {'name': 'Article'}
+    assert data['properties']['Type']['select']['name'] == 'Article'
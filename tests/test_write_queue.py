@@ -0,0 +1,189 @@
+import time
+
+import pytest
+
+from basic_notion.write_queue import PageWriteQueue, make_page_update_payload
+
+from tests.data import make_reading_list_item_data
+from tests.models import ReadingListItem
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class UpdateError(Exception):
+    def __init__(self, status: int) -> None:
+        super().__init__(f'Status {status}')
+        self.status = status
+
+
+class UpdateRecorder:
+    def __init__(self, failing_ids=(), status: int = 503) -> None:
+        self.calls: list[dict] = []
+        self.failing_ids = set(failing_ids)
+        self.status = status
+        self.failed_count = 0
+
+    def __call__(self, page_id: str, **payload) -> dict:
+        if page_id in self.failing_ids:
+            self.failed_count += 1
+            raise UpdateError(self.status)
+        self.calls.append({'page_id': page_id, **payload})
+        return {'id': page_id}
+
+
+def _make_page(name: str = 'Page') -> ReadingListItem:
+    return ReadingListItem(data=make_reading_list_item_data(name=name))
+
+
+def test_make_page_update_payload():
+    page = _make_page()
+    page.archived = True
+    assert make_page_update_payload(page, ('type', 'archived')) == {
+        'properties': {'Type': page.data['properties']['Type']},
+        'archived': True,
+    }
+    assert set(make_page_update_payload(page)['properties']) == {'Type', 'Name', 'Status', 'Author'}
+    with pytest.raises(KeyError):
+        make_page_update_payload(page, ('url',))
+
+    # Read-only and unknown properties are not sent
+    page.data['properties']['Created'] = {'id': 'crt', 'type': 'created_time', 'created_time': '2021-01-01'}
+    page.data['properties']['Score'] = {'id': 'scr', 'type': 'formula', 'formula': {'type': 'number', 'number': 1}}
+    assert set(make_page_update_payload(page)['properties']) == {'Type', 'Name', 'Status', 'Author'}
+
+
+def test_write_queue_coalesces_changes():
+    update = UpdateRecorder()
+    queue = PageWriteQueue(update=update, clock=FakeClock())
+    page = _make_page()
+    page.type = {'name': 'Article'}
+    queue.add(page, 'type')
+    page.status = {'name': 'Reading'}
+    queue.add(page, 'status')
+    # Another object representing the same page
+    same_page = ReadingListItem(data=make_reading_list_item_data(name='Page', page_id=page.id))
+    same_page.type = {'name': 'Paper'}
+    queue.add(same_page, 'type')
+    other_page = _make_page('Other')
+    queue.add(other_page, 'archived')
+    assert len(queue) == 2
+
+    result = queue.flush()
+    assert result.request_count == 2
+    assert result.persisted == [page, same_page, other_page]
+    assert len(queue) == 0
+    page_call = update.calls[0]
+    assert page_call['page_id'] == page.id
+    assert page_call['properties']['Type']['select']['name'] == 'Paper'
+    assert page_call['properties']['Status']['select']['name'] == 'Reading'
+    assert update.calls[1] == {'page_id': other_page.id, 'archived': False}
+
+
+def test_write_queue_auto_flush():
+    update = UpdateRecorder(failing_ids=())
+    results = []
+    clock = FakeClock()
+    queue = PageWriteQueue(update=update, max_pages=3, max_delay=1.0, clock=clock, on_flush=results.append)
+
+    pages = [_make_page(str(i)) for i in range(3)]
+    for page in pages:
+        queue.add(page, 'name')
+    # Flushed by size
+    assert len(results) == 1 and results[0].persisted == pages
+
+    failing_page = _make_page()
+    update.failing_ids.add(failing_page.id)
+    queue.add(failing_page, 'name')
+    assert queue.flush_if_due() is None
+    clock.now = 1.0
+    result = queue.flush_if_due()
+    # Flushed by time
+    assert result is not None
+    assert result.persisted == []
+    assert isinstance(result.failed[failing_page.id], UpdateError)
+    # The failed update is kept for the next flush
+    assert len(queue) == 1
+    assert queue.flush_if_due() is None
+
+
+def test_write_queue_requeues_failed_updates():
+    update = UpdateRecorder()
+    queue = PageWriteQueue(update=update, clock=FakeClock())
+    page = _make_page()
+    page.type = {'name': 'Article'}
+    page.status = {'name': 'Reading'}
+    queue.add(page, 'type', 'status')
+    update.failing_ids.add(page.id)
+    assert page.id in queue.flush().failed
+
+    # Newer changes are merged over the failed ones
+    page.status = {'name': 'Done'}
+    queue.add(page, 'status')
+    update.failing_ids.clear()
+    result = queue.flush()
+    assert result.persisted == [page]
+    assert update.calls[-1]['properties']['Type']['select']['name'] == 'Article'
+    assert update.calls[-1]['properties']['Status']['select']['name'] == 'Done'
+    assert len(queue) == 0
+
+    # Changes made while the failed update was being sent take precedence
+    failures = [UpdateError(503)]
+
+    def flaky_update(page_id: str, **payload) -> dict:
+        if failures:
+            page.status = {'name': 'Reading'}
+            queue.add(page, 'status')
+            raise failures.pop()
+        return update(page_id=page_id, **payload)
+
+    queue = PageWriteQueue(update=flaky_update, clock=FakeClock())
+    page.type = {'name': 'Paper'}
+    queue.add(page, 'type', 'status')
+    assert page.id in queue.flush().failed
+    assert len(queue) == 1
+    queue.flush()
+    assert update.calls[-1]['properties']['Type']['select']['name'] == 'Paper'
+    assert update.calls[-1]['properties']['Status']['select']['name'] == 'Reading'
+
+    queue = PageWriteQueue(update=UpdateRecorder(failing_ids=[page.id]), requeue_failed=False)
+    queue.add(page, 'status')
+    assert page.id in queue.flush().failed
+    assert len(queue) == 0
+
+
+def test_write_queue_drops_permanent_failures():
+    page = _make_page()
+    update = UpdateRecorder(failing_ids=[page.id], status=400)
+    queue = PageWriteQueue(update=update, clock=FakeClock())
+    queue.add(page, 'status')
+    assert page.id in queue.flush().failed
+    # A rejected update is not sent again
+    assert len(queue) == 0
+    queue.flush()
+    assert update.failed_count == 1
+
+    # Transient failures are retried a limited number of times
+    update = UpdateRecorder(failing_ids=[page.id], status=503)
+    queue = PageWriteQueue(update=update, clock=FakeClock(), max_attempts=3)
+    queue.add(page, 'status')
+    for _ in range(5):
+        queue.flush()
+    assert update.failed_count == 3
+    assert len(queue) == 0
+
+
+def test_write_queue_background_thread():
+    update = UpdateRecorder()
+    with PageWriteQueue(update=update, max_delay=0.02) as queue:
+        queue.add(_make_page(), 'name')
+        time.sleep(0.1)
+        assert len(update.calls) == 1
+        queue.add(_make_page(), 'name')
+    # The rest is flushed on exit
+    assert len(update.calls) == 2